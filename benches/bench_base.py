@@ -17,7 +17,10 @@ DEFAULT_PARAMS = {
 
 
 def bench() -> None:
-    """Run the benchmarks for the base module."""
+    """Run the benchmarks for the base module.
+
+    The models are solved with the fast MPS export, use `--pulp-mps` to compare with PuLP.
+    """
     print("=== CR_COUNT ===")
     bench_cr_count()
 
@@ -36,6 +39,7 @@ def bench_cr_count() -> None:
         [100, 200, 300, 400, 500, 600, 700, 800, 900, 1000],
         DEFAULT_PARAMS,
         get_optimizer_fn=get_optimizer,
+        direct_mps=True,
     )
 
 
@@ -47,6 +51,7 @@ def bench_cs_count() -> None:
         [100, 200, 300, 400, 500, 600, 700, 800, 900, 1000],
         {**DEFAULT_PARAMS, "cs_count_per_cr": 100},
         get_optimizer_fn=get_optimizer,
+        direct_mps=True,
     )
 
 
@@ -58,6 +63,7 @@ def bench_cs_count_per_cr() -> None:
         [100, 200, 300, 400, 500, 600, 700, 800, 900, 1000],
         DEFAULT_PARAMS,
         get_optimizer_fn=get_optimizer,
+        direct_mps=True,
     )
 
 
@@ -0,0 +1,72 @@
+"""Benchmarks for the solution extraction step."""
+from typing import Any
+
+from optiframe import Optimizer
+from optiframe.framework import InitializedOptimizer
+from pulp import LpMinimize
+
+from benches.utils import setup_benchmark
+from benches.utils.data_generation import generate_base_data
+from cloud_resource_matcher.modules.base import base_module
+from cloud_resource_matcher.modules.service_limits import ServiceLimitsData, service_limits_module
+
+DEFAULT_PARAMS = {
+    "cr_count": 1000,
+    "cs_count": 1000,
+    "cs_count_per_cr": 100,
+}
+
+
+def bench() -> None:
+    """Run the benchmarks for the solution extraction.
+
+    The extraction time should grow linearly with the number of CRs.
+    """
+    print("=== CR_COUNT ===")
+    bench_cr_count()
+
+    print("\n\n=== CS_COUNT_PER_CR ===")
+    bench_cs_count_per_cr()
+
+
+def bench_cr_count() -> None:
+    """Run benchmarks varying the number of cloud resources."""
+    setup_benchmark(
+        "cloud resource count",
+        "extraction_cr_count",
+        [1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000, 9000, 10000],
+        DEFAULT_PARAMS,
+        get_optimizer_fn=get_optimizer,
+        time_name="solution_extraction",
+    )
+
+
+def bench_cs_count_per_cr() -> None:
+    """Run benchmarks varying the number of CSs applicable for each CR."""
+    setup_benchmark(
+        "count of applicable cloud services per cloud resource",
+        "extraction_cs_count_per_cr",
+        [100, 200, 300, 400, 500, 600, 700, 800, 900, 1000],
+        DEFAULT_PARAMS,
+        get_optimizer_fn=get_optimizer,
+        time_name="solution_extraction",
+    )
+
+
+def get_optimizer(params: dict[str, Any]) -> InitializedOptimizer:
+    """Get an optimizer instance for the given parameters.
+
+    The service limits module is added as it reuses the reverse CS -> CR index.
+    The limits are high enough to not affect the solution.
+    """
+    base_data = generate_base_data(**params)
+    service_limits_data = ServiceLimitsData(
+        cs_to_instance_limit={cs: params["cr_count"] * 1000 for cs in base_data.cloud_services},
+        cr_to_max_instance_demand=base_data.cr_to_instance_demand,
+    )
+
+    return (
+        Optimizer("bench_extraction", sense=LpMinimize)
+        .add_modules(base_module, service_limits_module)
+        .initialize(base_data, service_limits_data)
+    )
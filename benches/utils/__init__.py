@@ -6,8 +6,8 @@ from typing import Any, Callable
 from optiframe.framework import InitializedOptimizer
 
 from benches.utils.cli import get_cli_args
-from benches.utils.plot import plot_results
-from benches.utils.run import run_benchmark
+from benches.utils.plot import plot_gaps_over_time, plot_results
+from benches.utils.run import TimeName, run_benchmark
 
 
 def setup_benchmark(
@@ -16,9 +16,15 @@ def setup_benchmark(
     param_values: list[int],
     default_params: dict[str, Any],
     get_optimizer_fn: Callable[[dict[str, Any]], InitializedOptimizer],
+    time_name: TimeName = "total",
+    direct_mps: bool = False,
 ) -> None:
-    """Run a benchmark and plot the results."""
-    args = get_cli_args()
+    """Run a benchmark and plot the results.
+
+    :param time_name: The measured time to plot, e.g. `total` or `solution_extraction`.
+    :param direct_mps: Solve with the fast MPS export, see `get_cli_args`.
+    """
+    args = get_cli_args(direct_mps=direct_mps)
 
     # Create directories if they don't exist
     os.makedirs("benches/output/pdf", exist_ok=True)
@@ -42,4 +48,7 @@ def setup_benchmark(
         with open(f"benches/output/json/{param_name}.json", "w+") as file:
             json.dump(results, file, indent=2)
 
-    plot_results(results, dark_theme=args.dark_theme)
+    plot_results(results, dark_theme=args.dark_theme, time_name=time_name)
+
+    if any(len(measure.get("gaps_over_time", [])) > 0 for measure in results["measures"]):
+        plot_gaps_over_time(results, dark_theme=args.dark_theme)
@@ -15,8 +15,11 @@ class CliArgs:
     dark_theme: bool
 
 
-def get_cli_args() -> CliArgs:
-    """Obtain a solver object from the CLI arguments."""
+def get_cli_args(direct_mps: bool = False) -> CliArgs:
+    """Obtain a solver object from the CLI arguments.
+
+    :param direct_mps: Use the fast MPS export for CBC, unless `--pulp-mps` is given.
+    """
     import argparse
 
     parser = argparse.ArgumentParser(description="Benchmark the optimizer.")
@@ -38,6 +41,12 @@ def get_cli_args() -> CliArgs:
         default=False,
         help="Use the cached JSON measurements, only regenerate the plots.",
     )
+    parser.add_argument(
+        "--pulp-mps",
+        action="store_true",
+        default=False,
+        help="Use the MPS export of PuLP instead of the fast MPS export, to compare both.",
+    )
     parser.add_argument(
         "--dark-theme",
         action="store_true",
@@ -59,7 +68,13 @@ def get_cli_args() -> CliArgs:
         raise RuntimeError(f"Unsupported solver {args.solver}")
 
     return CliArgs(
-        solver=get_pulp_solver(solver=solver, msg=False),
+        # Only CBC supports tracking the gap over time and the fast MPS export
+        solver=get_pulp_solver(
+            solver=solver,
+            msg=False,
+            track_progress=solver == Solver.CBC,
+            direct_mps=direct_mps and not args.pulp_mps and solver == Solver.CBC,
+        ),
         measures=args.measures,
         use_cache=args.use_cache,
         dark_theme=args.dark_theme,
@@ -1,6 +1,12 @@
 """Utility functions to generate the benchmark data."""
+import numpy as np
+
 from cloud_resource_matcher.modules.base.data import BaseData, CloudResource, CloudService
-from cloud_resource_matcher.modules.network import NetworkData
+from cloud_resource_matcher.modules.network import (
+    DenseLocationMatrix,
+    NetworkData,
+    SymmetricLocationMatrix,
+)
 from cloud_resource_matcher.modules.network.data import Location
 
 
@@ -88,19 +94,18 @@ def generate_network_data(
 
             j += 1
 
+    # The location matrices are stored as arrays instead of one entry per pair of locations
+    loc_list = [f"loc_{loc}" for loc in range(loc_count)]
+    loc1, loc2 = np.triu_indices(loc_count)
+    loc_range = np.arange(loc_count)
+    loc_costs = (loc_range[:, np.newaxis] + loc_range[np.newaxis, :] * 2) % 20 + 5
+    np.fill_diagonal(loc_costs, 0)
+
     network_data = NetworkData(
         locations=locations,
         cs_to_loc={f"cs_{cs}": f"loc_{cs % loc_count}" for cs in range(cs_count)},
-        loc_and_loc_to_latency={
-            (f"loc_{loc1}", f"loc_{loc2}"): abs(loc2 - loc1) % 40
-            for loc1 in range(loc_count)
-            for loc2 in range(loc_count)
-        },
-        loc_and_loc_to_cost={
-            (f"loc_{loc1}", f"loc_{loc2}"): 0 if loc1 == loc2 else (loc1 + loc2 * 2) % 20 + 5
-            for loc1 in range(loc_count)
-            for loc2 in range(loc_count)
-        },
+        loc_and_loc_to_latency=SymmetricLocationMatrix(loc_list, (loc2 - loc1) % 40),
+        loc_and_loc_to_cost=DenseLocationMatrix(loc_list, loc_costs),
         cr_and_loc_to_traffic=cr_and_loc_to_traffic,
         cr_and_cr_to_traffic=cr_and_cr_to_traffic,
         # Max latency only reduces the model size
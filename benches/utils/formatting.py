@@ -1,8 +1,11 @@
 """Utility functions to format the benchmark results."""
 from datetime import timedelta
+from typing import Optional
 
 from optiframe import ModelSize, StepData, StepTimes
 
+from cloud_resource_matcher.modules.network import NetworkMipData
+
 
 def print_result(instance: str, solution: StepData) -> None:
     """Print out the benchmark results in the console."""
@@ -22,6 +25,14 @@ def print_result(instance: str, solution: StepData) -> None:
 
     print(f"- {instance}")
     print(f"    model_size: {model_size.variable_count:,} x {model_size.constraint_count:,}")
+
+    network_mip_data: Optional[NetworkMipData] = solution.get(NetworkMipData)
+
+    if network_mip_data is not None:
+        print(
+            f"    skipped connections: {len(network_mip_data.skipped_cr_connections):,} CR -> CR,"
+            f" {network_mip_data.skipped_loc_connection_count:,} CR -> loc"
+        )
     print(f"    time: {format_time(total_time)} ({step_time_str})")
 
 
@@ -3,22 +3,29 @@ import matplotlib.pyplot as plt
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 
-from benches.utils.run import BenchmarkResult
+from benches.utils.run import BenchmarkResult, TimeName
 
 LINE_WIDTH = 3
 
 
-def plot_results(result: BenchmarkResult, dark_theme: bool = False) -> None:
-    """Create a line graph for the benchmark results."""
+def plot_results(
+    result: BenchmarkResult, dark_theme: bool = False, time_name: TimeName = "total"
+) -> None:
+    """Create a line graph for the benchmark results.
+
+    :param time_name: The measured time to plot, e.g. `total` or `solution_extraction`.
+    """
     model_sizes: list[int] = [
         measure["variable_count"] * measure["constraint_count"] for measure in result["measures"]
     ]
     # Take the average of all measurements
     optimization_times: list[float] = [
-        sum(time["total"] for time in measure["times"]) / len(measure["times"])
+        sum(time[time_name] for time in measure["times"]) / len(measure["times"])
         for measure in result["measures"]
     ]
 
+    time_label = "total optimization" if time_name == "total" else time_name.replace("_", " ")
+
     # Colors
     col_background = "#121212" if dark_theme else "white"
     col_foreground = "white" if dark_theme else "black"
@@ -47,13 +54,13 @@ def plot_results(result: BenchmarkResult, dark_theme: bool = False) -> None:
     (time_plot,) = ax2.plot(
         result["param_values"],
         optimization_times,
-        label="total optimization time",
+        label=f"{time_label} time",
         color=col_optimization_time,
         marker="v",
         linewidth=LINE_WIDTH,
     )
 
-    configure_axes(ax2, "total optimization time (s)", col_background, col_foreground)
+    configure_axes(ax2, f"{time_label} time (s)", col_background, col_foreground)
 
     # Legend
     ax.legend(
@@ -71,6 +78,44 @@ def plot_results(result: BenchmarkResult, dark_theme: bool = False) -> None:
     fig.savefig(f"benches/output/svg/{result['param_name']}.svg")
 
 
+def plot_gaps_over_time(result: BenchmarkResult, dark_theme: bool = False) -> None:
+    """Create a line graph of the gap over time, with one line per parameter value.
+
+    Uses the first measurement of each parameter value.
+    """
+    col_background = "#121212" if dark_theme else "white"
+    col_foreground = "white" if dark_theme else "black"
+
+    fig: Figure
+    ax: Axes
+    fig, ax = plt.subplots()
+    ax.set_xlabel("solving time (s)", color=col_foreground)
+
+    for measure in result["measures"]:
+        gaps_over_time = measure.get("gaps_over_time", [])
+
+        if len(gaps_over_time) == 0 or len(gaps_over_time[0]) == 0:
+            continue
+
+        times, gaps = zip(*gaps_over_time[0])
+        ax.step(
+            times,
+            [gap * 100 for gap in gaps],
+            where="post",
+            label=f"{result['param_name']} = {measure['param_value']}",
+            linewidth=LINE_WIDTH,
+        )
+
+    configure_axes(ax, "gap (%)", col_background, col_foreground)
+    ax.legend(labelcolor=col_foreground, edgecolor=col_foreground, facecolor=col_background)
+    fig.patch.set_facecolor(col_background)
+
+    # Save the plot
+    fig.savefig(f"benches/output/png/{result['param_name']}_gap.png")
+    fig.savefig(f"benches/output/pdf/{result['param_name']}_gap.pdf")
+    fig.savefig(f"benches/output/svg/{result['param_name']}_gap.svg")
+
+
 def configure_axes(axes: Axes, label: str, col_background: str, col_foreground: str) -> None:
     """Configure common properties of an axes."""
     axes.set_ylim(bottom=0)
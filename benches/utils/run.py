@@ -1,9 +1,11 @@
 """Utilities to run a benchmark."""
-from typing import Any, Callable, TypedDict
+from typing import Any, Callable, Literal, Optional, TypedDict
 
 from optiframe import InfeasibleError, ModelSize, StepTimes
 from optiframe.framework import InitializedOptimizer
 
+from cloud_resource_matcher.progress import SolverProgressLog
+
 from .formatting import print_result
 
 
@@ -18,11 +20,23 @@ class BenchmarkTime(TypedDict):
     solution_extraction: float
 
 
+# The name of a time measured in `BenchmarkTime`.
+TimeName = Literal[
+    "total", "validation", "pre_processing", "mip_construction", "solving", "solution_extraction"
+]
+
+
+# The relative gap of the solver over time, as (seconds, gap) pairs.
+GapOverTime = list[tuple[float, float]]
+
+
 class BenchmarkMeasure(TypedDict):
     """The benchmark measures for a single parameter value."""
 
     param_value: int
     times: list[BenchmarkTime]
+    # The gap over time for each measurement, if the solver tracks its progress
+    gaps_over_time: list[GapOverTime]
     variable_count: int
     constraint_count: int
 
@@ -53,6 +67,7 @@ def run_benchmark(
         variable_count: int = 0
         constraint_count: int = 0
         times: list[BenchmarkTime] = list()
+        gaps_over_time: list[GapOverTime] = list()
 
         for _ in range(measure_count):
             params = {**default_params, param_name: val}
@@ -77,6 +92,11 @@ def run_benchmark(
                         solution_extraction=step_times.extract_solution.total_seconds(),
                     )
                 )
+
+                progress: Optional[SolverProgressLog] = getattr(solver, "progress", None)
+
+                if progress is not None:
+                    gaps_over_time.append(progress.gap_over_time())
             except InfeasibleError:
                 print(f"- {params}  INFEASIBLE")
 
@@ -86,6 +106,7 @@ def run_benchmark(
                 variable_count=variable_count,
                 constraint_count=constraint_count,
                 times=times,
+                gaps_over_time=gaps_over_time,
             )
         )
 
@@ -0,0 +1,369 @@
+"""Split problem instances into independent components and solve them in parallel.
+
+Two CRs are coupled if there is traffic between them or if they can both be deployed
+on a CS whose instance limit might be exceeded.
+The connected components of this coupling graph can be solved as separate MIPs
+and their solutions are merged afterwards.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+import numpy as np
+from optiframe import ModelSize, SolutionObjValue, StepData, StepTimes
+from optiframe.framework import InitializedOptimizer
+from optiframe.framework.default_tasks import CreateProblemTask, ProblemSettings, SolveTask
+from optiframe.workflow_engine.workflow import Workflow
+
+from cloud_resource_matcher.modules.base import BaseData, BaseSolution, CompactBaseData
+from cloud_resource_matcher.modules.base.data import CloudResource, CloudService
+from cloud_resource_matcher.modules.base.mip_construction import MipConstructionBaseTask
+from cloud_resource_matcher.modules.base.pre_processing import PreProcessingBaseTask
+from cloud_resource_matcher.modules.base.validation import ValidationBaseTask
+from cloud_resource_matcher.modules.network import NetworkData
+from cloud_resource_matcher.modules.network.mip_construction import MipConstructionNetworkTask
+from cloud_resource_matcher.modules.network.pre_processing import PreProcessingNetworkTask
+from cloud_resource_matcher.modules.network.validation import ValidateNetworkTask
+from cloud_resource_matcher.modules.performance import PerformanceData
+from cloud_resource_matcher.modules.performance.pre_processing import (
+    PreProcessingPerformanceTask,
+)
+from cloud_resource_matcher.modules.performance.validation import ValidatePerformanceTask
+from cloud_resource_matcher.modules.service_limits import ServiceLimitsData
+from cloud_resource_matcher.modules.service_limits.mip_construction import (
+    MipConstructionServiceLimitsTask,
+)
+from cloud_resource_matcher.modules.service_limits.pre_processing import (
+    PreProcessingServiceLimitsTask,
+)
+from cloud_resource_matcher.modules.service_limits.validation import (
+    ValidationServiceLimitsTask,
+)
+from cloud_resource_matcher.separable import SEPARABLE_SOLUTION_EXTRACTION_TASKS
+from cloud_resource_matcher.validation import validate
+
+# The tasks of the modules that can be split into components.
+# The multi cloud module couples all CRs through the CSP counts, so it prevents the split.
+DECOMPOSABLE_TASKS: set[Any] = {
+    CreateProblemTask,
+    SolveTask,
+    ValidationBaseTask,
+    ValidatePerformanceTask,
+    ValidateNetworkTask,
+    ValidationServiceLimitsTask,
+    PreProcessingBaseTask,
+    PreProcessingPerformanceTask,
+    PreProcessingNetworkTask,
+    PreProcessingServiceLimitsTask,
+    MipConstructionBaseTask,
+    MipConstructionNetworkTask,
+    MipConstructionServiceLimitsTask,
+    *SEPARABLE_SOLUTION_EXTRACTION_TASKS,
+}
+
+
+def is_decomposable(optimizer: InitializedOptimizer) -> bool:
+    """Determine if the modules of the optimizer allow to split the problem into components.
+
+    This is the case if only the base, performance, network and service limits modules are used.
+    """
+    return all(
+        task in DECOMPOSABLE_TASKS
+        for step in optimizer.workflow.workflow.steps
+        for task in step.tasks
+    )
+
+
+def find_components(step_data: StepData) -> list[list[CloudResource]]:
+    """Find the groups of CRs that are coupled with each other.
+
+    The step data must be pre-processed, with the candidate mask applied.
+
+    :return: The CRs of each component, in the order of the CRs.
+    """
+    compact: CompactBaseData = step_data[CompactBaseData]
+    parent = list(range(len(compact.cloud_resources)))
+
+    def find(cr: int) -> int:
+        while parent[cr] != cr:
+            parent[cr] = parent[parent[cr]]
+            cr = parent[cr]
+        return cr
+
+    def union(cr1: int, cr2: int) -> None:
+        root1, root2 = find(cr1), find(cr2)
+        if root1 != root2:
+            parent[max(root1, root2)] = min(root1, root2)
+
+    # CRs with traffic between them
+    network_data: Optional[NetworkData] = step_data.get(NetworkData)
+
+    if network_data is not None:
+        for cr1, cr2 in network_data.cr_and_cr_to_traffic.keys():
+            union(compact.cr_index[cr1], compact.cr_index[cr2])
+
+    # CRs that share a CS whose limit can be exceeded
+    service_limits_data: Optional[ServiceLimitsData] = step_data.get(ServiceLimitsData)
+
+    if service_limits_data is not None:
+        candidate_crs = compact.candidate_crs()
+        max_instance_demand = np.fromiter(
+            (service_limits_data.cr_to_max_instance_demand[cr] for cr in compact.cloud_resources),
+            dtype=np.float64,
+            count=len(compact.cloud_resources),
+        )
+        cs_to_max_demand = np.bincount(
+            compact.cr_to_cs_indices,
+            weights=max_instance_demand[candidate_crs],
+            minlength=len(compact.cloud_services),
+        )
+
+        # Group the CRs of the candidates by CS
+        order = np.argsort(compact.cr_to_cs_indices, kind="stable")
+        cs_offsets = np.zeros(len(compact.cloud_services) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(compact.cr_to_cs_indices, minlength=len(compact.cloud_services)),
+            out=cs_offsets[1:],
+        )
+        crs_by_cs = candidate_crs[order].tolist()
+
+        for cs, limit in service_limits_data.cs_to_instance_limit.items():
+            i = compact.cs_index[cs]
+
+            # The limit can't be exceeded, even if all candidates are deployed on the CS
+            if cs_to_max_demand[i] <= limit:
+                continue
+
+            crs = crs_by_cs[cs_offsets[i] : cs_offsets[i + 1]]
+            for cr in crs[1:]:
+                union(crs[0], cr)
+
+    components: dict[int, list[CloudResource]] = dict()
+
+    for i, cr in enumerate(compact.cloud_resources):
+        components.setdefault(find(i), []).append(cr)
+
+    return list(components.values())
+
+
+def solve(
+    optimizer: InitializedOptimizer,
+    solver: Optional[Any] = None,
+    max_workers: Optional[int] = None,
+) -> StepData:
+    """Solve the problem, splitting it into independent components if possible.
+
+    Each component is solved as its own MIP in a process pool.
+    If the problem can't be split, the MIP is constructed and solved as usual.
+    The returned data contains the merged solution, the total objective value
+    and the total model size of all components.
+
+    :param optimizer: The optimizer, initialized with the problem instance.
+    :param solver: The PuLP solver to use for the MIPs. Must be picklable.
+    :param max_workers: The maximum number of processes to use.
+    If set to `1`, the components are solved in the current process.
+    :raises ValidationError: If the data of any module is not valid.
+    :raises InfeasibleError: If any of the components doesn't have a solution.
+    """
+    decomposable = is_decomposable(optimizer)
+    pre_processed = validate(optimizer).pre_processing()
+
+    if not decomposable:
+        return pre_processed.build_mip().solve(solver)
+
+    step_data = pre_processed.workflow.step_data
+    base_data: BaseData = step_data[BaseData]
+    compact: CompactBaseData = step_data[CompactBaseData]
+
+    if compact.apply_candidate_mask():
+        base_data.cr_to_cs_list = compact.cr_to_cs_list()
+
+    components = find_components(step_data)
+
+    if len(components) <= 1:
+        return pre_processed.build_mip().solve(solver)
+
+    start = datetime.now()
+    sub_problems = [
+        _SubProblem(
+            workflow=optimizer.workflow.workflow,
+            problem_settings=step_data[ProblemSettings],
+            data=_restrict_data(step_data, component),
+            solver=solver,
+        )
+        for component in components
+    ]
+
+    if max_workers == 1:
+        results = [_solve_sub_problem(sub_problem) for sub_problem in sub_problems]
+    else:
+        worker_count = max_workers or os.cpu_count() or 1
+        # Send multiple components at once to reduce the overhead for small components
+        chunk_size = max(1, len(sub_problems) // (4 * worker_count))
+
+        with ProcessPoolExecutor(worker_count) as executor:
+            results = list(executor.map(_solve_sub_problem, sub_problems, chunksize=chunk_size))
+
+    step_data[BaseSolution] = BaseSolution(
+        cr_to_cs_matching={
+            cr: cs for result in results for cr, cs in result.solution.cr_to_cs_matching.items()
+        },
+        cs_instance_count=_merge_instance_counts(result.solution for result in results),
+    )
+    step_data[SolutionObjValue] = SolutionObjValue(
+        sum(result.objective_value for result in results)
+    )
+    step_data[StepTimes] = StepTimes(
+        validate=pre_processed.validate_time,
+        pre_processing=pre_processed.pre_processing_time,
+        build_mip=timedelta(),
+        solve=datetime.now() - start,
+        extract_solution=timedelta(),
+    )
+    step_data[ModelSize] = ModelSize(
+        variable_count=sum(result.model_size.variable_count for result in results),
+        constraint_count=sum(result.model_size.constraint_count for result in results),
+    )
+
+    return step_data
+
+
+@dataclass
+class _SubProblem:
+    """The data needed to solve one component in a separate process."""
+
+    workflow: Workflow
+    problem_settings: ProblemSettings
+    data: list[Any]
+    solver: Optional[Any]
+
+
+@dataclass
+class _SubProblemResult:
+    """The solution of one component."""
+
+    solution: BaseSolution
+    objective_value: float
+    model_size: ModelSize
+
+
+def _solve_sub_problem(sub_problem: _SubProblem) -> _SubProblemResult:
+    workflow = sub_problem.workflow.initialize(*sub_problem.data).add_data(
+        sub_problem.problem_settings
+    )
+    step_data = InitializedOptimizer(workflow).solve(sub_problem.solver)
+
+    return _SubProblemResult(
+        solution=step_data[BaseSolution],
+        objective_value=step_data[SolutionObjValue].objective_value,
+        model_size=step_data[ModelSize],
+    )
+
+
+def _merge_instance_counts(solutions: Any) -> dict[CloudService, int]:
+    cs_instance_count: dict[CloudService, int] = dict()
+
+    for solution in solutions:
+        for cs, count in solution.cs_instance_count.items():
+            cs_instance_count[cs] = cs_instance_count.get(cs, 0) + count
+
+    return cs_instance_count
+
+
+def _restrict_data(step_data: StepData, component: list[CloudResource]) -> list[Any]:
+    """Restrict the data of all modules to the CRs of the component and their CSs."""
+    base_data: BaseData = step_data[BaseData]
+    crs = set(component)
+    cloud_services = list(
+        dict.fromkeys(cs for cr in component for cs in base_data.cr_to_cs_list[cr])
+    )
+    css = set(cloud_services)
+
+    data: list[Any] = [
+        BaseData(
+            cloud_resources=component,
+            cloud_services=cloud_services,
+            cr_to_cs_list={cr: base_data.cr_to_cs_list[cr] for cr in component},
+            cs_to_base_cost={cs: base_data.cs_to_base_cost[cs] for cs in cloud_services},
+            cr_to_instance_demand={cr: base_data.cr_to_instance_demand[cr] for cr in component},
+        )
+    ]
+
+    performance_data: Optional[PerformanceData] = step_data.get(PerformanceData)
+
+    if performance_data is not None:
+        data.append(
+            PerformanceData(
+                performance_criteria=performance_data.performance_criteria,
+                performance_demand={
+                    key: value
+                    for key, value in performance_data.performance_demand.items()
+                    if key[0] in crs
+                },
+                performance_supply={
+                    key: value
+                    for key, value in performance_data.performance_supply.items()
+                    if key[0] in css
+                },
+                cost_per_unit={
+                    key: value
+                    for key, value in performance_data.cost_per_unit.items()
+                    if key[0] in css
+                },
+            )
+        )
+
+    network_data: Optional[NetworkData] = step_data.get(NetworkData)
+
+    if network_data is not None:
+        data.append(
+            NetworkData(
+                locations=network_data.locations,
+                loc_and_loc_to_latency=network_data.loc_and_loc_to_latency,
+                cs_to_loc={cs: network_data.cs_to_loc[cs] for cs in cloud_services},
+                cr_and_loc_to_traffic={
+                    key: value
+                    for key, value in network_data.cr_and_loc_to_traffic.items()
+                    if key[0] in crs
+                },
+                cr_and_loc_to_max_latency={
+                    key: value
+                    for key, value in network_data.cr_and_loc_to_max_latency.items()
+                    if key[0] in crs
+                },
+                cr_and_cr_to_traffic={
+                    key: value
+                    for key, value in network_data.cr_and_cr_to_traffic.items()
+                    if key[0] in crs
+                },
+                cr_and_cr_to_max_latency={
+                    key: value
+                    for key, value in network_data.cr_and_cr_to_max_latency.items()
+                    if key[0] in crs and key[1] in crs
+                },
+                loc_and_loc_to_cost=network_data.loc_and_loc_to_cost,
+                formulation=network_data.formulation,
+            )
+        )
+
+    service_limits_data: Optional[ServiceLimitsData] = step_data.get(ServiceLimitsData)
+
+    if service_limits_data is not None:
+        data.append(
+            ServiceLimitsData(
+                cs_to_instance_limit={
+                    cs: limit
+                    for cs, limit in service_limits_data.cs_to_instance_limit.items()
+                    if cs in css
+                },
+                cr_to_max_instance_demand={
+                    cr: demand
+                    for cr, demand in service_limits_data.cr_to_max_instance_demand.items()
+                    if cr in crs
+                },
+            )
+        )
+
+    return data
@@ -0,0 +1,263 @@
+"""An on-disk cache of constructed MIPs, keyed by the problem instance.
+
+Validating and pre-processing the data and constructing the MIP can take a long time
+for large problem instances, even if the same instance has been solved before.
+The cache stores the step data after the MIP construction, i.e. the pre-processed
+candidates, the MIP and the variables needed for the solution extraction.
+A later run with the same input data and the same modules skips these steps entirely.
+
+The entries are identified by a fingerprint of the input data and the tasks of the optimizer.
+If the total size of the cache exceeds its limit, the least recently used entries are evicted.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass, fields, is_dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Optional
+
+import numpy as np
+from optiframe import StepData
+from optiframe.framework import BuiltOptimizer, InitializedOptimizer
+
+from cloud_resource_matcher.validation import validate
+
+logger = logging.getLogger(__name__)
+
+# Changes whenever the format of the cache entries changes, to invalidate old entries
+CACHE_VERSION = 1
+
+# The file extension of the cache entries
+_ENTRY_EXTENSION = ".pickle"
+
+
+@dataclass
+class ModelCacheStats:
+    """The usage of the model cache for a solved problem instance."""
+
+    # Whether the MIP has been loaded from the cache
+    hit: bool
+    # The number of cache hits and misses of the cache so far, including this run
+    hits: int
+    misses: int
+    # The time needed to load the MIP from or store it in the cache
+    cache_time: timedelta
+
+
+def fingerprint(optimizer: InitializedOptimizer, *extra: Any) -> str:
+    """Compute a stable fingerprint of the problem instance and the modules of the optimizer.
+
+    The fingerprint doesn't depend on the order of dictionaries and sets,
+    so it stays the same across processes.
+
+    :param optimizer: The optimizer, initialized with the problem instance.
+    :param extra: Additional values to include in the fingerprint, e.g. solver parameters.
+    :return: The fingerprint as hexadecimal string.
+    :raises TypeError: If the input data contains values that can't be fingerprinted.
+    """
+    sha = hashlib.sha256()
+    sha.update(f"version:{CACHE_VERSION};".encode())
+
+    for step in optimizer.workflow.workflow.steps:
+        tasks = ",".join(f"{task.__module__}.{task.__qualname__}" for task in step.tasks)
+        sha.update(f"step:{step.name}[{tasks}];".encode())
+
+    data = sorted(
+        (_encode(data_type), _encode(value))
+        for data_type, value in optimizer.workflow.step_data.items()
+    )
+
+    for encoded_type, encoded_value in data:
+        sha.update(encoded_type)
+        sha.update(encoded_value)
+
+    for value in extra:
+        sha.update(_encode(value))
+
+    return sha.hexdigest()
+
+
+def _encode(value: Any) -> bytes:
+    """Encode a value to a canonical byte string."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return f"{type(value).__name__}:{value!r};".encode()
+
+    if isinstance(value, type):
+        return f"type:{value.__module__}.{value.__qualname__};".encode()
+
+    if isinstance(value, Enum):
+        return f"enum:{type(value).__qualname__}.{value.name};".encode()
+
+    if is_dataclass(value):
+        encoded = b"".join(
+            field.name.encode() + b"=" + _encode(getattr(value, field.name))
+            for field in fields(value)
+        )
+        return f"dataclass:{type(value).__qualname__}(".encode() + encoded + b");"
+
+    if isinstance(value, dict):
+        items = sorted(_encode(key) + b":" + _encode(item) for key, item in value.items())
+        return b"dict{" + b"".join(items) + b"};"
+
+    if isinstance(value, (set, frozenset)):
+        return b"set{" + b"".join(sorted(_encode(item) for item in value)) + b"};"
+
+    if isinstance(value, (list, tuple)):
+        return b"list[" + b"".join(_encode(item) for item in value) + b"];"
+
+    if isinstance(value, np.ndarray):
+        return f"array:{value.dtype}{value.shape}:".encode() + value.tobytes() + b";"
+
+    raise TypeError(f"Can't fingerprint a value of type {type(value).__qualname__}")
+
+
+class ModelCache:
+    """A size-bounded on-disk cache of constructed MIPs.
+
+    The cache can be shared by multiple processes, entries are written atomically.
+    """
+
+    directory: str
+    max_size: int
+    hits: int
+    misses: int
+
+    def __init__(self, directory: str, max_size: int = 1024**3):
+        """Create a cache in the given directory.
+
+        :param directory: The directory to store the entries in. Created if it doesn't exist.
+        :param max_size: The maximum total size of all entries in bytes.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+    def build_mip(self, optimizer: InitializedOptimizer) -> BuiltOptimizer:
+        """Construct the MIP of the problem instance or load it from the cache.
+
+        On a cache hit, the validation, pre-processing and MIP construction are skipped.
+        Their times are reported as zero and the time to load the MIP is reported as the
+        time of the MIP construction.
+        The usage of the cache is added to the step data as `ModelCacheStats`.
+
+        :param optimizer: The optimizer, initialized with the problem instance.
+        :return: The optimizer with the constructed MIP.
+        :raises ValidationError: If the data of any module is not valid.
+        """
+        path = self._entry_path(fingerprint(optimizer))
+        workflow = optimizer.workflow
+        start = datetime.now()
+
+        try:
+            with open(path, "rb") as file:
+                step_data: StepData = pickle.load(file)
+        except FileNotFoundError:
+            pass
+        else:
+            # Mark the entry as recently used
+            os.utime(path)
+            self.hits += 1
+
+            workflow.step_data.update(step_data)
+            load_time = datetime.now() - start
+            workflow.add_data(ModelCacheStats(True, self.hits, self.misses, load_time))
+            logger.info(f"Loaded the MIP from the cache in {load_time.total_seconds():.2f}s")
+
+            return BuiltOptimizer(workflow, timedelta(), timedelta(), load_time)
+
+        self.misses += 1
+        built = validate(optimizer).pre_processing().build_mip()
+
+        start = datetime.now()
+        write_entry(path, built.workflow.step_data)
+        evict_entries(self.directory, _ENTRY_EXTENSION, self.max_size)
+        store_time = datetime.now() - start
+
+        workflow.add_data(ModelCacheStats(False, self.hits, self.misses, store_time))
+        logger.info(f"Stored the MIP in the cache in {store_time.total_seconds():.2f}s")
+
+        return built
+
+    def solve(self, optimizer: InitializedOptimizer, solver: Optional[Any] = None) -> StepData:
+        """Solve the problem instance, using the cached MIP if available.
+
+        :param optimizer: The optimizer, initialized with the problem instance.
+        :param solver: The PuLP solver to use.
+        :raises ValidationError: If the data of any module is not valid.
+        """
+        return self.build_mip(optimizer).solve(solver)
+
+    def size(self) -> int:
+        """Determine the total size of all entries in bytes."""
+        return sum(os.path.getsize(path) for path in entry_paths(self.directory, _ENTRY_EXTENSION))
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        for path in entry_paths(self.directory, _ENTRY_EXTENSION):
+            os.remove(path)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _ENTRY_EXTENSION)
+
+
+def entry_paths(directory: str, extension: str) -> list[str]:
+    """List the paths of all cache entries in the directory with the given file extension."""
+    return [
+        os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(extension)
+    ]
+
+
+def write_entry(path: str, value: Any) -> None:
+    """Pickle the value to the cache entry at the given path.
+
+    The value is written to a temporary file first,
+    so that other processes never read partial entries.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "wb") as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def evict_entries(directory: str, extension: str, max_size: int) -> None:
+    """Remove the least recently used cache entries until their total size fits the limit.
+
+    The modification time of the entries is used as their last access time.
+    """
+    entries = []
+
+    for path in entry_paths(directory, extension):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            # Evicted by another process in the meantime
+            continue
+
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total_size = sum(size for _, size, _ in entries)
+
+    # Evict the least recently used entries first
+    for _, size, path in sorted(entries):
+        if total_size <= max_size:
+            break
+
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+        total_size -= size
+        logger.info(f"Evicted {os.path.basename(path)} from the cache")
@@ -0,0 +1,22 @@
+"""The aggregation module.
+
+This module groups equivalent CRs, e.g. the identical VMs of a homogeneous fleet.
+CRs are equivalent if they have the same applicable CSs with the same costs,
+the same instance demands and no data of other modules that distinguishes them,
+such as CR -> CR connections or different maximum instance demands.
+Instead of one binary variable per CR and CS, every group gets one integer variable per CS
+for the number of its CRs deployed there. This removes the symmetry between the CRs.
+The solution is expanded to the individual CRs again.
+
+It must be added after all other modules, so that their data is taken into account.
+Otherwise, a `RuntimeError` is raised during the pre-processing.
+Custom modules with data per CR must distinguish the CRs with
+`CompactBaseData.distinguish_crs` during the pre-processing.
+"""
+from optiframe import OptimizationModule
+
+from .pre_processing import PreProcessingAggregationTask
+
+aggregation_module = OptimizationModule(pre_processing=PreProcessingAggregationTask)
+
+__all__ = ["aggregation_module"]
@@ -0,0 +1,53 @@
+"""Implementation of the pre-processing step for the aggregation module."""
+from typing import Any
+
+import numpy as np
+from optiframe import PreProcessingTask
+
+from cloud_resource_matcher.modules.base import CompactBaseData
+
+
+class PreProcessingAggregationTask(PreProcessingTask[CompactBaseData]):
+    """A task to group equivalent CRs once all modules have restricted the candidates."""
+
+    compact_base_data: CompactBaseData
+
+    def __init__(self, compact_base_data: CompactBaseData):
+        self.compact_base_data = compact_base_data
+
+    def pre_process(self) -> CompactBaseData:
+        """Group the CRs by their class, instance demand and remaining candidates with costs.
+
+        Only groups with at least two CRs are kept, the CRs are ordered by their index.
+        """
+        compact = self.compact_base_data
+        offsets = compact.cr_to_cs_offsets.tolist()
+        mask = compact.candidate_mask
+        costs = compact.total_candidate_costs()
+        cr_classes = compact.cr_classes.tolist()
+        instance_demand = compact.cr_to_instance_demand.tolist()
+
+        signature_to_group: dict[Any, list[int]] = dict()
+
+        for i in range(len(compact.cloud_resources)):
+            start, end = offsets[i], offsets[i + 1]
+            keep = mask[start:end]
+
+            # CRs without candidates are infeasible anyway
+            if not keep.any():
+                continue
+
+            # The order of the candidates doesn't matter
+            cs_indices = compact.cr_to_cs_indices[start:end][keep]
+            order = np.argsort(cs_indices, kind="stable")
+            signature = (
+                cr_classes[i],
+                instance_demand[i],
+                cs_indices[order].tobytes(),
+                costs[start:end][keep][order].tobytes(),
+            )
+            signature_to_group.setdefault(signature, []).append(i)
+
+        compact.cr_groups = [group for group in signature_to_group.values() if len(group) > 1]
+        compact.aggregated = True
+        return compact
@@ -8,15 +8,26 @@ This module isn't very useful on its own, but provides the basis for all other m
 """
 from optiframe import OptimizationModule
 
+from .compact_data import CompactBaseData
 from .data import BaseData
+from .errors import NoCandidatesError
 from .mip_construction import BaseMipData, MipConstructionBaseTask
+from .pre_processing import PreProcessingBaseTask
 from .solution_extraction import BaseSolution, SolutionExtractionBaseTask
 from .validation import ValidationBaseTask
 
 base_module = OptimizationModule(
     validation=ValidationBaseTask,
+    pre_processing=PreProcessingBaseTask,
     mip_construction=MipConstructionBaseTask,
     solution_extraction=SolutionExtractionBaseTask,
 )
 
-__all__ = ["BaseData", "BaseMipData", "BaseSolution", "base_module"]
+__all__ = [
+    "BaseData",
+    "CompactBaseData",
+    "BaseMipData",
+    "BaseSolution",
+    "NoCandidatesError",
+    "base_module",
+]
@@ -0,0 +1,267 @@
+"""A compact, integer-indexed representation of the data for the base module."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from .data import BaseData, CloudResource, CloudService
+
+
+@dataclass
+class CompactBaseData:
+    """The data for the base module, interned to dense integer indexes.
+
+    Every CR and CS is identified by its position in `cloud_resources` and
+    `cloud_services` respectively.
+    The applicable CSs for the CRs are stored in compressed sparse row (CSR) format:
+    The CS indexes applicable for the CR with index `i` are
+    `cr_to_cs_indices[cr_to_cs_offsets[i]:cr_to_cs_offsets[i + 1]]`.
+
+    Each position in `cr_to_cs_indices` is called a candidate.
+    Other modules can store their data per candidate in arrays of the same length.
+
+    The pre-processing tasks of the modules exclude candidates by restricting the
+    shared `candidate_mask`. The excluded candidates are only removed once the mask
+    is applied, which avoids re-building the candidates after every module.
+    They also accumulate the costs of the candidates in `candidate_costs`,
+    so that the objective only needs one coefficient per matching variable.
+    """
+
+    # The identifiers of the cloud resources, ordered by their index.
+    cloud_resources: list[CloudResource]
+
+    # The identifiers of the cloud services, ordered by their index.
+    cloud_services: list[CloudService]
+
+    # A map from the identifier of a cloud resource to its index.
+    cr_index: dict[CloudResource, int]
+
+    # A map from the identifier of a cloud service to its index.
+    cs_index: dict[CloudService, int]
+
+    # The start of the candidates of each CR in `cr_to_cs_indices`.
+    # Has one more entry than there are CRs, the last entry is the total candidate count.
+    cr_to_cs_offsets: npt.NDArray[np.int64]
+
+    # The indexes of the CSs applicable for each CR, concatenated in CR order.
+    cr_to_cs_indices: npt.NDArray[np.int32]
+
+    # The fixed base cost of each CS, indexed by the CS index.
+    cs_to_base_cost: npt.NDArray[np.float64]
+
+    # The instance demand of each CR, indexed by the CR index.
+    cr_to_instance_demand: npt.NDArray[np.int64]
+
+    # Whether each candidate is still applicable.
+    # Cleared entries are removed from the candidates when the mask is applied.
+    candidate_mask: npt.NDArray[np.bool_]
+
+    # The costs of each candidate contributed by the modules, excluding the base costs.
+    candidate_costs: npt.NDArray[np.float64]
+
+    # Whether each CR is deployed to its single remaining candidate without a MIP variable.
+    # Indexed by the CR index, set by the candidate fixing module.
+    fixed_crs: npt.NDArray[np.bool_]
+
+    # The filter that excluded the last applicable CS of a CR, by the identifier of the CR.
+    cr_to_emptied_by: dict[CloudResource, str]
+
+    # The equivalence class of each CR, indexed by the CR index.
+    # CRs of different classes are never aggregated, see `distinguish_crs`.
+    cr_classes: npt.NDArray[np.int64]
+
+    # The groups of equivalent CRs by their indexes, set by the aggregation module.
+    # Every group has at least two CRs, which are modeled together in the MIP.
+    cr_groups: list[list[int]]
+
+    # Whether the aggregation module has grouped the CRs already.
+    # Afterwards, the candidates can't be restricted and the CRs can't be distinguished anymore.
+    aggregated: bool
+
+    @staticmethod
+    def from_base_data(base_data: BaseData) -> CompactBaseData:
+        """Compile the base data into the compact representation.
+
+        The base data must already be validated.
+        """
+        cloud_resources = list(base_data.cloud_resources)
+        cloud_services = list(base_data.cloud_services)
+
+        cr_index = {cr: i for i, cr in enumerate(cloud_resources)}
+        cs_index = {cs: i for i, cs in enumerate(cloud_services)}
+
+        candidate_counts = np.fromiter(
+            (len(base_data.cr_to_cs_list[cr]) for cr in cloud_resources),
+            dtype=np.int64,
+            count=len(cloud_resources),
+        )
+        cr_to_cs_offsets = np.zeros(len(cloud_resources) + 1, dtype=np.int64)
+        np.cumsum(candidate_counts, out=cr_to_cs_offsets[1:])
+
+        cr_to_cs_indices = np.fromiter(
+            (cs_index[cs] for cr in cloud_resources for cs in base_data.cr_to_cs_list[cr]),
+            dtype=np.int32,
+            count=int(cr_to_cs_offsets[-1]),
+        )
+
+        return CompactBaseData(
+            cloud_resources=cloud_resources,
+            cloud_services=cloud_services,
+            cr_index=cr_index,
+            cs_index=cs_index,
+            cr_to_cs_offsets=cr_to_cs_offsets,
+            cr_to_cs_indices=cr_to_cs_indices,
+            cs_to_base_cost=np.fromiter(
+                (base_data.cs_to_base_cost[cs] for cs in cloud_services),
+                dtype=np.float64,
+                count=len(cloud_services),
+            ),
+            cr_to_instance_demand=np.fromiter(
+                (base_data.cr_to_instance_demand[cr] for cr in cloud_resources),
+                dtype=np.int64,
+                count=len(cloud_resources),
+            ),
+            candidate_mask=np.ones(int(cr_to_cs_offsets[-1]), dtype=np.bool_),
+            candidate_costs=np.zeros(int(cr_to_cs_offsets[-1]), dtype=np.float64),
+            fixed_crs=np.zeros(len(cloud_resources), dtype=np.bool_),
+            cr_to_emptied_by=dict(),
+            cr_classes=np.zeros(len(cloud_resources), dtype=np.int64),
+            cr_groups=[],
+            aggregated=False,
+        )
+
+    @property
+    def candidate_count(self) -> int:
+        """The total number of candidates, i.e. applicable CR-CS pairs."""
+        return len(self.cr_to_cs_indices)
+
+    def candidates(self, cr: int) -> npt.NDArray[np.int32]:
+        """Get the indexes of the CSs applicable for the CR with the given index."""
+        return self.cr_to_cs_indices[self.cr_to_cs_offsets[cr] : self.cr_to_cs_offsets[cr + 1]]
+
+    def candidate_crs(self) -> npt.NDArray[np.int64]:
+        """Get the CR index for every candidate.
+
+        This is the row index matching `cr_to_cs_indices`.
+        """
+        return np.repeat(
+            np.arange(len(self.cloud_resources), dtype=np.int64), np.diff(self.cr_to_cs_offsets)
+        )
+
+    def candidate_base_costs(self) -> npt.NDArray[np.float64]:
+        """Get the base cost of every candidate.
+
+        This is the base cost of the CS multiplied with the instance demand of the CR.
+        """
+        return (
+            self.cr_to_instance_demand[self.candidate_crs()]
+            * self.cs_to_base_cost[self.cr_to_cs_indices]
+        )
+
+    def add_candidate_costs(self, costs: npt.NDArray[np.float64]) -> None:
+        """Add the costs of a module to the costs of the candidates.
+
+        :param costs: The costs with one entry per candidate.
+        """
+        assert len(costs) == self.candidate_count, "The costs must have one entry per candidate"
+
+        self.candidate_costs += costs
+
+    def total_candidate_costs(self) -> npt.NDArray[np.float64]:
+        """Get the total cost of every candidate, including the base costs."""
+        return self.candidate_base_costs() + self.candidate_costs
+
+    def filter_candidates(self, keep: npt.NDArray[np.bool_]) -> None:
+        """Only keep the candidates where the mask is `True`.
+
+        :param keep: A boolean mask with one entry per candidate.
+        """
+        assert len(keep) == self.candidate_count, "The mask must have one entry per candidate"
+
+        kept_before = np.zeros(len(keep) + 1, dtype=np.int64)
+        np.cumsum(keep, out=kept_before[1:])
+
+        self.cr_to_cs_offsets = kept_before[self.cr_to_cs_offsets]
+        self.cr_to_cs_indices = self.cr_to_cs_indices[keep]
+        self.candidate_mask = self.candidate_mask[keep]
+        self.candidate_costs = self.candidate_costs[keep]
+
+    def restrict_candidates(
+        self, keep: npt.NDArray[np.bool_], filter_name: str = "the pre-processing"
+    ) -> None:
+        """Exclude the candidates where the mask is `False` once the mask is applied.
+
+        This only updates the shared `candidate_mask` and doesn't copy the candidates.
+
+        :param keep: A boolean mask with one entry per candidate.
+        :param filter_name: The name of the filter, which is reported for the CRs
+        that don't have any applicable CS left afterwards.
+        """
+        assert len(keep) == self.candidate_count, "The mask must have one entry per candidate"
+        self._check_not_aggregated()
+
+        had_candidates = self.remaining_candidate_counts() > 0
+        self.candidate_mask &= keep
+        emptied = had_candidates & (self.remaining_candidate_counts() == 0)
+
+        for i in np.flatnonzero(emptied).tolist():
+            self.cr_to_emptied_by[self.cloud_resources[i]] = filter_name
+
+    def remaining_candidate_counts(self) -> npt.NDArray[np.int64]:
+        """Get the number of candidates of each CR that are not excluded by the mask."""
+        return np.bincount(
+            self.candidate_crs()[self.candidate_mask], minlength=len(self.cloud_resources)
+        )
+
+    def apply_candidate_mask(self) -> bool:
+        """Remove all candidates that have been excluded by the `candidate_mask`.
+
+        :return: `True` if any candidates have been removed.
+        """
+        if self.candidate_mask.all():
+            return False
+
+        self.filter_candidates(self.candidate_mask)
+        return True
+
+    def distinguish_crs(self, values: npt.NDArray[Any]) -> None:
+        """Only consider CRs as equivalent if they have the same value.
+
+        Modules with data per CR that doesn't affect the candidates or their costs
+        must distinguish the CRs by this data during the pre-processing.
+        Otherwise, the aggregation module could group CRs that are not equivalent.
+
+        :param values: One value or one row of values per CR, indexed by the CR index.
+        """
+        assert len(values) == len(self.cloud_resources), "The values must have one entry per CR"
+        self._check_not_aggregated()
+
+        _, classes = np.unique(
+            np.column_stack((self.cr_classes, values)), axis=0, return_inverse=True
+        )
+        self.cr_classes = classes.astype(np.int64)
+
+    def _check_not_aggregated(self) -> None:
+        """Make sure that the CRs haven't been grouped by the aggregation module yet.
+
+        :raises RuntimeError: If the aggregation module has been added before another module.
+        """
+        if self.aggregated:
+            raise RuntimeError(
+                "The aggregation module must be added after all other modules, "
+                "but another module has changed the CRs after they have been aggregated"
+            )
+
+    def cr_to_cs_list(self) -> dict[CloudResource, list[CloudService]]:
+        """Convert the candidates back to a map from CR identifiers to CS identifiers."""
+        cloud_services = self.cloud_services
+        offsets = self.cr_to_cs_offsets.tolist()
+        indices = self.cr_to_cs_indices.tolist()
+
+        return {
+            cr: [cloud_services[cs] for cs in indices[offsets[i] : offsets[i + 1]]]
+            for i, cr in enumerate(self.cloud_resources)
+        }
@@ -1,5 +1,6 @@
 """The data for the base module."""
 from dataclasses import dataclass
+from functools import cached_property
 
 # Any resource that needs to be deployed to the cloud (e.g. virtual machines).
 # Often abbreviated as 'CR'.
@@ -21,6 +22,9 @@ class BaseData:
     cloud resources and cloud services and which services can be used
     for which resources.
     Flat (or upfront) costs for the cloud services can also be specified.
+
+    The set-based indexes are computed once on first access and shared by all modules.
+    The lists of cloud resources and cloud services must not be modified afterwards.
     """
 
     # The identifiers of available cloud resources.
@@ -40,3 +44,13 @@ class BaseData:
     # A map from a cloud resource to the number of instances needed
     # over the optimization time range.
     cr_to_instance_demand: dict[CloudResource, int]
+
+    @cached_property
+    def cr_set(self) -> frozenset[CloudResource]:
+        """The identifiers of the cloud resources, for fast membership tests."""
+        return frozenset(self.cloud_resources)
+
+    @cached_property
+    def cs_set(self) -> frozenset[CloudService]:
+        """The identifiers of the cloud services, for fast membership tests."""
+        return frozenset(self.cloud_services)
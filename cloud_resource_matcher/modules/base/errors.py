@@ -0,0 +1,35 @@
+"""The errors of the base module, which may be raised by every module."""
+from optiframe import InfeasibleError
+
+from cloud_resource_matcher.validation import MAX_REPORTED_VIOLATIONS
+
+from .data import CloudResource
+
+
+class NoCandidatesError(InfeasibleError):
+    """Some CRs don't have any applicable CS left after the pre-processing."""
+
+    # The filter that excluded the last applicable CS, by the identifier of the CR
+    cr_to_emptied_by: dict[CloudResource, str]
+    # The message listing the CRs without applicable CS
+    message: str
+
+    def __init__(self, cr_to_emptied_by: dict[CloudResource, str]):
+        super().__init__()
+        self.cr_to_emptied_by = cr_to_emptied_by
+
+        reported = "\n".join(
+            f"- CR {cr} has no applicable CS left after {emptied_by}"
+            for cr, emptied_by in list(cr_to_emptied_by.items())[:MAX_REPORTED_VIOLATIONS]
+        )
+        remaining = len(cr_to_emptied_by) - MAX_REPORTED_VIOLATIONS
+        more = f"\n- ... and {remaining} more" if remaining > 0 else ""
+
+        self.message = (
+            f"The optimization problem does not have a solution, "
+            f"{len(cr_to_emptied_by)} CR(s) have no applicable CS:\n{reported}{more}"
+        )
+
+    def __str__(self) -> str:
+        """Describe the CRs without applicable CS."""
+        return self.message
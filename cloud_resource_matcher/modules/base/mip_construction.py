@@ -1,13 +1,15 @@
 """Implementation of the MIP construction step for the base module."""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Union
 
 from optiframe import MipConstructionTask
-from pulp import LpBinary, LpProblem, LpVariable, lpSum
+from pulp import LpAffineExpression, LpBinary, LpInteger, LpProblem, LpVariable
 
+from .compact_data import CompactBaseData
 from .data import BaseData, CloudResource, CloudService
 
 VarCrToCsMatching = dict[tuple[CloudResource, CloudService], LpVariable]
-CsToCrList = dict[CloudService, set[CloudResource]]
+CsToCrList = dict[CloudService, list[CloudResource]]
 
 
 @dataclass
@@ -20,49 +22,136 @@ class BaseMipData:
     # Which cloud resource should be deployed on which cloud service?
     var_cr_to_cs_matching: VarCrToCsMatching
 
+    # Which cloud resources can be deployed on which cloud service?
+    # This is the reverse of `BaseData.cr_to_cs_list` after the pre-processing
+    # and is defined for every cloud service.
+    # The fixed and aggregated cloud resources are not included.
+    cs_to_cr_list: CsToCrList
+
+    # The cloud resources that are deployed to their only applicable cloud service.
+    # They don't have a matching variable, see the candidate fixing module.
+    cr_to_fixed_cs: dict[CloudResource, CloudService] = field(default_factory=dict)
+
+    # How many cloud resources of a group are deployed on which cloud service?
+    # The groups are identified by their first cloud resource, see the aggregation module.
+    var_cr_group_to_cs_count: VarCrToCsMatching = field(default_factory=dict)
+
+    # The equivalent cloud resources of each group, by the first cloud resource of the group.
+    # They don't have a matching variable.
+    cr_groups: dict[CloudResource, list[CloudResource]] = field(default_factory=dict)
+
+    def cr_to_cs_matching(self, cr: CloudResource, cs: CloudService) -> Union[LpVariable, int]:
+        """Get the matching variable of the CR and CS, or its value if the CR is fixed.
+
+        The CS must be applicable for the CR and the CR must not be aggregated.
+        """
+        fixed_cs = self.cr_to_fixed_cs.get(cr)
+
+        if fixed_cs is None:
+            return self.var_cr_to_cs_matching[cr, cs]
+
+        return 1 if fixed_cs == cs else 0
+
 
 class MipConstructionBaseTask(MipConstructionTask[BaseMipData]):
     """A task to modify the MIP to implement the base module."""
 
     base_data: BaseData
+    compact_base_data: CompactBaseData
     problem: LpProblem
 
-    def __init__(self, base_data: BaseData, problem: LpProblem):
+    def __init__(self, base_data: BaseData, compact_base_data: CompactBaseData, problem: LpProblem):
         self.base_data = base_data
+        self.compact_base_data = compact_base_data
         self.problem = problem
 
     def construct_mip(self) -> BaseMipData:
         """Modify the MIP to implement the base module.
 
         Adds the central variables to determine which CR to deploy on which CS.
+        The candidates excluded during the pre-processing are removed first.
+        The CRs fixed during the pre-processing only add their cost to the objective.
+        The CRs aggregated during the pre-processing share variables with their group.
         """
+        compact = self.compact_base_data
+
+        if compact.apply_candidate_mask():
+            self.base_data.cr_to_cs_list = compact.cr_to_cs_list()
+
+        offsets = compact.cr_to_cs_offsets.tolist()
+        cs_indices = compact.cr_to_cs_indices.tolist()
+        costs = compact.total_candidate_costs().tolist()
+        fixed_crs = compact.fixed_crs.tolist()
+
         # Assign cloud resource cr to cloud service cs at time t?
         # ASSUMPTION: Each cloud service instance can only be used by one cloud resource instance
         # ASSUMPTION: All instances of one cloud resource have to be deployed
         #   on the same service type
-        var_cr_to_cs_matching: VarCrToCsMatching = {
-            (cr, cs): LpVariable(f"cr_to_cs_matching({cr},{cs})", cat=LpBinary)
-            for cr in self.base_data.cloud_resources
-            for cs in self.base_data.cr_to_cs_list[cr]
-        }
-
-        # Satisfy cloud resource demands
-        for cr in self.base_data.cloud_resources:
+        var_cr_to_cs_matching: VarCrToCsMatching = dict()
+        cr_to_fixed_cs: dict[CloudResource, CloudService] = dict()
+        cs_to_cr_list: CsToCrList = {cs: [] for cs in compact.cloud_services}
+        var_cr_group_to_cs_count: VarCrToCsMatching = dict()
+        cr_groups: dict[CloudResource, list[CloudResource]] = dict()
+        # The first CR of every group represents the whole group
+        first_cr_to_group = {group[0]: group for group in compact.cr_groups}
+        other_grouped_crs = {i for group in compact.cr_groups for i in group[1:]}
+        # The costs of the other modules have been accumulated during the pre-processing,
+        # so every variable only needs a single coefficient.
+        objective_terms: list[tuple[LpVariable, float]] = []
+        fixed_cost = 0.0
+
+        for i, cr in enumerate(compact.cloud_resources):
+            start, end = offsets[i], offsets[i + 1]
+
+            # The CR can only be deployed to a single CS, so its cost is a constant
+            if fixed_crs[i] and end - start == 1:
+                cr_to_fixed_cs[cr] = compact.cloud_services[cs_indices[start]]
+                fixed_cost += costs[start]
+                continue
+
+            if i in other_grouped_crs:
+                continue
+
+            group = first_cr_to_group.get(i)
+            cr_count = 1 if group is None else len(group)
+            variables: list[LpVariable] = []
+
+            for j in range(start, end):
+                cs_id = compact.cloud_services[cs_indices[j]]
+
+                if group is None:
+                    var = LpVariable(f"cr_to_cs_matching({cr},{cs_id})", cat=LpBinary)
+                    var_cr_to_cs_matching[cr, cs_id] = var
+                    cs_to_cr_list[cs_id].append(cr)
+                else:
+                    # The equivalent CRs are interchangeable, only their number per CS matters
+                    var = LpVariable(
+                        f"cr_group_to_cs_count({cr},{cs_id})",
+                        lowBound=0,
+                        upBound=cr_count,
+                        cat=LpInteger,
+                    )
+                    var_cr_group_to_cs_count[cr, cs_id] = var
+
+                variables.append(var)
+                objective_terms.append((var, costs[j]))
+
+            if group is not None:
+                cr_groups[cr] = [compact.cloud_resources[k] for k in group]
+
+            # Satisfy cloud resource demands
             self.problem += (
-                lpSum(var_cr_to_cs_matching[cr, cs] for cs in self.base_data.cr_to_cs_list[cr])
-                == 1,
+                LpAffineExpression((var, 1) for var in variables) == cr_count,
                 f"cr_demand({cr})",
             )
 
-        # Base costs for used cloud services
-        self.problem.objective += lpSum(
-            var_cr_to_cs_matching[cr, cs]
-            * self.base_data.cr_to_instance_demand[cr]
-            * self.base_data.cs_to_base_cost[cs]
-            for cr in self.base_data.cloud_resources
-            for cs in self.base_data.cr_to_cs_list[cr]
-        )
+        # Pay for the used cloud services
+        self.problem.objective += LpAffineExpression(objective_terms, constant=fixed_cost)
 
         return BaseMipData(
             var_cr_to_cs_matching=var_cr_to_cs_matching,
+            cs_to_cr_list=cs_to_cr_list,
+            cr_to_fixed_cs=cr_to_fixed_cs,
+            var_cr_group_to_cs_count=var_cr_group_to_cs_count,
+            cr_groups=cr_groups,
         )
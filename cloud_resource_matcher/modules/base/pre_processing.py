@@ -0,0 +1,22 @@
+"""Implementation of the pre-processing step for the base module."""
+from optiframe import PreProcessingTask
+
+from .compact_data import CompactBaseData
+from .data import BaseData
+
+
+class PreProcessingBaseTask(PreProcessingTask[CompactBaseData]):
+    """A task to compile the base data into its compact representation."""
+
+    base_data: BaseData
+
+    def __init__(self, base_data: BaseData):
+        self.base_data = base_data
+
+    def pre_process(self) -> CompactBaseData:
+        """Intern the CRs and CSs to integer indexes and store the candidates as arrays.
+
+        The pre-processing tasks of the other modules use the compact data
+        to restrict the applicable CSs of the CRs.
+        """
+        return CompactBaseData.from_base_data(self.base_data)
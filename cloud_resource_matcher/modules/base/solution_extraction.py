@@ -42,26 +42,41 @@ class SolutionExtractionBaseTask(SolutionExtractionTask[BaseSolution]):
         how many instances have to be bought of each CS.
         """
         cr_to_cs_matching: CrToCsMatching = dict()
-
-        for cr in self.base_data.cloud_resources:
-            for cs in self.base_data.cr_to_cs_list[cr]:
-                value = round(pulp.value(self.base_mip_data.var_cr_to_cs_matching[cr, cs]))
-
-                if value >= 1:
-                    cr_to_cs_matching[cr] = cs
-
-        cs_instance_count: ServiceInstanceCount = {}
-
-        for cs in self.base_data.cloud_services:
-            value = sum(
-                round(pulp.value(self.base_mip_data.var_cr_to_cs_matching[cr, cs]))
-                * self.base_data.cr_to_instance_demand[cr]
-                for cr in self.base_data.cloud_resources
-                if cs in self.base_data.cr_to_cs_list[cr]
+        instance_count: ServiceInstanceCount = dict()
+        group_to_deployed_count: dict[CloudResource, int] = dict()
+
+        # Determine the chosen assignments in a single pass over the variables
+        for (cr, cs), var in self.base_mip_data.var_cr_to_cs_matching.items():
+            if round(pulp.value(var)) >= 1:
+                cr_to_cs_matching[cr] = cs
+                instance_count[cs] = (
+                    instance_count.get(cs, 0) + self.base_data.cr_to_instance_demand[cr]
+                )
+
+        # Deploy the CRs of each group in order, according to the number of CRs per CS
+        for (first_cr, cs), var in self.base_mip_data.var_cr_group_to_cs_count.items():
+            count = round(pulp.value(var))
+            group = self.base_mip_data.cr_groups[first_cr]
+            deployed = group_to_deployed_count.get(first_cr, 0)
+
+            for cr in group[deployed : deployed + count]:
+                cr_to_cs_matching[cr] = cs
+                instance_count[cs] = (
+                    instance_count.get(cs, 0) + self.base_data.cr_to_instance_demand[cr]
+                )
+
+            group_to_deployed_count[first_cr] = deployed + count
+
+        # The fixed CRs don't have a variable
+        for cr, cs in self.base_mip_data.cr_to_fixed_cs.items():
+            cr_to_cs_matching[cr] = cs
+            instance_count[cs] = (
+                instance_count.get(cs, 0) + self.base_data.cr_to_instance_demand[cr]
             )
 
-            if value >= 1:
-                cs_instance_count[cs] = value
+        cs_instance_count: ServiceInstanceCount = {
+            cs: count for cs, count in instance_count.items() if count >= 1
+        }
 
         return BaseSolution(
             cr_to_cs_matching=cr_to_cs_matching,
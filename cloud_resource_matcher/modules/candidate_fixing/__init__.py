@@ -0,0 +1,20 @@
+"""The candidate fixing module.
+
+This module checks the applicable CSs of the CRs after the other modules have restricted them.
+CRs without any applicable CS are reported right away instead of by the solver
+and CRs with a single applicable CS are deployed there without a MIP variable.
+
+It must be added after all modules that restrict the applicable CSs,
+e.g. the performance and network modules.
+"""
+from optiframe import OptimizationModule
+
+from cloud_resource_matcher.modules.base import NoCandidatesError
+
+from .pre_processing import PreProcessingCandidateFixingTask
+
+# `NoCandidatesError` is defined in the base module, because every module may raise it.
+# It is still exported here for compatibility.
+candidate_fixing_module = OptimizationModule(pre_processing=PreProcessingCandidateFixingTask)
+
+__all__ = ["NoCandidatesError", "candidate_fixing_module"]
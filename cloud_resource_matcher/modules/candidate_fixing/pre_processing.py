@@ -0,0 +1,33 @@
+"""Implementation of the pre-processing step for the candidate fixing module."""
+from optiframe import PreProcessingTask
+
+from cloud_resource_matcher.modules.base import CompactBaseData, NoCandidatesError
+
+
+class PreProcessingCandidateFixingTask(PreProcessingTask[CompactBaseData]):
+    """A task to check and fix the applicable CSs once all modules have restricted them."""
+
+    compact_base_data: CompactBaseData
+
+    def __init__(self, compact_base_data: CompactBaseData):
+        self.compact_base_data = compact_base_data
+
+    def pre_process(self) -> CompactBaseData:
+        """Detect CRs without applicable CSs and fix CRs with a single applicable CS.
+
+        The fixed CRs don't get a matching variable, their costs are added to the objective
+        as a constant and the instances they use reduce the limits of the service limits module.
+
+        :raises NoCandidatesError: If any CR doesn't have an applicable CS.
+        """
+        compact = self.compact_base_data
+        counts = compact.remaining_candidate_counts()
+        empty_crs = [compact.cloud_resources[i] for i in (counts == 0).nonzero()[0].tolist()]
+
+        if len(empty_crs) > 0:
+            raise NoCandidatesError(
+                {cr: compact.cr_to_emptied_by.get(cr, "the base data") for cr in empty_crs}
+            )
+
+        compact.fixed_crs = counts == 1
+        return compact
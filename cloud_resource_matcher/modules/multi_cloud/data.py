@@ -1,5 +1,6 @@
 """The data for the multi cloud module."""
 from dataclasses import dataclass
+from functools import cached_property
 
 from cloud_resource_matcher.modules.base.data import CloudService, Cost
 
@@ -16,6 +17,9 @@ class MultiCloudData:
     and the services they offer.
     It can be enforced that a minimum or maximum number of CSPs must be used.
     Additionally, migration costs can be specified.
+
+    The reverse index from CSs to CSPs is computed once on first access.
+    The map from CSPs to CSs must not be modified afterwards.
     """
 
     # The identifiers of available cloud service providers.
@@ -35,3 +39,18 @@ class MultiCloudData:
     # This can be used to model migration or training costs.
     # Must be specified for every CSP.
     csp_to_cost: dict[CloudServiceProvider, Cost]
+
+    @cached_property
+    def cs_to_csp_list(self) -> dict[CloudService, list[CloudServiceProvider]]:
+        """A map from cloud services to the cloud service providers they belong to.
+
+        This is the reverse of `csp_to_cs_list`.
+        CSs that don't belong to any CSP are not included.
+        """
+        cs_to_csp_list: dict[CloudService, list[CloudServiceProvider]] = dict()
+
+        for csp, services in self.csp_to_cs_list.items():
+            for cs in services:
+                cs_to_csp_list.setdefault(cs, []).append(csp)
+
+        return cs_to_csp_list
@@ -1,10 +1,12 @@
 """Implementation of the build MIP step for the multi cloud module."""
 from dataclasses import dataclass
+from typing import Union
 
 from optiframe import MipConstructionTask
 from pulp import LpBinary, LpProblem, LpVariable, lpSum
 
 from cloud_resource_matcher.modules.base import BaseData, BaseMipData
+from cloud_resource_matcher.modules.base.data import CloudService
 
 from .data import CloudServiceProvider, MultiCloudData
 
@@ -51,13 +53,30 @@ class MipConstructionMultiCloudTask(MipConstructionTask[MultiCloudMipData]):
             for csp in self.multi_cloud_data.cloud_service_providers
         }
 
+        # The number of fixed CRs deployed to each CS
+        fixed_cs_count: dict[CloudService, int] = dict()
+
+        for cs in self.base_mip_data.cr_to_fixed_cs.values():
+            fixed_cs_count[cs] = fixed_cs_count.get(cs, 0) + 1
+
+        # The number of aggregated CRs deployed to each CS
+        cs_to_group_counts: dict[CloudService, list[LpVariable]] = dict()
+
+        for (_, cs), var in self.base_mip_data.var_cr_group_to_cs_count.items():
+            cs_to_group_counts.setdefault(cs, []).append(var)
+
         # Calculate csp_used values
         for csp in self.multi_cloud_data.cloud_service_providers:
-            used_service_count = lpSum(
-                self.base_mip_data.var_cr_to_cs_matching[cr, cs]
-                for cr in self.base_data.cloud_resources
-                for cs in self.base_data.cr_to_cs_list[cr]
-                if cs in self.multi_cloud_data.csp_to_cs_list[csp]
+            cs_list = self.multi_cloud_data.csp_to_cs_list[csp]
+            # The CR-CS pairs that would use the CSP
+            used_service_count = (
+                lpSum(
+                    self.base_mip_data.var_cr_to_cs_matching[cr, cs]
+                    for cs in cs_list
+                    for cr in self.base_mip_data.cs_to_cr_list[cs]
+                )
+                + lpSum(var for cs in cs_list for var in cs_to_group_counts.get(cs, []))
+                + sum(fixed_cs_count.get(cs, 0) for cs in cs_list)
             )
 
             self.problem += (
@@ -65,13 +84,36 @@ class MipConstructionMultiCloudTask(MipConstructionTask[MultiCloudMipData]):
                 f"csp_used_enforce_0({csp})",
             )
 
-            for cr in self.base_data.cloud_resources:
-                for cs in self.base_data.cr_to_cs_list[cr]:
-                    if cs in self.multi_cloud_data.csp_to_cs_list[csp]:
-                        self.problem += (
-                            var_csp_used[csp] >= self.base_mip_data.var_cr_to_cs_matching[cr, cs],
-                            f"csp_used_enforce_1({csp},{cr},{cs})",
-                        )
+        # If a CR is deployed to any CS of the CSP, the CSP is used.
+        # Each CR is deployed to exactly one CS, so one constraint per CR and CSP is enough
+        # and its LP relaxation is at least as tight as one constraint per CS.
+        # For a group of equivalent CRs, the number of its CRs deployed to the CSP is bounded
+        # by the size of the group instead.
+        cs_to_csp_list = self.multi_cloud_data.cs_to_csp_list
+        cr_groups = self.base_mip_data.cr_groups
+        other_grouped_crs = {cr for group in cr_groups.values() for cr in group[1:]}
+
+        for cr, cs_list in self.base_data.cr_to_cs_list.items():
+            if cr in other_grouped_crs:
+                continue
+
+            group = cr_groups.get(cr)
+            cr_count = 1 if group is None else len(group)
+            csp_to_matchings: dict[CloudServiceProvider, list[Union[LpVariable, int]]] = dict()
+
+            for cs in cs_list:
+                for csp in cs_to_csp_list.get(cs, []):
+                    csp_to_matchings.setdefault(csp, []).append(
+                        self.base_mip_data.cr_to_cs_matching(cr, cs)
+                        if group is None
+                        else self.base_mip_data.var_cr_group_to_cs_count[cr, cs]
+                    )
+
+            for csp, matchings in csp_to_matchings.items():
+                self.problem += (
+                    var_csp_used[csp] * cr_count >= lpSum(matchings),
+                    f"csp_used_enforce_1({csp},{cr})",
+                )
 
         # Enforce minimum and maximum number of used CSPs
         self.problem.addConstraint(
@@ -2,6 +2,7 @@
 from optiframe import ValidationTask
 
 from cloud_resource_matcher.modules.base import BaseData
+from cloud_resource_matcher.validation import raise_violations
 
 from .data import MultiCloudData
 
@@ -19,43 +20,44 @@ class ValidationMultiCloudTask(ValidationTask):
     def validate(self) -> None:
         """Validate the data for consistency.
 
-        :raises AssertionError: When the data is not valid.
+        All violations are collected before raising the error.
+
+        :raises ValidationError: When the data is not valid.
         """
+        cs_set = self.base_data.cs_set
+        csp_set = set(self.multi_cloud_data.cloud_service_providers)
+        violations: list[str] = []
+
         # Validate csp_to_cs_list
         for csp in self.multi_cloud_data.cloud_service_providers:
-            assert (
-                csp in self.multi_cloud_data.csp_to_cs_list.keys()
-            ), f"CSP {csp} is missing in cloud_service_provider_services"
+            if csp not in self.multi_cloud_data.csp_to_cs_list:
+                violations.append(f"CSP {csp} is missing in cloud_service_provider_services")
 
         for csp, services in self.multi_cloud_data.csp_to_cs_list.items():
-            assert (
-                csp in self.multi_cloud_data.cloud_service_providers
-            ), f"{csp} in cloud_service_provider_services is not a valid CSP"
+            if csp not in csp_set:
+                violations.append(f"{csp} in cloud_service_provider_services is not a valid CSP")
 
             for cs in services:
-                assert (
-                    cs in self.base_data.cloud_services
-                ), f"{cs} in cloud_service_provider_services is not a valid service"
+                if cs not in cs_set:
+                    violations.append(
+                        f"{cs} in cloud_service_provider_services is not a valid service"
+                    )
 
         for cs in self.base_data.cloud_services:
-            matched_to_csp = False
-
-            for services in self.multi_cloud_data.csp_to_cs_list.values():
-                if cs in services:
-                    matched_to_csp = True
-                    break
-
-            assert matched_to_csp is True
+            if cs not in self.multi_cloud_data.cs_to_csp_list:
+                violations.append(f"CS {cs} does not belong to any CSP")
 
         # Validate min/max counts
-        assert self.multi_cloud_data.min_csp_count >= 0, "min_csp_count is negative"
-        assert self.multi_cloud_data.max_csp_count >= 0, "max_csp_count is negative"
-        assert self.multi_cloud_data.min_csp_count <= self.multi_cloud_data.max_csp_count, (
-            "min_csp_count must be smaller or equal" "than max_csp_count"
-        )
+        if self.multi_cloud_data.min_csp_count < 0:
+            violations.append("min_csp_count is negative")
+        if self.multi_cloud_data.max_csp_count < 0:
+            violations.append("max_csp_count is negative")
+        if self.multi_cloud_data.min_csp_count > self.multi_cloud_data.max_csp_count:
+            violations.append("min_csp_count must be smaller or equal than max_csp_count")
 
         # Validate costs
         for csp in self.multi_cloud_data.cloud_service_providers:
-            assert (
-                csp in self.multi_cloud_data.csp_to_cost
-            ), f"CSP {csp} does not have a cost defined"
+            if csp not in self.multi_cloud_data.csp_to_cost:
+                violations.append(f"CSP {csp} does not have a cost defined")
+
+        raise_violations(violations)
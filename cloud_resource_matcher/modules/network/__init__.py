@@ -5,7 +5,15 @@ enforce maximum latency requirements and specify network usage costs.
 """
 from optiframe import OptimizationModule
 
-from .data import NetworkData
+from .data import (
+    CoordinateLatencyMatrix,
+    DenseLocationMatrix,
+    LocationMatrix,
+    NetworkData,
+    NetworkFormulation,
+    SparseLocationMatrix,
+    SymmetricLocationMatrix,
+)
 from .mip_construction import MipConstructionNetworkTask, NetworkMipData
 from .pre_processing import PreProcessingNetworkTask
 from .validation import ValidateNetworkTask
@@ -16,4 +24,14 @@ network_module = OptimizationModule(
     mip_construction=MipConstructionNetworkTask,
 )
 
-__all__ = ["NetworkData", "NetworkMipData", "network_module"]
+__all__ = [
+    "CoordinateLatencyMatrix",
+    "DenseLocationMatrix",
+    "LocationMatrix",
+    "NetworkData",
+    "NetworkFormulation",
+    "NetworkMipData",
+    "SparseLocationMatrix",
+    "SymmetricLocationMatrix",
+    "network_module",
+]
@@ -0,0 +1,72 @@
+"""The costs of the network module for each candidate."""
+import numpy as np
+import numpy.typing as npt
+
+from cloud_resource_matcher.modules.base import CompactBaseData
+from cloud_resource_matcher.modules.base.data import CloudResource
+
+from .data import Location, NetworkData, location_matrix
+
+
+def is_idle_connection(network_data: NetworkData, cr1: CloudResource, cr2: CloudResource) -> bool:
+    """Check if a CR -> CR connection has neither traffic nor a maximum latency.
+
+    Such connections don't add costs or constraints and are left out of the model.
+    """
+    return (
+        network_data.cr_and_cr_to_traffic[cr1, cr2] == 0
+        and (cr1, cr2) not in network_data.cr_and_cr_to_max_latency
+    )
+
+
+def cs_locations(
+    compact_base_data: CompactBaseData, network_data: NetworkData
+) -> tuple[list[Location], npt.NDArray[np.int64]]:
+    """Index the distinct locations of the cloud services.
+
+    The location matrices only need to be evaluated for these locations.
+
+    :return: The sorted locations of the CSs and the index of the location of every CS.
+    """
+    cs_to_loc = [network_data.cs_to_loc[cs] for cs in compact_base_data.cloud_services]
+    locations = sorted(set(cs_to_loc))
+    loc_index = {loc: i for i, loc in enumerate(locations)}
+    indices = np.fromiter(
+        (loc_index[loc] for loc in cs_to_loc), dtype=np.int64, count=len(cs_to_loc)
+    )
+
+    return locations, indices
+
+
+def network_candidate_costs(
+    compact_base_data: CompactBaseData, network_data: NetworkData
+) -> npt.NDArray[np.float64]:
+    """Calculate the cost of the CR -> location traffic for every candidate.
+
+    This is the traffic cost from the location of the CS to the target locations,
+    multiplied with the instance demand of the CR.
+    The cost of CR -> CR traffic depends on two candidates and is not included.
+    Connections without traffic are skipped.
+    """
+    compact = compact_base_data
+    offsets = compact.cr_to_cs_offsets
+    costs = np.zeros(compact.candidate_count, dtype=np.float64)
+
+    # Only the costs from the CS locations to the target locations are needed
+    sources, cs_to_source = cs_locations(compact, network_data)
+    cr_and_loc_to_traffic = {
+        connection: traffic
+        for connection, traffic in network_data.cr_and_loc_to_traffic.items()
+        if traffic != 0
+    }
+    targets = sorted({loc for _, loc in cr_and_loc_to_traffic.keys()})
+    target_index = {loc: i for i, loc in enumerate(targets)}
+    loc_cost = location_matrix(network_data.loc_and_loc_to_cost).submatrix(sources, targets)
+    candidate_sources = cs_to_source[compact.cr_to_cs_indices]
+
+    for (cr, loc), traffic in cr_and_loc_to_traffic.items():
+        i = compact.cr_index[cr]
+        start, end = offsets[i], offsets[i + 1]
+        costs[start:end] += traffic * loc_cost[candidate_sources[start:end], target_index[loc]]
+
+    return costs * compact.cr_to_instance_demand[compact.candidate_crs()]
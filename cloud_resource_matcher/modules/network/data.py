@@ -1,5 +1,13 @@
 """The data for the network module."""
-from dataclasses import dataclass
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import cached_property
+from typing import Any, Callable, Mapping, Optional, Union
+
+import numpy as np
+import numpy.typing as npt
 
 from cloud_resource_matcher.modules.base.data import CloudResource, CloudService, Cost
 
@@ -7,6 +15,395 @@ Location = str
 Latency = int
 NetworkTraffic = int
 
+# The mean radius of the earth in kilometers
+EARTH_RADIUS_KM = 6371.0
+
+
+class NetworkFormulation(Enum):
+    """The formulation used to model the deployments of CR -> CR connections."""
+
+    # One variable for each pair of applicable CSs of the two CRs.
+    # The model size grows quadratically with the number of candidates per CR.
+    CS_PAIRS = 0
+
+    # One variable for each pair of locations of the applicable CSs of the two CRs.
+    # The model size grows quadratically with the number of locations instead.
+    # Latency and costs only depend on the locations, so the optimal cost is the same.
+    LOCATION_PAIRS = 1
+
+
+class LocationMatrix(ABC):
+    """A value for every loc -> loc connection, e.g. the latency or the cost.
+
+    The backends store the values in different ways, so that large numbers of locations
+    don't have to be given as a dictionary with an entry for every pair of locations.
+    """
+
+    @abstractmethod
+    def get(self, loc1: Location, loc2: Location) -> float:
+        """Get the value of the loc1 -> loc2 connection.
+
+        :raises KeyError: If the matrix doesn't define a value for the connection.
+        """
+
+    @abstractmethod
+    def validate(self, locations: set[Location], name: str, non_negative: bool) -> list[str]:
+        """Check that the matrix defines a value for every pair of the given locations.
+
+        :param locations: The valid locations.
+        :param name: The name of the attribute, used in the violations.
+        :param non_negative: Whether the values must not be negative.
+        :return: The violations.
+        """
+
+    def __getitem__(self, key: tuple[Location, Location]) -> float:
+        """Get the value of the loc1 -> loc2 connection, see `get`."""
+        return self.get(*key)
+
+    def submatrix(
+        self, sources: list[Location], targets: list[Location]
+    ) -> npt.NDArray[np.float64]:
+        """Get the values of the connections between the given locations.
+
+        Only the requested values are materialized.
+
+        :return: A matrix with a row for every source and a column for every target.
+        """
+        values = np.empty((len(sources), len(targets)), dtype=np.float64)
+
+        for i, loc1 in enumerate(sources):
+            for j, loc2 in enumerate(targets):
+                values[i, j] = self.get(loc1, loc2)
+
+        return values
+
+
+def _validate_matrix_locations(
+    matrix_locations: list[Location], locations: set[Location], name: str
+) -> list[str]:
+    """Check that the locations of a dense matrix are exactly the valid locations."""
+    violations = [
+        f"{loc} in {name} is not a valid location"
+        for loc in matrix_locations
+        if loc not in locations
+    ]
+
+    if len(set(matrix_locations)) < len(matrix_locations):
+        violations.append(f"The locations of {name} are not unique")
+
+    violations.extend(
+        f"No value in {name} for location {loc}"
+        for loc in sorted(locations.difference(matrix_locations))
+    )
+
+    return violations
+
+
+@dataclass
+class DenseLocationMatrix(LocationMatrix):
+    """A location matrix stored as a NumPy array."""
+
+    # The locations, in the order of the rows and columns of the values
+    locations: list[Location]
+
+    # The values, values[i, j] belongs to the locations[i] -> locations[j] connection
+    values: npt.NDArray[np.number[Any]]
+
+    @cached_property
+    def loc_index(self) -> dict[Location, int]:
+        """The index of every location in the rows and columns."""
+        return {loc: i for i, loc in enumerate(self.locations)}
+
+    def get(self, loc1: Location, loc2: Location) -> float:
+        """Get the value of the loc1 -> loc2 connection."""
+        return float(self.values[self.loc_index[loc1], self.loc_index[loc2]])
+
+    def validate(self, locations: set[Location], name: str, non_negative: bool) -> list[str]:
+        """Check that the matrix contains exactly the given locations."""
+        violations = _validate_matrix_locations(self.locations, locations, name)
+
+        if self.values.shape != (len(self.locations), len(self.locations)):
+            violations.append(f"The values of {name} don't match the number of locations")
+        elif non_negative and (self.values < 0).any():
+            violations.append(f"The values of {name} must not be negative")
+
+        return violations
+
+    def submatrix(
+        self, sources: list[Location], targets: list[Location]
+    ) -> npt.NDArray[np.float64]:
+        """Get the values of the connections between the given locations."""
+        rows = np.array([self.loc_index[loc] for loc in sources], dtype=np.int64)
+        columns = np.array([self.loc_index[loc] for loc in targets], dtype=np.int64)
+        values: npt.NDArray[np.float64] = self.values[np.ix_(rows, columns)].astype(np.float64)
+        return values
+
+
+@dataclass
+class SymmetricLocationMatrix(LocationMatrix):
+    """A location matrix where both directions of a connection have the same value.
+
+    Only the upper triangle of the matrix, including the diagonal, is stored.
+    """
+
+    # The locations, in the order of the rows and columns of the matrix
+    locations: list[Location]
+
+    # The upper triangle of the matrix, row by row.
+    # Contains n * (n + 1) / 2 values for n locations.
+    values: npt.NDArray[np.number[Any]]
+
+    @classmethod
+    def from_dense(
+        cls, locations: list[Location], values: npt.NDArray[np.number[Any]]
+    ) -> "SymmetricLocationMatrix":
+        """Create the matrix from the upper triangle of a square matrix."""
+        rows, columns = np.triu_indices(len(locations))
+        return cls(locations, values[rows, columns])
+
+    @cached_property
+    def loc_index(self) -> dict[Location, int]:
+        """The index of every location in the rows and columns."""
+        return {loc: i for i, loc in enumerate(self.locations)}
+
+    def _positions(
+        self, rows: npt.NDArray[np.int64], columns: npt.NDArray[np.int64]
+    ) -> npt.NDArray[np.int64]:
+        """Get the positions of the matrix entries in the stored values."""
+        low = np.minimum(rows, columns)
+        high = np.maximum(rows, columns)
+        n = len(self.locations)
+        positions: npt.NDArray[np.int64] = low * n - low * (low - 1) // 2 + (high - low)
+        return positions
+
+    def get(self, loc1: Location, loc2: Location) -> float:
+        """Get the value of the loc1 -> loc2 connection."""
+        low, high = sorted((self.loc_index[loc1], self.loc_index[loc2]))
+        n = len(self.locations)
+        return float(self.values[low * n - low * (low - 1) // 2 + (high - low)])
+
+    def validate(self, locations: set[Location], name: str, non_negative: bool) -> list[str]:
+        """Check that the matrix contains exactly the given locations."""
+        violations = _validate_matrix_locations(self.locations, locations, name)
+        n = len(self.locations)
+
+        if self.values.shape != (n * (n + 1) // 2,):
+            violations.append(f"The values of {name} don't match the number of locations")
+        elif non_negative and (self.values < 0).any():
+            violations.append(f"The values of {name} must not be negative")
+
+        return violations
+
+    def submatrix(
+        self, sources: list[Location], targets: list[Location]
+    ) -> npt.NDArray[np.float64]:
+        """Get the values of the connections between the given locations."""
+        rows = np.array([self.loc_index[loc] for loc in sources], dtype=np.int64)
+        columns = np.array([self.loc_index[loc] for loc in targets], dtype=np.int64)
+        positions = self._positions(rows[:, np.newaxis], columns[np.newaxis, :])
+        return self.values[positions].astype(np.float64)
+
+
+@dataclass
+class SparseLocationMatrix(LocationMatrix):
+    """A location matrix that only stores some connections explicitly.
+
+    The other connections use the fallback function or the default value.
+    Without both, every connection must be given explicitly, like in a dictionary.
+    A matrix with a fallback function can't be fingerprinted by the caches.
+    """
+
+    # The explicitly given values of the connections
+    entries: Mapping[tuple[Location, Location], float]
+
+    # The value of the connections that are not given explicitly
+    default: Optional[float] = None
+
+    # Computes the value of the connections that are not given explicitly.
+    # Takes precedence over the default value.
+    fallback: Optional[Callable[[Location, Location], float]] = None
+
+    # Whether a missing loc1 -> loc2 connection uses the value of loc2 -> loc1, if given
+    symmetric: bool = False
+
+    def get(self, loc1: Location, loc2: Location) -> float:
+        """Get the value of the loc1 -> loc2 connection."""
+        value = self.entries.get((loc1, loc2))
+
+        if value is None and self.symmetric:
+            value = self.entries.get((loc2, loc1))
+
+        if value is not None:
+            return value
+
+        if self.fallback is not None:
+            return self.fallback(loc1, loc2)
+
+        if self.default is not None:
+            return self.default
+
+        raise KeyError((loc1, loc2))
+
+    def validate(self, locations: set[Location], name: str, non_negative: bool) -> list[str]:
+        """Check the explicit entries and, without fallback, that none are missing."""
+        violations: list[str] = []
+
+        for (loc1, loc2), value in self.entries.items():
+            if loc1 not in locations:
+                violations.append(f"{loc1} in {name} is not a valid location")
+            if loc2 not in locations:
+                violations.append(f"{loc2} in {name} is not a valid location")
+            if non_negative and value < 0:
+                violations.append(f"The values of {name} must not be negative")
+
+        if non_negative and self.default is not None and self.default < 0:
+            violations.append(f"The default value of {name} must not be negative")
+
+        if self.fallback is None and self.default is None:
+            for loc1 in locations:
+                for loc2 in locations:
+                    try:
+                        self.get(loc1, loc2)
+                    except KeyError:
+                        violations.append(f"No value in {name} for ({loc1}, {loc2})")
+
+        return violations
+
+
+@dataclass
+class CoordinateLatencyMatrix(LocationMatrix):
+    """Latencies computed from the coordinates of the locations.
+
+    The latency of a connection is the great-circle distance between the locations
+    multiplied with the latency per kilometer, plus the offsets of both locations.
+    Only the coordinates are stored, the latencies are computed on demand.
+    Single lookups are memoized in a bounded cache.
+    """
+
+    # The latitude and longitude of every location in degrees
+    loc_to_coordinates: dict[Location, tuple[float, float]]
+
+    # The latency per kilometer of great-circle distance
+    latency_per_km: float
+
+    # An additional latency for every connection from or to the location,
+    # e.g. for the network of the provider. Locations without offset don't have one.
+    loc_to_offset: dict[Location, float] = field(default_factory=dict)
+
+    # The maximum number of latencies kept in the cache of single lookups
+    max_cached_latencies: int = 100_000
+
+    @cached_property
+    def _cache(self) -> OrderedDict[tuple[Location, Location], float]:
+        return OrderedDict()
+
+    @cached_property
+    def loc_index(self) -> dict[Location, int]:
+        """The index of every location in the coordinate arrays."""
+        return {loc: i for i, loc in enumerate(self.loc_to_coordinates.keys())}
+
+    @cached_property
+    def _radians(self) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """The latitudes and longitudes of the locations in radians."""
+        coordinates = np.array(list(self.loc_to_coordinates.values()), dtype=np.float64)
+        radians = np.radians(coordinates.reshape(-1, 2))
+        return radians[:, 0], radians[:, 1]
+
+    @cached_property
+    def _offsets(self) -> npt.NDArray[np.float64]:
+        """The offset of every location, in the order of the coordinate arrays."""
+        return np.array(
+            [self.loc_to_offset.get(loc, 0) for loc in self.loc_to_coordinates.keys()],
+            dtype=np.float64,
+        )
+
+    def get(self, loc1: Location, loc2: Location) -> float:
+        """Get the latency of the loc1 -> loc2 connection."""
+        key = (loc1, loc2)
+        latency = self._cache.get(key)
+
+        if latency is not None:
+            self._cache.move_to_end(key)
+            return latency
+
+        latency = float(self.submatrix([loc1], [loc2])[0, 0])
+        self._cache[key] = latency
+
+        while len(self._cache) > self.max_cached_latencies:
+            self._cache.popitem(last=False)
+
+        return latency
+
+    def validate(self, locations: set[Location], name: str, non_negative: bool) -> list[str]:
+        """Check that every location has valid coordinates."""
+        violations: list[str] = []
+
+        for loc, (latitude, longitude) in self.loc_to_coordinates.items():
+            if loc not in locations:
+                violations.append(f"{loc} in {name} is not a valid location")
+            if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+                violations.append(f"The coordinates of {loc} in {name} are not valid")
+
+        violations.extend(
+            f"No coordinates in {name} for location {loc}"
+            for loc in sorted(locations.difference(self.loc_to_coordinates.keys()))
+        )
+
+        for loc, offset in self.loc_to_offset.items():
+            if loc not in self.loc_to_coordinates:
+                violations.append(f"{loc} has an offset in {name}, but no coordinates")
+            if non_negative and offset < 0:
+                violations.append(f"The offset of {loc} in {name} must not be negative")
+
+        if non_negative and self.latency_per_km < 0:
+            violations.append(f"The latency per kilometer of {name} must not be negative")
+
+        return violations
+
+    def submatrix(
+        self, sources: list[Location], targets: list[Location]
+    ) -> npt.NDArray[np.float64]:
+        """Compute the latencies between the given locations at once."""
+        rows = np.array([self.loc_index[loc] for loc in sources], dtype=np.int64)
+        columns = np.array([self.loc_index[loc] for loc in targets], dtype=np.int64)
+        latitudes, longitudes = self._radians
+        lat1, lat2 = latitudes[rows, np.newaxis], latitudes[np.newaxis, columns]
+        lon1, lon2 = longitudes[rows, np.newaxis], longitudes[np.newaxis, columns]
+
+        # The haversine formula, which is numerically stable for small distances
+        haversine = (
+            np.sin((lat2 - lat1) / 2) ** 2
+            + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        )
+        distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(haversine, 0, 1)))
+        offsets = self._offsets
+        latencies: npt.NDArray[np.float64] = (
+            distance * self.latency_per_km
+            + offsets[rows, np.newaxis]
+            + offsets[np.newaxis, columns]
+        )
+
+        return latencies
+
+
+# The latency or cost of the loc -> loc connections,
+# either as dictionary with an entry for every pair of locations or as location matrix
+LocationLatencies = Union[dict[tuple[Location, Location], Latency], LocationMatrix]
+LocationCosts = Union[dict[tuple[Location, Location], Cost], LocationMatrix]
+
+
+def location_matrix(
+    values: Union[Mapping[tuple[Location, Location], float], LocationMatrix]
+) -> LocationMatrix:
+    """Access the values of the loc -> loc connections as location matrix.
+
+    Dictionaries are wrapped without copying them.
+    """
+    if isinstance(values, LocationMatrix):
+        return values
+
+    return SparseLocationMatrix(values)
+
 
 @dataclass
 class NetworkData:
@@ -24,7 +421,8 @@ class NetworkData:
 
     # A map from a loc -> loc connection to the latency that is expected for that connection.
     # This must be defined for every pair of locations.
-    loc_and_loc_to_latency: dict[tuple[Location, Location], Latency]
+    # For many locations, a `LocationMatrix` avoids storing an entry for every pair.
+    loc_and_loc_to_latency: LocationLatencies
 
     # A map from a cloud service to the location it is placed in.
     cs_to_loc: dict[CloudService, Location]
@@ -46,4 +444,8 @@ class NetworkData:
 
     # A map from a loc -> loc connection to the cost of that connection.
     # The cost is given per connection, per unit of network traffic, per unit of time.
-    loc_and_loc_to_cost: dict[tuple[Location, Location], Cost]
+    # Like the latency, this can also be given as `LocationMatrix`.
+    loc_and_loc_to_cost: LocationCosts
+
+    # The formulation used to model the deployments of CR -> CR connections.
+    formulation: NetworkFormulation = NetworkFormulation.CS_PAIRS
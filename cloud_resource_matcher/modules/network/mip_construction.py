@@ -2,12 +2,13 @@
 from dataclasses import dataclass
 
 from optiframe import MipConstructionTask
-from pulp import LpBinary, LpProblem, LpVariable, lpSum
+from pulp import LpAffineExpression, LpBinary, LpProblem, LpVariable, lpSum
 
 from cloud_resource_matcher.modules.base import BaseData, BaseMipData
 from cloud_resource_matcher.modules.base.data import CloudResource, CloudService
 
-from .data import NetworkData
+from .costs import is_idle_connection
+from .data import Location, NetworkData, NetworkFormulation, NetworkTraffic, location_matrix
 
 
 @dataclass
@@ -18,10 +19,24 @@ class NetworkMipData:
     """
 
     # Is cr1 deployed to cs1 and cr2 deployed to cs2?
+    # Only defined for the CS pairs formulation.
     var_cr_pair_cs_deployment: dict[
         tuple[CloudResource, CloudService, CloudResource, CloudService], LpVariable
     ]
 
+    # Is cr1 deployed to loc1 and cr2 deployed to loc2?
+    # Only defined for the location pairs formulation.
+    var_cr_pair_loc_deployment: dict[
+        tuple[CloudResource, Location, CloudResource, Location], LpVariable
+    ]
+
+    # The CR -> CR connections that have been left out of the MIP,
+    # because they have no maximum latency and no traffic or only free location pairs
+    skipped_cr_connections: list[tuple[CloudResource, CloudResource]]
+
+    # The number of CR -> location connections without traffic, which don't add any costs
+    skipped_loc_connection_count: int
+
 
 class MipConstructionNetworkTask(MipConstructionTask[NetworkMipData]):
     """A task to modify the MIP to implement the network module."""
@@ -44,14 +59,114 @@ class MipConstructionNetworkTask(MipConstructionTask[NetworkMipData]):
         self.problem = problem
 
     def construct_mip(self) -> NetworkMipData:
-        """Modify the MIP to implement the network module."""
+        """Modify the MIP to implement the network module.
+
+        The costs for CR -> location traffic have already been added to the candidates
+        during the pre-processing, only the CR -> CR connections are modeled here.
+        Connections that can't affect the result are left out.
+        """
+        connections, skipped_connections = self._relevant_connections()
+        skipped_loc_connection_count = sum(
+            traffic == 0 for traffic in self.network_data.cr_and_loc_to_traffic.values()
+        )
+
+        if self.network_data.formulation == NetworkFormulation.LOCATION_PAIRS:
+            return NetworkMipData(
+                var_cr_pair_cs_deployment=dict(),
+                var_cr_pair_loc_deployment=self._construct_location_pairs(connections),
+                skipped_cr_connections=skipped_connections,
+                skipped_loc_connection_count=skipped_loc_connection_count,
+            )
+
+        return NetworkMipData(
+            var_cr_pair_cs_deployment=self._construct_cs_pairs(connections),
+            var_cr_pair_loc_deployment=dict(),
+            skipped_cr_connections=skipped_connections,
+            skipped_loc_connection_count=skipped_loc_connection_count,
+        )
+
+    def add_connections(
+        self,
+        network_mip_data: NetworkMipData,
+        connections: list[tuple[CloudResource, CloudResource]],
+    ) -> None:
+        """Add CR -> CR connections that have been left out during the MIP construction.
+
+        This is needed if one of their location pairs gets a cost after the MIP has been
+        constructed. The variables and constraints are the same as in `construct_mip`.
+
+        :param network_mip_data: The data of the constructed MIP, which is updated in place.
+        :param connections: The skipped connections to add.
+        """
+        added = {
+            connection: self.network_data.cr_and_cr_to_traffic[connection]
+            for connection in connections
+        }
+
+        if self.network_data.formulation == NetworkFormulation.LOCATION_PAIRS:
+            network_mip_data.var_cr_pair_loc_deployment.update(
+                self._construct_location_pairs(added)
+            )
+        else:
+            network_mip_data.var_cr_pair_cs_deployment.update(self._construct_cs_pairs(added))
+
+        network_mip_data.skipped_cr_connections = [
+            connection
+            for connection in network_mip_data.skipped_cr_connections
+            if connection not in added
+        ]
+
+    def _relevant_connections(
+        self,
+    ) -> tuple[
+        dict[tuple[CloudResource, CloudResource], NetworkTraffic],
+        list[tuple[CloudResource, CloudResource]],
+    ]:
+        """Split the CR -> CR connections by whether they can affect the result.
+
+        A connection without maximum latency doesn't add any constraints.
+        Its costs are zero if it doesn't have traffic or if all pairs of locations
+        of the applicable CSs of both CRs are free.
+
+        :return: The connections to model with their traffic and the skipped connections.
+        """
+        loc_cost = location_matrix(self.network_data.loc_and_loc_to_cost)
+        cr_to_locs: dict[CloudResource, list[Location]] = dict()
+        connections: dict[tuple[CloudResource, CloudResource], NetworkTraffic] = dict()
+        skipped_connections: list[tuple[CloudResource, CloudResource]] = []
+
+        def locs(cr: CloudResource) -> list[Location]:
+            if cr not in cr_to_locs:
+                cr_to_locs[cr] = sorted(
+                    {self.network_data.cs_to_loc[cs] for cs in self.base_data.cr_to_cs_list[cr]}
+                )
+
+            return cr_to_locs[cr]
+
+        for (cr1, cr2), traffic in self.network_data.cr_and_cr_to_traffic.items():
+            if is_idle_connection(self.network_data, cr1, cr2) or (
+                (cr1, cr2) not in self.network_data.cr_and_cr_to_max_latency
+                and not loc_cost.submatrix(locs(cr1), locs(cr2)).any()
+            ):
+                skipped_connections.append((cr1, cr2))
+            else:
+                connections[cr1, cr2] = traffic
+
+        return connections, skipped_connections
+
+    def _construct_cs_pairs(
+        self, connections: dict[tuple[CloudResource, CloudResource], NetworkTraffic]
+    ) -> dict[tuple[CloudResource, CloudService, CloudResource, CloudService], LpVariable]:
+        """Model the CR -> CR connections with one variable per pair of CSs."""
         connection_deployments = dict()
+        latency = location_matrix(self.network_data.loc_and_loc_to_latency)
+        loc_cost = location_matrix(self.network_data.loc_and_loc_to_cost)
 
         # Pre-compute the possible deployments for CR pairs respecting the latency
         for (
             cr1,
             cr2,
-        ) in self.network_data.cr_and_cr_to_traffic.keys():
+        ) in connections.keys():
             max_latency = self.network_data.cr_and_cr_to_max_latency.get((cr1, cr2))
             deployment_list = []
 
@@ -61,10 +176,7 @@ class MipConstructionNetworkTask(MipConstructionTask[NetworkMipData]):
                 for cs2 in self.base_data.cr_to_cs_list[cr2]:
                     loc2 = self.network_data.cs_to_loc[cs2]
 
-                    if (
-                        max_latency is None
-                        or self.network_data.loc_and_loc_to_latency[(loc1, loc2)] <= max_latency
-                    ):
+                    if max_latency is None or latency[loc1, loc2] <= max_latency:
                         deployment_list.append((cs1, cs2))
 
             connection_deployments[(cr1, cr2)] = deployment_list
@@ -78,7 +190,7 @@ class MipConstructionNetworkTask(MipConstructionTask[NetworkMipData]):
                 f"cr_pair_cs_deployment({cr1},{cs1},{cr2},{cs2})",
                 cat=LpBinary,
             )
-            for (cr1, cr2) in self.network_data.cr_and_cr_to_traffic.keys()
+            for (cr1, cr2) in connections.keys()
             for (cs1, cs2) in connection_deployments[(cr1, cr2)]
         }
 
@@ -86,7 +198,7 @@ class MipConstructionNetworkTask(MipConstructionTask[NetworkMipData]):
         for (
             cr1,
             cr2,
-        ) in self.network_data.cr_and_cr_to_traffic.keys():
+        ) in connections.keys():
             # Every CR pair has one pair of cloud service connections
             self.problem += (
                 lpSum(
@@ -98,41 +210,112 @@ class MipConstructionNetworkTask(MipConstructionTask[NetworkMipData]):
 
             # If a CR has been deployed to a given CS, enforce this for the pair as well
             for (cs1, cs2) in connection_deployments[(cr1, cr2)]:
-                self.problem += (
-                    var_cr_pair_cs_deployment[cr1, cs1, cr2, cs2]
-                    <= self.base_mip_data.var_cr_to_cs_matching[cr1, cs1]
-                )
-                self.problem += (
-                    var_cr_pair_cs_deployment[cr1, cs1, cr2, cs2]
-                    <= self.base_mip_data.var_cr_to_cs_matching[cr2, cs2]
-                )
-
-        # Pay for CR -> loc traffic
-        self.problem.objective += lpSum(
-            self.base_mip_data.var_cr_to_cs_matching[cr, cs]
-            * self.base_data.cr_to_instance_demand[cr]
-            * traffic
-            * self.network_data.loc_and_loc_to_cost[self.network_data.cs_to_loc[cs], loc]
-            for (
-                cr,
-                loc,
-            ), traffic in self.network_data.cr_and_loc_to_traffic.items()
-            for cs in self.base_data.cr_to_cs_list[cr]
-        )
+                self.problem += var_cr_pair_cs_deployment[
+                    cr1, cs1, cr2, cs2
+                ] <= self.base_mip_data.cr_to_cs_matching(cr1, cs1)
+                self.problem += var_cr_pair_cs_deployment[
+                    cr1, cs1, cr2, cs2
+                ] <= self.base_mip_data.cr_to_cs_matching(cr2, cs2)
 
         # Pay for CR -> CR traffic
         self.problem.objective += lpSum(
             var_cr_pair_cs_deployment[cr1, cs1, cr2, cs2]
             * self.base_data.cr_to_instance_demand[cr1]
             * traffic
-            * self.network_data.loc_and_loc_to_cost[
-                self.network_data.cs_to_loc[cs1], self.network_data.cs_to_loc[cs2]
-            ]
+            * loc_cost[self.network_data.cs_to_loc[cs1], self.network_data.cs_to_loc[cs2]]
             for (
                 cr1,
                 cr2,
-            ), traffic in self.network_data.cr_and_cr_to_traffic.items()
+            ), traffic in connections.items()
             for (cs1, cs2) in connection_deployments[(cr1, cr2)]
         )
 
-        return NetworkMipData(var_cr_pair_cs_deployment)
+        return var_cr_pair_cs_deployment
+
+    def _construct_location_pairs(
+        self, connections: dict[tuple[CloudResource, CloudResource], NetworkTraffic]
+    ) -> dict[tuple[CloudResource, Location, CloudResource, Location], LpVariable]:
+        """Model the CR -> CR connections with one variable per pair of locations.
+
+        For every connected CR, the matching variables of the CSs in the same location
+        are aggregated to an expression that is 1 iff the CR is deployed to that location.
+        The location pair variables of a connection must sum up to these aggregates
+        for both CRs, so the variable of the chosen location pair is forced to 1.
+        Because of this, the location pair variables don't need to be binary.
+        """
+        latency = location_matrix(self.network_data.loc_and_loc_to_latency)
+        loc_cost = location_matrix(self.network_data.loc_and_loc_to_cost)
+
+        # Is the CR deployed to the given location?
+        cr_to_loc_deployment: dict[CloudResource, dict[Location, LpAffineExpression]] = dict()
+
+        for cr1, cr2 in connections.keys():
+            for cr in (cr1, cr2):
+                if cr in cr_to_loc_deployment:
+                    continue
+
+                loc_deployment: dict[Location, LpAffineExpression] = dict()
+
+                for cs in self.base_data.cr_to_cs_list[cr]:
+                    loc = self.network_data.cs_to_loc[cs]
+                    loc_deployment.setdefault(loc, LpAffineExpression())
+                    loc_deployment[loc] += self.base_mip_data.cr_to_cs_matching(cr, cs)
+
+                cr_to_loc_deployment[cr] = loc_deployment
+
+        var_cr_pair_loc_deployment: dict[
+            tuple[CloudResource, Location, CloudResource, Location], LpVariable
+        ] = dict()
+
+        for (cr1, cr2), traffic in connections.items():
+            max_latency = self.network_data.cr_and_cr_to_max_latency.get((cr1, cr2))
+            loc1_deployment = cr_to_loc_deployment[cr1]
+            loc2_deployment = cr_to_loc_deployment[cr2]
+
+            # The possible deployments for the CR pair respecting the latency
+            loc_pairs = [
+                (loc1, loc2)
+                for loc1 in loc1_deployment
+                for loc2 in loc2_deployment
+                if max_latency is None or latency[loc1, loc2] <= max_latency
+            ]
+
+            # Is there a cr1 -> cr2 connection where cr1 is deployed to loc1 and cr2 to loc2?
+            for loc1, loc2 in loc_pairs:
+                var_cr_pair_loc_deployment[cr1, loc1, cr2, loc2] = LpVariable(
+                    f"cr_pair_loc_deployment({cr1},{loc1},{cr2},{loc2})",
+                    lowBound=0,
+                    upBound=1,
+                )
+
+            # If a CR has been deployed to a given location, enforce this for the pair as well
+            for loc1, deployment in loc1_deployment.items():
+                self.problem += (
+                    lpSum(
+                        var_cr_pair_loc_deployment[cr1, loc1, cr2, loc2]
+                        for loc2 in loc2_deployment
+                        if (cr1, loc1, cr2, loc2) in var_cr_pair_loc_deployment
+                    )
+                    == deployment
+                )
+
+            for loc2, deployment in loc2_deployment.items():
+                self.problem += (
+                    lpSum(
+                        var_cr_pair_loc_deployment[cr1, loc1, cr2, loc2]
+                        for loc1 in loc1_deployment
+                        if (cr1, loc1, cr2, loc2) in var_cr_pair_loc_deployment
+                    )
+                    == deployment
+                )
+
+            # Pay for CR -> CR traffic
+            self.problem.objective += lpSum(
+                var_cr_pair_loc_deployment[cr1, loc1, cr2, loc2]
+                * self.base_data.cr_to_instance_demand[cr1]
+                * traffic
+                * loc_cost[loc1, loc2]
+                for loc1, loc2 in loc_pairs
+            )
+
+        return var_cr_pair_loc_deployment
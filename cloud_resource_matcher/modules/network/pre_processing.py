@@ -1,39 +1,253 @@
 """Implementation of the pre-processing step for the network module."""
+from collections import deque
+
+import numpy as np
+import numpy.typing as npt
 from optiframe import PreProcessingTask
 
-from cloud_resource_matcher.modules.base import BaseData
+from cloud_resource_matcher.modules.base import CompactBaseData, NoCandidatesError
 from cloud_resource_matcher.modules.network import NetworkData
 
+from .costs import cs_locations, is_idle_connection, network_candidate_costs
+from .data import Latency, Location, NetworkTraffic, location_matrix
+
 
-class PreProcessingNetworkTask(PreProcessingTask[BaseData]):
+class PreProcessingNetworkTask(PreProcessingTask[CompactBaseData]):
     """A task to apply pre-processing techniques to the network module."""
 
-    base_data: BaseData
+    compact_base_data: CompactBaseData
     network_data: NetworkData
 
-    def __init__(self, base_data: BaseData, network_data: NetworkData):
-        self.base_data = base_data
+    def __init__(self, compact_base_data: CompactBaseData, network_data: NetworkData):
+        self.compact_base_data = compact_base_data
         self.network_data = network_data
 
-    def pre_process(self) -> BaseData:
+    def pre_process(self) -> CompactBaseData:
         """Enforce the latency requirements for the network module.
 
-        Removes CSs from list of applicable CSs if the corresponding CR cannot support
+        Excludes CSs from the applicable CSs of a CR if the CR cannot support
         the latency of the CS to a given location.
-        This only implements the maximum latency requirements for CR -> location connections.
+        Afterwards, the CSs of connected CRs without any CS of the other CR within the maximum
+        CR -> CR latency are excluded as well, until all remaining CSs have such a partner.
+        Also adds the costs for the CR -> location traffic to the candidates
+        and prevents the aggregation of CRs with CR -> CR connections
+        or with different CR -> location traffic.
+        """
+        compact = self.compact_base_data
+        keep = np.ones(compact.candidate_count, dtype=np.bool_)
+
+        if len(self.network_data.cr_and_loc_to_max_latency) > 0:
+            keep &= self._enforce_location_latencies()
+
+        # The applicable CSs are only updated once all modules have restricted them
+        compact.restrict_candidates(keep, "the latency requirements")
+
+        if len(self.network_data.cr_and_cr_to_max_latency) > 0:
+            compact.restrict_candidates(
+                self._enforce_cr_pair_latencies(), "the CR -> CR latency requirements"
+            )
+
+        # CRs with CR -> CR connections are never equivalent to other CRs.
+        # Idle connections are left out of the model, so they don't prevent the aggregation.
+        connected_crs = np.full(len(compact.cloud_resources), -1, dtype=np.int64)
+
+        for connection in self.network_data.cr_and_cr_to_traffic.keys():
+            if is_idle_connection(self.network_data, *connection):
+                continue
+
+            for cr in connection:
+                connected_crs[compact.cr_index[cr]] = compact.cr_index[cr]
+
+        compact.distinguish_crs(connected_crs)
+
+        # CRs with different CR -> loc traffic have different costs once the prices change
+        if len(self.network_data.cr_and_loc_to_traffic) > 0:
+            compact.distinguish_crs(self._traffic_classes())
+
+        # Pay for CR -> loc traffic
+        if len(self.network_data.cr_and_loc_to_traffic) > 0:
+            compact.add_candidate_costs(network_candidate_costs(compact, self.network_data))
+
+        return compact
+
+    def _traffic_classes(self) -> npt.NDArray[np.int64]:
+        """Assign the same value to the CRs with the same CR -> loc traffic."""
+        compact = self.compact_base_data
+        cr_to_traffic: dict[int, list[tuple[Location, NetworkTraffic]]] = dict()
+
+        for (cr, loc), traffic in self.network_data.cr_and_loc_to_traffic.items():
+            if traffic != 0:
+                cr_to_traffic.setdefault(compact.cr_index[cr], []).append((loc, traffic))
+
+        traffic_to_class: dict[tuple[tuple[Location, NetworkTraffic], ...], int] = {(): 0}
+        classes = np.zeros(len(compact.cloud_resources), dtype=np.int64)
+
+        for i, connections in cr_to_traffic.items():
+            classes[i] = traffic_to_class.setdefault(
+                tuple(sorted(connections)), len(traffic_to_class)
+            )
+
+        return classes
+
+    def _enforce_location_latencies(self) -> npt.NDArray[np.bool_]:
+        """Exclude the candidates that violate a maximum CR -> location latency.
+
+        The candidates are grouped by the location of their CS, so every latency is only
+        looked up once. For every target location, the CS locations are sorted by latency,
+        so the locations within a maximum latency are found with one binary search.
+        The CS locations allowed for a CR are then the intersection over all of its limits.
+
+        :return: The candidates to keep.
         """
-        for (cr, loc), max_latency in self.network_data.cr_and_loc_to_max_latency.items():
-            cs_list = self.base_data.cr_to_cs_list[cr]
+        compact = self.compact_base_data
+        network_data = self.network_data
+        offsets = compact.cr_to_cs_offsets.tolist()
+        keep = np.ones(compact.candidate_count, dtype=np.bool_)
+
+        # Only the latency from the CS locations to the target locations is needed
+        sources, cs_to_source = cs_locations(compact, network_data)
+        targets = sorted({loc for _, loc in network_data.cr_and_loc_to_max_latency.keys()})
+        target_index = {loc: i for i, loc in enumerate(targets)}
+        latency = location_matrix(network_data.loc_and_loc_to_latency).submatrix(sources, targets)
+        candidate_sources = cs_to_source[compact.cr_to_cs_indices]
+
+        # The CS locations of every target sorted by latency
+        # and the position of every CS location in that order
+        order = np.argsort(latency, axis=0, kind="stable")
+        sorted_latency = np.take_along_axis(latency, order, axis=0)
+        positions = np.empty_like(order)
+        np.put_along_axis(positions, order, np.arange(len(sources))[:, np.newaxis], axis=0)
+
+        limit_count = len(network_data.cr_and_loc_to_max_latency)
+        limit_crs = np.fromiter(
+            (compact.cr_index[cr] for cr, _ in network_data.cr_and_loc_to_max_latency.keys()),
+            dtype=np.int64,
+            count=limit_count,
+        )
+        limit_targets = np.fromiter(
+            (target_index[loc] for _, loc in network_data.cr_and_loc_to_max_latency.keys()),
+            dtype=np.int64,
+            count=limit_count,
+        )
+        max_latencies = np.fromiter(
+            network_data.cr_and_loc_to_max_latency.values(), dtype=np.float64, count=limit_count
+        )
+
+        # The number of CS locations within the maximum latency of every limit.
+        # The limits of a target share its sorted latencies.
+        allowed_counts = np.empty(limit_count, dtype=np.int64)
+        by_target = np.argsort(limit_targets, kind="stable")
+        target_starts = np.searchsorted(limit_targets[by_target], np.arange(len(targets) + 1))
+
+        for target in range(len(targets)):
+            limits = by_target[target_starts[target] : target_starts[target + 1]]
+            allowed_counts[limits] = np.searchsorted(
+                sorted_latency[:, target], max_latencies[limits], side="right"
+            )
+
+        # The limits that allow every CS location don't exclude any candidates
+        restrictive = np.flatnonzero(allowed_counts < len(sources))
+        by_cr = restrictive[np.argsort(limit_crs[restrictive], kind="stable")]
+        crs, cr_starts = np.unique(limit_crs[by_cr], return_index=True)
+        cr_starts = np.append(cr_starts, len(by_cr))
+
+        for i, cr in enumerate(crs.tolist()):
+            limits = by_cr[cr_starts[i] : cr_starts[i + 1]]
+
+            # The CS locations that are within the maximum latency of every limit of the CR
+            allowed = (positions[:, limit_targets[limits]] < allowed_counts[limits]).all(axis=1)
+
+            start, end = offsets[cr], offsets[cr + 1]
+            keep[start:end] = allowed[candidate_sources[start:end]]
+
+        return keep
+
+    def _enforce_cr_pair_latencies(self) -> npt.NDArray[np.bool_]:
+        """Exclude the candidates that violate the maximum latency of every partner.
+
+        This is the AC-3 algorithm on the graph of the CR -> CR connections:
+        The locations of the remaining candidates are the domain of each CR.
+        A location of one CR is only kept if the other CR of a connection has a location
+        within the maximum latency. Whenever the domain of a CR shrinks, its connections
+        are revised again.
+
+        Only connections with traffic are considered, like in the MIP.
+
+        :return: The candidates to keep.
+        :raises NoCandidatesError: As soon as a CR doesn't have any candidates left.
+        """
+        compact = self.compact_base_data
+        network_data = self.network_data
+        offsets = compact.cr_to_cs_offsets.tolist()
+        keep = compact.candidate_mask.copy()
+
+        # The domains only contain the locations of the CSs
+        locations, cs_to_loc = cs_locations(compact, network_data)
+        latency = location_matrix(network_data.loc_and_loc_to_latency).submatrix(
+            locations, locations
+        )
+
+        # The location of every candidate
+        candidate_locs = cs_to_loc[compact.cr_to_cs_indices]
+
+        def domain(cr: int) -> npt.NDArray[np.bool_]:
+            """Get the locations of the remaining candidates of the CR."""
+            start, end = offsets[cr], offsets[cr + 1]
+            present = np.zeros(len(locations), dtype=np.bool_)
+            present[candidate_locs[start:end][keep[start:end]]] = True
+            return present
+
+        # Each arc revises the domain of the first CR against the domain of the second CR.
+        # The latency matrix is oriented from the first to the second CR.
+        arcs: list[tuple[int, int, npt.NDArray[np.float64], Latency]] = []
+
+        for (cr1, cr2), max_latency in network_data.cr_and_cr_to_max_latency.items():
+            if (cr1, cr2) not in network_data.cr_and_cr_to_traffic:
+                continue
+
+            i, j = compact.cr_index[cr1], compact.cr_index[cr2]
+            arcs.append((i, j, latency, max_latency))
+            arcs.append((j, i, latency.T, max_latency))
+
+        # The arcs to revise when the domain of a CR shrinks
+        cr_to_dependent_arcs: dict[int, list[int]] = dict()
+
+        for arc, (_, other, _, _) in enumerate(arcs):
+            cr_to_dependent_arcs.setdefault(other, []).append(arc)
+
+        domains = {cr: domain(cr) for arc in arcs for cr in arc[:2]}
+
+        # CRs without candidates have been emptied by an earlier filter
+        if not all(present.any() for present in domains.values()):
+            return keep
+
+        queue = deque(range(len(arcs)))
+        queued = set(queue)
+
+        while len(queue) > 0:
+            arc = queue.popleft()
+            queued.remove(arc)
+            cr, other, arc_latency, max_latency = arcs[arc]
+
+            # The locations with a location of the other CR within the maximum latency
+            supported = (arc_latency[:, domains[other]] <= max_latency).any(axis=1)
+            revised = domains[cr] & supported
+
+            if np.array_equal(revised, domains[cr]):
+                continue
+
+            start, end = offsets[cr], offsets[cr + 1]
+            keep[start:end] &= supported[candidate_locs[start:end]]
+            domains[cr] = revised
 
-            # The CSs that satisfy the maximum latency criteria
-            low_latency_cs = [
-                cs
-                for cs in cs_list
-                if self.network_data.loc_and_loc_to_latency[(self.network_data.cs_to_loc[cs], loc)]
-                <= max_latency
-            ]
+            if not revised.any():
+                raise NoCandidatesError(
+                    {compact.cloud_resources[cr]: "the CR -> CR latency requirements"}
+                )
 
-            # Update the applicable CSs
-            self.base_data.cr_to_cs_list[cr] = low_latency_cs
+            for dependent in cr_to_dependent_arcs.get(cr, []):
+                if dependent not in queued:
+                    queue.append(dependent)
+                    queued.add(dependent)
 
-        return self.base_data
+        return keep
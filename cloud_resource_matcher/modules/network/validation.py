@@ -2,8 +2,9 @@
 from optiframe import ValidationTask
 
 from cloud_resource_matcher.modules.base import BaseData
+from cloud_resource_matcher.validation import raise_violations
 
-from .data import NetworkData
+from .data import LocationMatrix, NetworkData
 
 
 class ValidateNetworkTask(ValidationTask):
@@ -19,83 +20,117 @@ class ValidateNetworkTask(ValidationTask):
     def validate(self) -> None:
         """Validate the data for consistency.
 
-        :raises AssertionError: When the data is not valid.
+        All violations are collected before raising the error.
+
+        :raises ValidationError: When the data is not valid.
         """
+        cr_set = self.base_data.cr_set
+        cs_set = self.base_data.cs_set
+        locations = self.network_data.locations
+        violations: list[str] = []
+
         # Validate loc_and_loc_to_latency
-        for (loc1, loc2), latency in self.network_data.loc_and_loc_to_latency.items():
-            assert (
-                loc1 in self.network_data.locations
-            ), f"{loc1} in loc_and_loc_to_latency is not a valid location"
-            assert (
-                loc2 in self.network_data.locations
-            ), f"{loc2} in loc_and_loc_to_latency is not a valid location"
-
-            assert latency >= 0, "Latency must not be negative"
-
-        for loc1 in self.network_data.locations:
-            for loc2 in self.network_data.locations:
-                assert (
-                    loc1,
-                    loc2,
-                ) in self.network_data.loc_and_loc_to_latency.keys(), (
-                    f"No definition for location latency between {loc1} and {loc2}"
+        loc_and_loc_to_latency = self.network_data.loc_and_loc_to_latency
+
+        if isinstance(loc_and_loc_to_latency, LocationMatrix):
+            violations.extend(
+                loc_and_loc_to_latency.validate(
+                    locations, "loc_and_loc_to_latency", non_negative=True
                 )
+            )
+        else:
+            valid_latency_count = 0
+
+            for (loc1, loc2), latency in loc_and_loc_to_latency.items():
+                valid = True
+
+                if loc1 not in locations:
+                    violations.append(f"{loc1} in loc_and_loc_to_latency is not a valid location")
+                    valid = False
+                if loc2 not in locations:
+                    violations.append(f"{loc2} in loc_and_loc_to_latency is not a valid location")
+                    valid = False
+                if latency < 0:
+                    violations.append("Latency must not be negative")
+
+                valid_latency_count += valid
+
+            # If all keys are valid and there is one for each pair, none can be missing
+            if valid_latency_count < len(locations) ** 2:
+                for loc1 in locations:
+                    for loc2 in locations:
+                        if (loc1, loc2) not in loc_and_loc_to_latency:
+                            violations.append(
+                                f"No definition for location latency between {loc1} and {loc2}"
+                            )
 
         # Validate cs_to_loc
         for cs, loc in self.network_data.cs_to_loc.items():
-            assert cs in self.base_data.cloud_services, f"{cs} in cs_to_loc is not a valid service"
-            assert loc in self.network_data.locations, f"{loc} in cs_to_loc is not a valid location"
+            if cs not in cs_set:
+                violations.append(f"{cs} in cs_to_loc is not a valid service")
+            if loc not in locations:
+                violations.append(f"{loc} in cs_to_loc is not a valid location")
 
         for cs in self.base_data.cloud_services:
-            assert cs in self.network_data.cs_to_loc.keys(), f"No location defined for service {cs}"
+            if cs not in self.network_data.cs_to_loc:
+                violations.append(f"No location defined for service {cs}")
 
         # Validate cr_and_loc_to_max_latency
         for (cr, loc), latency in self.network_data.cr_and_loc_to_max_latency.items():
-            assert (
-                cr in self.base_data.cloud_resources
-            ), f"{cr} in cr_and_loc_to_max_latency is not a valid VM"
-            assert (
-                loc in self.network_data.locations
-            ), f"{loc} in cr_and_loc_to_max_latency is not a valid location"
-
-            assert latency >= 0, "The maximum latency must not be negative"
+            if cr not in cr_set:
+                violations.append(f"{cr} in cr_and_loc_to_max_latency is not a valid VM")
+            if loc not in locations:
+                violations.append(f"{loc} in cr_and_loc_to_max_latency is not a valid location")
+            if latency < 0:
+                violations.append("The maximum latency must not be negative")
 
         # Validate cr_and_loc_to_traffic
         for (cr, loc), traffic in self.network_data.cr_and_loc_to_traffic.items():
-            assert (
-                cr in self.base_data.cloud_resources
-            ), f"{cr} in cr_and_loc_to_traffic is not a valid CR"
-            assert (
-                loc in self.network_data.locations
-            ), f"{loc} in cr_and_loc_to_traffic is not a valid location"
-
-            assert traffic >= 0, f"Traffic from CR {cr} to location {loc} must not be negative"
+            if cr not in cr_set:
+                violations.append(f"{cr} in cr_and_loc_to_traffic is not a valid CR")
+            if loc not in locations:
+                violations.append(f"{loc} in cr_and_loc_to_traffic is not a valid location")
+            if traffic < 0:
+                violations.append(f"Traffic from CR {cr} to location {loc} must not be negative")
 
         # Validate cr_and_cr_to_traffic
         for (cr1, cr2), traffic in self.network_data.cr_and_cr_to_traffic.items():
-            assert (
-                cr1 in self.base_data.cloud_resources
-            ), f"{cr1} in cr_and_cr_to_traffic is not a valid CR"
-            assert (
-                cr2 in self.base_data.cloud_resources
-            ), f"{cr2} in cr_and_cr_to_traffic is not a valid CR"
-
-            assert traffic >= 0, f"Traffic from CR {cr1} to CR {cr2} must not be negative"
+            if cr1 not in cr_set:
+                violations.append(f"{cr1} in cr_and_cr_to_traffic is not a valid CR")
+            if cr2 not in cr_set:
+                violations.append(f"{cr2} in cr_and_cr_to_traffic is not a valid CR")
+            if traffic < 0:
+                violations.append(f"Traffic from CR {cr1} to CR {cr2} must not be negative")
 
         # Validate loc_and_loc_to_cost
-        for loc1, loc2 in self.network_data.loc_and_loc_to_cost:
-            assert (
-                loc1 in self.network_data.locations
-            ), f"{loc1} in loc_and_loc_to_cost is not a valid location"
-            assert (
-                loc2 in self.network_data.locations
-            ), f"{loc2} in loc_and_loc_to_cost is not a valid location"
-
-        for loc1 in self.network_data.locations:
-            for loc2 in self.network_data.locations:
-                assert (
-                    loc1,
-                    loc2,
-                ) in self.network_data.loc_and_loc_to_cost.keys(), (
-                    f"No network traffic costs specified for ({loc1}, {loc2})"
-                )
+        loc_and_loc_to_cost = self.network_data.loc_and_loc_to_cost
+
+        if isinstance(loc_and_loc_to_cost, LocationMatrix):
+            violations.extend(
+                loc_and_loc_to_cost.validate(locations, "loc_and_loc_to_cost", non_negative=False)
+            )
+        else:
+            valid_cost_count = 0
+
+            for loc1, loc2 in loc_and_loc_to_cost:
+                valid = True
+
+                if loc1 not in locations:
+                    violations.append(f"{loc1} in loc_and_loc_to_cost is not a valid location")
+                    valid = False
+                if loc2 not in locations:
+                    violations.append(f"{loc2} in loc_and_loc_to_cost is not a valid location")
+                    valid = False
+
+                valid_cost_count += valid
+
+            # If all keys are valid and there is one for each pair, none can be missing
+            if valid_cost_count < len(locations) ** 2:
+                for loc1 in locations:
+                    for loc2 in locations:
+                        if (loc1, loc2) not in loc_and_loc_to_cost:
+                            violations.append(
+                                f"No network traffic costs specified for ({loc1}, {loc2})"
+                            )
+
+        raise_violations(violations)
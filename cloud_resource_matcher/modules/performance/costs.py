@@ -0,0 +1,30 @@
+"""The costs of the performance module for each candidate."""
+import numpy as np
+import numpy.typing as npt
+
+from cloud_resource_matcher.modules.base import CompactBaseData
+
+from .data import PerformanceData
+
+
+def performance_candidate_costs(
+    compact_base_data: CompactBaseData, performance_data: PerformanceData
+) -> npt.NDArray[np.float64]:
+    """Calculate the usage-based performance cost of every candidate.
+
+    This is the cost for the performance used by the CR on the CS,
+    multiplied with the instance demand of the CR.
+    If no cost or demand is defined for a performance criterion, `0` is assumed.
+    """
+    compact = compact_base_data
+    demand = performance_data.demand_matrix(compact.cr_index)
+    cost_per_unit = performance_data.cost_per_unit_matrix(compact.cs_index)
+
+    candidate_crs = compact.candidate_crs()
+    costs = np.zeros(compact.candidate_count, dtype=np.float64)
+
+    # Accumulate one criterion at a time to keep the intermediate arrays small
+    for i in range(len(performance_data.performance_criteria)):
+        costs += demand[candidate_crs, i] * cost_per_unit[compact.cr_to_cs_indices, i]
+
+    return costs * compact.cr_to_instance_demand[candidate_crs]
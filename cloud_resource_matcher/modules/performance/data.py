@@ -1,10 +1,17 @@
 """The data for the performance module."""
 from dataclasses import dataclass
+from functools import cached_property
+from typing import Hashable, Mapping, TypeVar
+
+import numpy as np
+import numpy.typing as npt
 
 from cloud_resource_matcher.modules.base.data import CloudResource, CloudService, Cost
 
 PerformanceCriterion = str
 
+_Key = TypeVar("_Key", bound=Hashable)
+
 
 @dataclass
 class PerformanceData:
@@ -13,6 +20,9 @@ class PerformanceData:
     You can specify how much performance a CR needs and how much the CSs provide.
     You can also define costs for the performance attributes,
     which is helpful to represent usage-based pricing models.
+
+    The data can be converted to dense matrices with one row per CR or CS
+    and one column per performance criterion, ordered like `performance_criteria`.
     """
 
     # The available performance criteria, e.g. number of vCPUs or amount of RAM
@@ -31,3 +41,50 @@ class PerformanceData:
     # The cost is further multiplied by the instance demand of the cloud resource.
     # If no cost is defined, `0` is assumed.
     cost_per_unit: dict[tuple[CloudService, PerformanceCriterion], Cost]
+
+    @cached_property
+    def pc_index(self) -> dict[PerformanceCriterion, int]:
+        """A map from each performance criterion to its column in the dense matrices."""
+        return {pc: i for i, pc in enumerate(self.performance_criteria)}
+
+    def demand_matrix(
+        self, cr_index: Mapping[CloudResource, int], default: float = 0
+    ) -> npt.NDArray[np.float64]:
+        """Convert the performance demand to a dense CR x criterion matrix.
+
+        :param cr_index: A map from each CR to its row in the matrix.
+        :param default: The value for criteria without a demand.
+        """
+        return self._dense_matrix(self.performance_demand, cr_index, default)
+
+    def supply_matrix(self, cs_index: Mapping[CloudService, int]) -> npt.NDArray[np.float64]:
+        """Convert the performance supply to a dense CS x criterion matrix.
+
+        :param cs_index: A map from each CS to its row in the matrix.
+        """
+        return self._dense_matrix(self.performance_supply, cs_index, 0)
+
+    def cost_per_unit_matrix(self, cs_index: Mapping[CloudService, int]) -> npt.NDArray[np.float64]:
+        """Convert the cost per unit to a dense CS x criterion matrix.
+
+        Criteria without a cost have a cost of `0`.
+
+        :param cs_index: A map from each CS to its row in the matrix.
+        """
+        return self._dense_matrix(self.cost_per_unit, cs_index, 0)
+
+    def _dense_matrix(
+        self,
+        values: dict[tuple[_Key, PerformanceCriterion], float],
+        row_index: Mapping[_Key, int],
+        default: float,
+    ) -> npt.NDArray[np.float64]:
+        matrix = np.full((len(row_index), len(self.pc_index)), default, dtype=np.float64)
+
+        rows = np.fromiter((row_index[key] for key, _ in values), dtype=np.int64, count=len(values))
+        columns = np.fromiter(
+            (self.pc_index[pc] for _, pc in values), dtype=np.int64, count=len(values)
+        )
+        matrix[rows, columns] = np.fromiter(values.values(), dtype=np.float64, count=len(values))
+
+        return matrix
@@ -1,36 +1,56 @@
 """Implementation of the pre-processing step for the performance module."""
+import numpy as np
 from optiframe import PreProcessingTask
 
-from cloud_resource_matcher.modules.base import BaseData
+from cloud_resource_matcher.modules.base import CompactBaseData
 
+from .costs import performance_candidate_costs
 from .data import PerformanceData
 
 
-class PreProcessingPerformanceTask(PreProcessingTask[BaseData]):
+class PreProcessingPerformanceTask(PreProcessingTask[CompactBaseData]):
     """A task to implement the pre-processing for the performance module."""
 
-    base_data: BaseData
+    compact_base_data: CompactBaseData
     performance_data: PerformanceData
 
-    def __init__(self, base_data: BaseData, performance_data: PerformanceData):
-        self.base_data = base_data
+    def __init__(self, compact_base_data: CompactBaseData, performance_data: PerformanceData):
+        self.compact_base_data = compact_base_data
         self.performance_data = performance_data
 
-    def pre_process(self) -> BaseData:
+    def pre_process(self) -> CompactBaseData:
         """Enforce the performance requirements as a pre-processing step.
 
-        Removes CSs from the list of applicable CS if they do not satisfy the
-        performance requirements of a CR.
+        Excludes CSs from the applicable CSs of a CR if they do not satisfy the
+        performance requirements of the CR.
+        Also adds the costs for the performance used by the CRs to the candidates
+        and prevents the aggregation of CRs with different performance demands,
+        because their costs differ as soon as the cost per unit changes.
         """
-        for (cr, pc), demand in self.performance_data.performance_demand.items():
-            cs_list = self.base_data.cr_to_cs_list[cr]
+        compact = self.compact_base_data
+        # Criteria without a demand are always satisfied
+        demand = self.performance_data.demand_matrix(compact.cr_index, default=-np.inf)
+        supply = self.performance_data.supply_matrix(compact.cs_index)
 
-            # The CSs that satisfy the performance criteria
-            performant_cs = [
-                cs for cs in cs_list if self.performance_data.performance_supply[(cs, pc)] >= demand
-            ]
+        candidate_crs = compact.candidate_crs()
+        keep = np.ones(compact.candidate_count, dtype=np.bool_)
 
-            # Update the applicable CSs
-            self.base_data.cr_to_cs_list[cr] = performant_cs
+        # Only keep the CSs that satisfy the performance criteria.
+        # Compare one criterion at a time to keep the intermediate arrays small.
+        for i in range(len(self.performance_data.performance_criteria)):
+            if not np.isfinite(demand[:, i]).any():
+                continue
 
-        return self.base_data
+            keep &= supply[compact.cr_to_cs_indices, i] >= demand[candidate_crs, i]
+
+        # The applicable CSs are only updated once all modules have restricted them
+        compact.restrict_candidates(keep, "the performance requirements")
+
+        # The demand of every criterion is part of the signature of the CR
+        compact.distinguish_crs(demand)
+
+        # Pay for the performance used by the cloud resources
+        if len(self.performance_data.cost_per_unit) > 0:
+            compact.add_candidate_costs(performance_candidate_costs(compact, self.performance_data))
+
+        return compact
@@ -2,6 +2,7 @@
 from optiframe import ValidationTask
 
 from cloud_resource_matcher.modules.base import BaseData
+from cloud_resource_matcher.validation import raise_violations
 
 from .data import PerformanceData
 
@@ -19,39 +20,50 @@ class ValidatePerformanceTask(ValidationTask):
     def validate(self) -> None:
         """Validate the data for consistency.
 
-        :raises AssertionError: When the data is not valid.
+        All violations are collected before raising the error.
+
+        :raises ValidationError: When the data is not valid.
         """
+        cr_set = self.base_data.cr_set
+        cs_set = self.base_data.cs_set
+        pc_set = set(self.performance_data.performance_criteria)
+        violations: list[str] = []
+
         # Validate performance_demand
-        for (cr, pc) in self.performance_data.performance_demand.keys():
-            assert (
-                cr in self.base_data.cloud_resources
-            ), f"{cr} in performance_demand is not a valid CR"
-            assert (
-                pc in self.performance_data.performance_criteria
-            ), f"{pc} in performance_demand is not a valid performance criterion"
+        for cr, pc in self.performance_data.performance_demand.keys():
+            if cr not in cr_set:
+                violations.append(f"{cr} in performance_demand is not a valid CR")
+            if pc not in pc_set:
+                violations.append(
+                    f"{pc} in performance_demand is not a valid performance criterion"
+                )
 
         # Validate performance_supply
-        for (cs, pc) in self.performance_data.performance_supply.keys():
-            assert (
-                cs in self.base_data.cloud_services
-            ), f"{cs} in performance_supply is not a valid CS"
-            assert (
-                pc in self.performance_data.performance_criteria
-            ), f"{pc} in performance_supply is not a valid performance criterion"
-
-        # The supply for each criterion must be specified for all CSs
-        for cs in self.base_data.cloud_services:
-            for pc in self.performance_data.performance_criteria:
-                assert (
-                    cs,
-                    pc,
-                ) in self.performance_data.performance_supply.keys(), (
-                    f"CS {cs} does not have its supply for {pc} defined"
+        valid_supply_count = 0
+
+        for cs, pc in self.performance_data.performance_supply.keys():
+            if cs not in cs_set:
+                violations.append(f"{cs} in performance_supply is not a valid CS")
+            elif pc not in pc_set:
+                violations.append(
+                    f"{pc} in performance_supply is not a valid performance criterion"
                 )
+            else:
+                valid_supply_count += 1
+
+        # The supply for each criterion must be specified for all CSs.
+        # If all keys are valid and there is one for each pair, none can be missing.
+        if valid_supply_count < len(cs_set) * len(pc_set):
+            for cs in self.base_data.cloud_services:
+                for pc in self.performance_data.performance_criteria:
+                    if (cs, pc) not in self.performance_data.performance_supply:
+                        violations.append(f"CS {cs} does not have its supply for {pc} defined")
 
         # Validate cost_per_unit
-        for (cs, pc) in self.performance_data.cost_per_unit.keys():
-            assert cs in self.base_data.cloud_services, f"{cs} in cost_per_unit is not a valid CS"
-            assert (
-                pc in self.performance_data.performance_criteria
-            ), f"{pc} in cost_per_unit is not a valid performance criterion"
+        for cs, pc in self.performance_data.cost_per_unit.keys():
+            if cs not in cs_set:
+                violations.append(f"{cs} in cost_per_unit is not a valid CS")
+            if pc not in pc_set:
+                violations.append(f"{pc} in cost_per_unit is not a valid performance criterion")
+
+        raise_violations(violations)
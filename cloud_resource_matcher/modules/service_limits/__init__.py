@@ -7,10 +7,13 @@ from optiframe import OptimizationModule
 
 from .data import ServiceLimitsData
 from .mip_construction import MipConstructionServiceLimitsTask
+from .pre_processing import PreProcessingServiceLimitsTask
 from .validation import ValidationServiceLimitsTask
 
 service_limits_module = OptimizationModule(
-    validation=ValidationServiceLimitsTask, mip_construction=MipConstructionServiceLimitsTask
+    validation=ValidationServiceLimitsTask,
+    pre_processing=PreProcessingServiceLimitsTask,
+    mip_construction=MipConstructionServiceLimitsTask,
 )
 
 __all__ = ["ServiceLimitsData", "service_limits_module"]
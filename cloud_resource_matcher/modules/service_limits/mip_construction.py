@@ -1,9 +1,9 @@
 """Implementation of the build MIP step for the service limits module."""
-from optiframe import MipConstructionTask
-from pulp import LpProblem, lpSum
+from optiframe import InfeasibleError, MipConstructionTask
+from pulp import LpAffineExpression, LpProblem, lpSum
 
 from cloud_resource_matcher.modules.base import BaseData, BaseMipData
-from cloud_resource_matcher.modules.base.mip_construction import CsToCrList
+from cloud_resource_matcher.modules.base.data import CloudService
 
 from .data import ServiceLimitsData
 
@@ -29,25 +29,37 @@ class MipConstructionServiceLimitsTask(MipConstructionTask[None]):
         self.problem = problem
 
     def construct_mip(self) -> None:
-        """Add the variables and constraints for the service limits module."""
-        # Pre-compute which cloud services can host which cloud resources
-        cs_to_cr_list: CsToCrList = {
-            cs: set(
-                cr
-                for cr in self.base_data.cloud_resources
-                if cs in self.base_data.cr_to_cs_list[cr]
-            )
-            for cs in self.base_data.cloud_services
-        }
+        """Add the variables and constraints for the service limits module.
+
+        :raises InfeasibleError: If the fixed CRs already exceed the limit of a CS.
+        """
+        cr_to_max_instance_demand = self.service_limits_data.cr_to_max_instance_demand
+        fixed_instances: dict[CloudService, int] = dict()
+
+        for cr, cs in self.base_mip_data.cr_to_fixed_cs.items():
+            fixed_instances[cs] = fixed_instances.get(cs, 0) + cr_to_max_instance_demand[cr]
+
+        # The instances used by the groups of equivalent CRs.
+        # All CRs of a group have the same maximum instance demand.
+        group_instances: dict[CloudService, list[LpAffineExpression]] = dict()
+
+        for (cr, cs), var in self.base_mip_data.var_cr_group_to_cs_count.items():
+            group_instances.setdefault(cs, []).append(var * cr_to_max_instance_demand[cr])
 
         # Enforce limits for cloud service instance count
         for cs, max_instances in self.service_limits_data.cs_to_instance_limit.items():
+            # The instances used by the fixed CRs are not available for the other CRs
+            available_instances = max_instances - fixed_instances.get(cs, 0)
+
+            if available_instances < 0:
+                raise InfeasibleError()
+
             self.problem += (
                 lpSum(
-                    self.base_mip_data.var_cr_to_cs_matching[vm, cs]
-                    * self.service_limits_data.cr_to_max_instance_demand[vm]
-                    for vm in cs_to_cr_list[cs]
+                    self.base_mip_data.var_cr_to_cs_matching[vm, cs] * cr_to_max_instance_demand[vm]
+                    for vm in self.base_mip_data.cs_to_cr_list[cs]
                 )
-                <= max_instances,
+                + lpSum(group_instances.get(cs, []))
+                <= available_instances,
                 f"cs_instance_limit({cs})",
             )
@@ -0,0 +1,34 @@
+"""Implementation of the pre-processing step for the service limits module."""
+import numpy as np
+from optiframe import PreProcessingTask
+
+from cloud_resource_matcher.modules.base import CompactBaseData
+
+from .data import ServiceLimitsData
+
+
+class PreProcessingServiceLimitsTask(PreProcessingTask[CompactBaseData]):
+    """A task to implement the pre-processing for the service limits module."""
+
+    compact_base_data: CompactBaseData
+    service_limits_data: ServiceLimitsData
+
+    def __init__(self, compact_base_data: CompactBaseData, service_limits_data: ServiceLimitsData):
+        self.compact_base_data = compact_base_data
+        self.service_limits_data = service_limits_data
+
+    def pre_process(self) -> CompactBaseData:
+        """Prevent the aggregation of CRs with different maximum instance demands."""
+        compact = self.compact_base_data
+        compact.distinguish_crs(
+            np.fromiter(
+                (
+                    self.service_limits_data.cr_to_max_instance_demand[cr]
+                    for cr in compact.cloud_resources
+                ),
+                dtype=np.int64,
+                count=len(compact.cloud_resources),
+            )
+        )
+
+        return compact
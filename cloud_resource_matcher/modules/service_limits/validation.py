@@ -2,6 +2,7 @@
 from optiframe import ValidationTask
 
 from cloud_resource_matcher.modules.base import BaseData
+from cloud_resource_matcher.validation import raise_violations
 
 from .data import ServiceLimitsData
 
@@ -19,32 +20,40 @@ class ValidationServiceLimitsTask(ValidationTask):
     def validate(self) -> None:
         """Validate the data for consistency.
 
-        :raises AssertionError: When the data is not valid.
+        All violations are collected before raising the error.
+
+        :raises ValidationError: When the data is not valid.
         """
+        cr_set = self.base_data.cr_set
+        cs_set = self.base_data.cs_set
+        violations: list[str] = []
+
         # Validate cs_to_instance_limit
-        for (cs, instances) in self.service_limits_data.cs_to_instance_limit.items():
-            assert (
-                cs in self.base_data.cloud_services
-            ), f"{cs} in cs_to_instance_limit is not a valid CS"
-            assert instances >= 0, f"Negative max instance count {instances} for CS {cs}"
+        for cs, instances in self.service_limits_data.cs_to_instance_limit.items():
+            if cs not in cs_set:
+                violations.append(f"{cs} in cs_to_instance_limit is not a valid CS")
+            if instances < 0:
+                violations.append(f"Negative max instance count {instances} for CS {cs}")
 
         # Validate cr_to_max_instance_demand
         for cr, max_instance_demand in self.service_limits_data.cr_to_max_instance_demand.items():
-            assert (
-                cr in self.base_data.cloud_resources
-            ), f"{cr} in cr_to_max_instance_demand is not a valid CR"
-            assert (
-                max_instance_demand >= 0
-            ), f"Negative max instance demand {max_instance_demand} for CR {cr}"
+            if cr not in cr_set:
+                violations.append(f"{cr} in cr_to_max_instance_demand is not a valid CR")
+                continue
 
-            total_instance_demand = self.base_data.cr_to_instance_demand[cr]
+            if max_instance_demand < 0:
+                violations.append(f"Negative max instance demand {max_instance_demand} for CR {cr}")
 
-            assert max_instance_demand <= total_instance_demand, (
-                f"The maximum instance demand {max_instance_demand} for CR {cr}"
-                f" cannot be larger than the total instance demand {total_instance_demand}"
-            )
+            total_instance_demand = self.base_data.cr_to_instance_demand.get(cr)
+
+            if total_instance_demand is not None and max_instance_demand > total_instance_demand:
+                violations.append(
+                    f"The maximum instance demand {max_instance_demand} for CR {cr}"
+                    f" cannot be larger than the total instance demand {total_instance_demand}"
+                )
 
         for cr in self.base_data.cloud_resources:
-            assert (
-                cr in self.service_limits_data.cr_to_max_instance_demand.keys()
-            ), f"CR {cr} does not have a maximum instance demand specified"
+            if cr not in self.service_limits_data.cr_to_max_instance_demand:
+                violations.append(f"CR {cr} does not have a maximum instance demand specified")
+
+        raise_violations(violations)
@@ -0,0 +1,376 @@
+"""Race multiple solver configurations against each other on the same model.
+
+Which solver and which settings perform best differs between problem instances
+and even between runs with different random seeds.
+The portfolio exports the model once and solves it with all configurations in parallel processes.
+The first configuration that proves optimality (or infeasibility) wins and the other processes
+are stopped. If no configuration finishes before the time limit,
+the best solution found by any of them is used.
+"""
+import json
+import logging
+import shutil
+import subprocess
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Optional
+
+import pulp
+from pulp import (
+    LpProblem,
+    LpSolutionInfeasible,
+    LpSolutionIntegerFeasible,
+    LpSolutionNoSolutionFound,
+    LpSolutionOptimal,
+    LpStatusInfeasible,
+    LpStatusNotSolved,
+    LpStatusOptimal,
+    LpVariable,
+)
+
+from cloud_resource_matcher.modules.base.data import Cost
+from cloud_resource_matcher.mps import MpsNames, read_cbc_solution, write_mps
+from cloud_resource_matcher.solver import SCIP_AGGRESSIVE_OPTIONS, Solver
+
+logger = logging.getLogger(__name__)
+
+# The time between two checks if a solver has finished
+_POLL_INTERVAL = 0.01
+
+# The additional time the solvers get to write their solutions after the time limit
+_TIME_LIMIT_GRACE = timedelta(seconds=5)
+
+# The SCIP statuses that prove the optimality of the solution
+_SCIP_OPTIMAL_STATUSES = {"optimal solution found", "gap limit reached"}
+
+# The Gurobi status codes for optimal and infeasible models
+_GUROBI_OPTIMAL = 2
+_GUROBI_INFEASIBLE = 3
+
+
+@dataclass
+class SolverConfiguration:
+    """A solver with its settings, as one entry of a portfolio.
+
+    Only CBC, SCIP and Gurobi are supported.
+    """
+
+    solver: Solver
+
+    # Additional options for the solver.
+    # These are command line arguments for CBC and Gurobi and interactive commands for SCIP.
+    options: list[str] = field(default_factory=list)
+
+    # The name to identify the configuration in the logs
+    name: str = ""
+
+    def path(self) -> Optional[str]:
+        """Find the executable of the solver, if it is installed locally."""
+        if self.solver == Solver.CBC:
+            path: Optional[str] = pulp.PULP_CBC_CMD().executable(pulp.PULP_CBC_CMD().path)
+        elif self.solver == Solver.SCIP:
+            path = pulp.SCIP_CMD().executable(pulp.SCIP_CMD().path)
+        elif self.solver == Solver.GUROBI:
+            path = shutil.which("gurobi_cl")
+        else:
+            path = None
+
+        return path or None
+
+
+def default_portfolio(seed_count: int = 2) -> list[SolverConfiguration]:
+    """Get a portfolio of all locally installed solvers.
+
+    CBC is always available, so the portfolio contains at least the default CBC configuration
+    and CBC with different random seeds.
+
+    :param seed_count: The number of additional CBC configurations with different seeds.
+    """
+    configurations = [SolverConfiguration(Solver.CBC, name="cbc")]
+
+    for seed in range(1, seed_count + 1):
+        configurations.append(
+            SolverConfiguration(
+                Solver.CBC, options=["randomCbcSeed", str(seed)], name=f"cbc_seed_{seed}"
+            )
+        )
+
+    configurations.extend(
+        [
+            SolverConfiguration(Solver.SCIP, options=SCIP_AGGRESSIVE_OPTIONS, name="scip"),
+            SolverConfiguration(Solver.GUROBI, name="gurobi"),
+        ]
+    )
+
+    return [configuration for configuration in configurations if configuration.path() is not None]
+
+
+@dataclass
+class _Outcome:
+    """The result of one solver run."""
+
+    status: int
+    sol_status: int
+    values: dict[LpVariable, float]
+
+    def is_proven(self) -> bool:
+        """Determine if the solver proved that the solution is optimal or doesn't exist."""
+        return self.sol_status in (LpSolutionOptimal, LpSolutionInfeasible)
+
+
+@dataclass
+class _Run:
+    """A solver process of the portfolio."""
+
+    configuration: SolverConfiguration
+    process: "subprocess.Popen[bytes]"
+    solution_path: str
+
+
+class PortfolioSolver(pulp.LpSolver_CMD):  # type: ignore[misc]
+    """Solve the model with multiple solver configurations in parallel.
+
+    Can be passed to `.solve(...)` like any other PuLP solver.
+    Only minimization problems are supported.
+    The name of the winning configuration is available in `winner` after solving.
+    """
+
+    configurations: list[SolverConfiguration]
+    winner: Optional[str]
+
+    def __init__(
+        self,
+        configurations: Optional[list[SolverConfiguration]] = None,
+        time_limit: Optional[timedelta] = None,
+        cost_gap_abs: Optional[Cost] = None,
+        cost_gap_rel: Optional[float] = None,
+        msg: bool = False,
+        **kwargs: Any,
+    ):
+        """Create a new portfolio.
+
+        :param configurations: The solver configurations to race.
+        Configurations of solvers that are not installed are skipped.
+        Defaults to `default_portfolio()`.
+        """
+        time_limit_sec = None if time_limit is None else time_limit.total_seconds()
+        super().__init__(
+            msg=msg, timeLimit=time_limit_sec, gapAbs=cost_gap_abs, gapRel=cost_gap_rel, **kwargs
+        )
+
+        if configurations is None:
+            configurations = default_portfolio()
+
+        self.configurations = [
+            configuration for configuration in configurations if configuration.path() is not None
+        ]
+        self.winner = None
+
+    def defaultPath(self) -> str:
+        """Get the path of the bundled CBC solver, which is always part of the portfolio."""
+        return str(pulp.PULP_CBC_CMD().path)
+
+    def available(self) -> bool:
+        """Determine if any of the configurations can be used."""
+        return len(self.configurations) > 0
+
+    def actualSolve(self, lp: LpProblem, **kwargs: Any) -> int:
+        """Solve the problem with all configurations and keep the result of the winner."""
+        if lp.sense != pulp.LpMinimize:
+            raise pulp.PulpSolverError("The solver portfolio only supports minimization problems")
+
+        if not self.available():
+            raise pulp.PulpSolverError("None of the solvers of the portfolio is installed")
+
+        (tmp_mps,) = self.create_tmp_files(lp.name, "mps")
+        names = write_mps(lp, tmp_mps)
+        runs = [self._start(configuration, tmp_mps) for configuration in self.configurations]
+
+        try:
+            result = self._race(lp, runs, names)
+        finally:
+            for run in runs:
+                if run.process.poll() is None:
+                    run.process.kill()
+                    run.process.wait()
+
+            self.delete_tmp_files(tmp_mps, *(run.solution_path for run in runs))
+
+        if result is None:
+            logger.info("No configuration of the portfolio found a solution")
+            lp.assignStatus(LpStatusNotSolved, LpSolutionNoSolutionFound)
+            return int(LpStatusNotSolved)
+
+        run, outcome = result
+        self.winner = run.configuration.name
+        logger.info(f"The configuration {self.winner} won the portfolio")
+
+        for var in names.variables:
+            var.varValue = outcome.values.get(var, 0.0)
+
+        lp.assignStatus(outcome.status, outcome.sol_status)
+        return outcome.status
+
+    def _start(self, configuration: SolverConfiguration, mps_path: str) -> _Run:
+        extension = "json" if configuration.solver == Solver.GUROBI else "sol"
+        (solution_path,) = self.create_tmp_files("portfolio", extension)
+        path = configuration.path()
+        assert path is not None
+
+        time_limit = self.timeLimit
+        gap_rel = self.optionsDict.get("gapRel")
+        gap_abs = self.optionsDict.get("gapAbs")
+
+        if configuration.solver == Solver.CBC:
+            args = [path, mps_path, "timeMode", "elapsed"]
+            if time_limit is not None:
+                args.extend(["sec", str(time_limit)])
+            if gap_rel is not None:
+                args.extend(["ratio", str(gap_rel)])
+            if gap_abs is not None:
+                args.extend(["allow", str(gap_abs)])
+            args.extend(configuration.options)
+            args.extend(["branch", "printingOptions", "all", "solution", solution_path])
+        elif configuration.solver == Solver.SCIP:
+            commands = [f'read "{mps_path}"']
+            if time_limit is not None:
+                commands.append(f"set limits time {time_limit}")
+            if gap_rel is not None:
+                commands.append(f"set limits gap {gap_rel}")
+            if gap_abs is not None:
+                commands.append(f"set limits absgap {gap_abs}")
+            commands.extend(configuration.options)
+            commands.extend(["optimize", f'write solution "{solution_path}"', "quit"])
+            args = [path, *(arg for command in commands for arg in ("-c", command))]
+        else:
+            args = [path, f"ResultFile={solution_path}"]
+            if time_limit is not None:
+                args.append(f"TimeLimit={time_limit}")
+            if gap_rel is not None:
+                args.append(f"MIPGap={gap_rel}")
+            if gap_abs is not None:
+                args.append(f"MIPGapAbs={gap_abs}")
+            args.extend(configuration.options)
+            args.append(mps_path)
+
+        output = None if self.msg else subprocess.DEVNULL
+        process = subprocess.Popen(args, stdout=output, stderr=output)
+
+        return _Run(configuration, process, solution_path)
+
+    def _race(
+        self, lp: LpProblem, runs: list[_Run], names: MpsNames
+    ) -> Optional[tuple[_Run, _Outcome]]:
+        """Wait for the first proven result or for the best solution after all runs finished."""
+        deadline = (
+            None
+            if self.timeLimit is None
+            else time.monotonic() + self.timeLimit + _TIME_LIMIT_GRACE.total_seconds()
+        )
+        pending = list(runs)
+        best: Optional[tuple[float, _Run, _Outcome]] = None
+
+        while len(pending) > 0:
+            finished = [run for run in pending if run.process.poll() is not None]
+
+            if len(finished) == 0:
+                if deadline is not None and time.monotonic() > deadline:
+                    break
+
+                time.sleep(_POLL_INTERVAL)
+                continue
+
+            for run in finished:
+                pending.remove(run)
+                outcome = _read_outcome(run, names)
+
+                if outcome is None:
+                    logger.info(f"The configuration {run.configuration.name} failed")
+                    continue
+
+                if outcome.is_proven():
+                    return run, outcome
+
+                if outcome.sol_status == LpSolutionIntegerFeasible:
+                    cost = _objective_value(lp, outcome.values)
+
+                    if best is None or cost < best[0]:
+                        best = (cost, run, outcome)
+
+        return None if best is None else (best[1], best[2])
+
+
+def _objective_value(lp: LpProblem, values: dict[LpVariable, float]) -> float:
+    return float(
+        sum(coefficient * values.get(var, 0.0) for var, coefficient in lp.objective.items())
+    )
+
+
+def _read_outcome(run: _Run, names: MpsNames) -> Optional[_Outcome]:
+    """Read the solution written by the solver, if there is one."""
+    try:
+        if run.configuration.solver == Solver.CBC:
+            status, sol_status = pulp.PULP_CBC_CMD().get_status(run.solution_path)
+            return _Outcome(status, sol_status, read_cbc_solution(run.solution_path, names))
+        elif run.configuration.solver == Solver.SCIP:
+            return _read_scip_solution(run.solution_path, names)
+        else:
+            return _read_gurobi_solution(run.solution_path, names)
+    except FileNotFoundError:
+        return None
+
+
+def _column_values(names: MpsNames, values: dict[str, float]) -> dict[LpVariable, float]:
+    """Map the values of the columns in the MPS file back to the variables."""
+    return {
+        names.variables[int(name[1:])]: value
+        for name, value in values.items()
+        if name.startswith("x")
+    }
+
+
+def _outcome(optimal: bool, infeasible: bool, values: dict[LpVariable, float]) -> _Outcome:
+    if optimal:
+        return _Outcome(LpStatusOptimal, LpSolutionOptimal, values)
+    elif infeasible:
+        return _Outcome(LpStatusInfeasible, LpSolutionInfeasible, values)
+    elif len(values) > 0:
+        # Stopped early with a solution, like PuLP reports it for CBC
+        return _Outcome(LpStatusOptimal, LpSolutionIntegerFeasible, values)
+    else:
+        return _Outcome(LpStatusNotSolved, LpSolutionNoSolutionFound, values)
+
+
+def _read_scip_solution(path: str, names: MpsNames) -> _Outcome:
+    """Read a solution file written by SCIP.
+
+    The first line contains the status, followed by the objective value and the non-zero values.
+    """
+    values: dict[str, float] = dict()
+
+    with open(path) as file:
+        status = file.readline().split(":", 1)[-1].strip()
+
+        for line in file:
+            parts = line.split()
+
+            if len(parts) >= 2 and not line.startswith("objective value"):
+                values[parts[0]] = float(parts[1])
+
+    return _outcome(
+        status in _SCIP_OPTIMAL_STATUSES, status == "infeasible", _column_values(names, values)
+    )
+
+
+def _read_gurobi_solution(path: str, names: MpsNames) -> _Outcome:
+    """Read a solution file written by Gurobi in the JSON format."""
+    with open(path) as file:
+        solution = json.load(file)
+
+    status = solution["SolutionInfo"]["Status"]
+    values = {var["VarName"]: float(var["X"]) for var in solution.get("Vars", [])}
+
+    return _outcome(
+        status == _GUROBI_OPTIMAL, status == _GUROBI_INFEASIBLE, _column_values(names, values)
+    )
@@ -0,0 +1,295 @@
+"""Track the progress of the solver while it is running.
+
+The log of the solver is captured as it is written and parsed into `SolverProgress` entries,
+containing the best solution found so far, the best bound and the gap between them.
+The entries can be consumed with a callback while the solver is running
+and are recorded in the step data by the `progress_module` after solving.
+
+Currently, only the log of the CBC solver is supported.
+"""
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Callable, Optional
+
+import pulp
+from optiframe import OptimizationModule, SolutionExtractionTask
+from optiframe.framework.default_tasks import SolveSettings
+from pulp import LpProblem
+
+from cloud_resource_matcher.mps import DirectMpsCbcSolver
+
+# The time between two reads of the log file
+_POLL_INTERVAL = 0.05
+
+# CBC uses values beyond this as objective value or bound if none is known yet
+_CBC_INFINITY = 1e50
+
+# Patterns for the CBC log lines that contain progress information
+_CBC_BOUND = re.compile(
+    r"Continuous objective value is (\S+)|Cuts at root node changed objective from \S+ to (\S+)"
+)
+_CBC_NODES = re.compile(
+    r"Cbc0010I After (\d+) nodes, \d+ on tree, (\S+) best solution, best possible (\S+)"
+)
+_CBC_SOLUTION = re.compile(
+    r"Cbc00(?:04|12)I Integer solution of (\S+) found .* and (\d+) nodes"
+    r"|Cbc0038I Solution found of (\S+)"
+)
+_CBC_END = re.compile(
+    r"Cbc000[15]I (?:Search completed|Partial search) - best objective (\S+)"
+    r"(?:, | \(best possible (\S+)\), )took \d+ iterations and (\d+) nodes"
+)
+# The summary is also printed if the problem has been solved by the pre-processing
+_CBC_RESULT = re.compile(r"^Result - (.*)$")
+_CBC_OBJECTIVE = re.compile(r"^Objective value:\s+(\S+)")
+
+ProgressCallback = Callable[["SolverProgress"], None]
+
+
+@dataclass
+class SolverProgress:
+    """The state of the solver at a point in time."""
+
+    # The time since the solver has been started
+    time: timedelta
+
+    # The objective value of the best solution found so far
+    incumbent: Optional[float]
+
+    # The best bound on the objective value of the optimal solution
+    best_bound: Optional[float]
+
+    # The number of explored nodes in the branch and bound tree
+    node_count: int
+
+    @property
+    def gap(self) -> Optional[float]:
+        """The relative gap between the incumbent and the best bound."""
+        if self.incumbent is None or self.best_bound is None:
+            return None
+
+        if self.incumbent == self.best_bound:
+            return 0.0
+
+        return abs(self.incumbent - self.best_bound) / max(abs(self.incumbent), 1e-10)
+
+
+@dataclass
+class SolverProgressLog:
+    """The progress of the solver over time, for the last solve."""
+
+    entries: list[SolverProgress] = field(default_factory=list)
+
+    def gap_over_time(self) -> list[tuple[float, float]]:
+        """Get the gap over time, in seconds since the solver has been started.
+
+        Only includes entries where both the incumbent and the best bound are known.
+        """
+        return [
+            (entry.time.total_seconds(), gap)
+            for entry in self.entries
+            if (gap := entry.gap) is not None
+        ]
+
+
+class CbcLogParser:
+    """Parse the log of CBC line by line."""
+
+    start: float
+    incumbent: Optional[float]
+    best_bound: Optional[float]
+    node_count: int
+    # Whether the summary reports an optimal solution
+    optimal: bool
+    # Whether the search has ended. The statistics printed afterwards are ignored.
+    finished: bool
+
+    def __init__(self) -> None:
+        self.start = time.monotonic()
+        self.incumbent = None
+        self.best_bound = None
+        self.node_count = 0
+        self.optimal = False
+        self.finished = False
+
+    def parse_line(self, line: str) -> Optional[SolverProgress]:
+        """Parse a line of the log.
+
+        :return: The new progress, if the line changed the incumbent, the bound or the nodes.
+        """
+        if self.finished:
+            return None
+
+        state = (self.incumbent, self.best_bound, self.node_count)
+
+        if match := _CBC_NODES.search(line):
+            self.node_count = int(match[1])
+            self._update_incumbent(match[2])
+            self._update_bound(match[3])
+        elif match := _CBC_SOLUTION.search(line):
+            self._update_incumbent(match[1] or match[3])
+
+            if match[2] is not None:
+                self.node_count = int(match[2])
+        elif match := _CBC_END.search(line):
+            self._update_incumbent(match[1])
+            self._update_bound(match[1] if match[2] is None else match[2])
+            self.node_count = int(match[3])
+            self.finished = True
+        elif match := _CBC_RESULT.search(line):
+            self.optimal = match[1] == "Optimal solution found"
+        elif match := _CBC_OBJECTIVE.search(line):
+            self._update_incumbent(match[1])
+
+            if self.optimal:
+                self._update_bound(match[1])
+
+            self.finished = True
+        elif match := _CBC_BOUND.search(line):
+            self._update_bound(match[1] or match[2])
+
+        if state == (self.incumbent, self.best_bound, self.node_count):
+            return None
+
+        return SolverProgress(
+            time=timedelta(seconds=time.monotonic() - self.start),
+            incumbent=self.incumbent,
+            best_bound=self.best_bound,
+            node_count=self.node_count,
+        )
+
+    def _update_incumbent(self, value: str) -> None:
+        objective = float(value)
+
+        if abs(objective) < _CBC_INFINITY:
+            self.incumbent = objective
+
+    def _update_bound(self, value: str) -> None:
+        bound = float(value)
+
+        if abs(bound) < _CBC_INFINITY:
+            self.best_bound = bound
+
+
+class ProgressCbcSolver(pulp.PULP_CBC_CMD):  # type: ignore[misc]
+    """The CBC solver bundled with PuLP, tracking the progress while solving.
+
+    Accepts the same arguments as `pulp.PULP_CBC_CMD` and an optional callback,
+    which is called from a background thread for every new progress entry.
+    The entries of the last solve are available in `progress`.
+    """
+
+    callback: Optional[ProgressCallback]
+    progress: SolverProgressLog
+    msg: bool
+    optionsDict: dict[str, Any]
+
+    def __init__(self, *args: Any, callback: Optional[ProgressCallback] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.callback = callback
+        self.progress = SolverProgressLog()
+
+    def solve_CBC(self, lp: LpProblem, use_mps: bool = True) -> Any:
+        """Solve the problem with CBC, following the log while the solver is running."""
+        self.progress = SolverProgressLog()
+        log_path: Optional[str] = self.optionsDict.get("logPath")
+        echo = self.msg and log_path is None
+
+        if log_path is None:
+            fd, log_path = tempfile.mkstemp(suffix=".log")
+            os.close(fd)
+        else:
+            # Create the log file before the solver does, so that it can be followed right away
+            open(log_path, "w").close()
+
+        msg = self.msg
+        options = self.optionsDict
+        # The log is redirected to the file, the lines are echoed instead if needed
+        self.msg = False
+        self.optionsDict = {**options, "logPath": log_path}
+        stop = threading.Event()
+        follower = threading.Thread(target=self._follow, args=(log_path, stop, echo), daemon=True)
+        follower.start()
+
+        try:
+            return super().solve_CBC(lp, use_mps=use_mps)
+        finally:
+            stop.set()
+            follower.join()
+            self.msg = msg
+            self.optionsDict = options
+
+            if options.get("logPath") is None:
+                os.remove(log_path)
+
+    def _follow(self, log_path: str, stop: threading.Event, echo: bool) -> None:
+        parser = CbcLogParser()
+        partial_line = ""
+
+        with open(log_path) as file:
+            while True:
+                # Check before reading, so that the rest of the log is read after the solver ended
+                stopped = stop.is_set()
+                partial_line += file.read()
+                *lines, partial_line = partial_line.split("\n")
+
+                if stopped and partial_line != "":
+                    lines.append(partial_line)
+
+                for line in lines:
+                    if echo:
+                        sys.stdout.write(line + "\n")
+
+                    progress = parser.parse_line(line)
+
+                    if progress is not None:
+                        self.progress.entries.append(progress)
+
+                        if self.callback is not None:
+                            self.callback(progress)
+
+                if stopped:
+                    return
+
+                time.sleep(_POLL_INTERVAL)
+
+
+class ProgressDirectMpsCbcSolver(ProgressCbcSolver, DirectMpsCbcSolver):
+    """The CBC solver tracking the progress, using the fast MPS export of `DirectMpsCbcSolver`.
+
+    Accepts the same arguments as `ProgressCbcSolver`.
+    """
+
+
+class SolutionExtractionProgressTask(SolutionExtractionTask[SolverProgressLog]):
+    """A task to record the progress of the solver in the step data."""
+
+    solve_settings: SolveSettings
+
+    def __init__(self, solve_settings: SolveSettings):
+        self.solve_settings = solve_settings
+
+    def extract_solution(self) -> SolverProgressLog:
+        """Copy the progress tracked by the solver.
+
+        If the solver doesn't track its progress, the log is empty.
+        """
+        progress: Optional[SolverProgressLog] = getattr(
+            self.solve_settings.solver, "progress", None
+        )
+
+        if progress is None:
+            return SolverProgressLog()
+
+        return SolverProgressLog(list(progress.entries))
+
+
+# Records the progress of the solver as `SolverProgressLog` in the step data.
+# The solver must track its progress, see `get_pulp_solver`.
+progress_module = OptimizationModule(solution_extraction=SolutionExtractionProgressTask)
@@ -0,0 +1,290 @@
+"""Re-optimize a constructed MIP after prices have changed.
+
+Prices change much more often than the structure of the problem.
+The costs don't affect which candidates are applicable or which constraints are needed,
+so the validation, pre-processing and MIP construction don't need to be repeated.
+Instead, only the coefficients of the objective are updated and the MIP is solved again,
+starting from the previous optimum.
+The only exception are CR -> CR connections that have been left out of the MIP because all of
+their location pairs were free. They are added to the MIP once one of these pairs gets a cost.
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+import numpy as np
+from optiframe import StepData
+from optiframe.framework import BuiltOptimizer
+from pulp import LpProblem
+
+from cloud_resource_matcher.modules.base import BaseData, BaseMipData, CompactBaseData
+from cloud_resource_matcher.modules.base.data import CloudResource, CloudService, Cost
+from cloud_resource_matcher.modules.multi_cloud import MultiCloudData, MultiCloudMipData
+from cloud_resource_matcher.modules.multi_cloud.data import CloudServiceProvider
+from cloud_resource_matcher.modules.network import NetworkData, NetworkMipData
+from cloud_resource_matcher.modules.network.costs import (
+    is_idle_connection,
+    network_candidate_costs,
+)
+from cloud_resource_matcher.modules.network.data import (
+    Location,
+    SparseLocationMatrix,
+    location_matrix,
+)
+from cloud_resource_matcher.modules.network.mip_construction import MipConstructionNetworkTask
+from cloud_resource_matcher.modules.performance import PerformanceData
+from cloud_resource_matcher.modules.performance.costs import performance_candidate_costs
+from cloud_resource_matcher.modules.performance.data import PerformanceCriterion
+from cloud_resource_matcher.solver import get_pulp_solver
+from cloud_resource_matcher.validation import raise_violations
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PriceUpdate:
+    """The prices that have changed since the MIP has been constructed.
+
+    Every map only needs to contain the changed entries, the other prices stay the same.
+    """
+
+    # The new base costs of the cloud services, see `BaseData.cs_to_base_cost`.
+    cs_to_base_cost: dict[CloudService, Cost] = field(default_factory=dict)
+
+    # The new performance costs, see `PerformanceData.cost_per_unit`.
+    cost_per_unit: dict[tuple[CloudService, PerformanceCriterion], Cost] = field(
+        default_factory=dict
+    )
+
+    # The new network costs, see `NetworkData.loc_and_loc_to_cost`.
+    loc_and_loc_to_cost: dict[tuple[Location, Location], Cost] = field(default_factory=dict)
+
+    # The new CSP costs, see `MultiCloudData.csp_to_cost`.
+    csp_to_cost: dict[CloudServiceProvider, Cost] = field(default_factory=dict)
+
+
+def update_prices(optimizer: BuiltOptimizer, prices: PriceUpdate) -> BuiltOptimizer:
+    """Update the prices in the data and the coefficients of the objective of the MIP.
+
+    The constraints and variables of the MIP are not changed, except for the CR -> CR
+    connections that have been left out of the MIP and now have location pairs with costs.
+
+    :param optimizer: The optimizer with the constructed MIP. It may have been solved already.
+    :param prices: The changed prices.
+    :return: The optimizer with the updated MIP.
+    The time needed for the update is reported as the time for the MIP construction.
+    :raises ValidationError: If the prices refer to unknown entities or unused modules.
+    """
+    start = datetime.now()
+    step_data = optimizer.workflow.step_data
+    validate_prices(step_data, prices)
+
+    base_data: BaseData = step_data[BaseData]
+    compact: CompactBaseData = step_data[CompactBaseData]
+    problem: LpProblem = step_data[LpProblem]
+    objective = problem.objective
+
+    base_data.cs_to_base_cost.update(prices.cs_to_base_cost)
+
+    for cs, cost in prices.cs_to_base_cost.items():
+        compact.cs_to_base_cost[compact.cs_index[cs]] = cost
+
+    if len(prices.cost_per_unit) > 0:
+        step_data[PerformanceData].cost_per_unit.update(prices.cost_per_unit)
+
+    network_data: Optional[NetworkData] = step_data.get(NetworkData)
+
+    if len(prices.loc_and_loc_to_cost) > 0 and network_data is not None:
+        if isinstance(network_data.loc_and_loc_to_cost, dict):
+            network_data.loc_and_loc_to_cost.update(prices.loc_and_loc_to_cost)
+        else:
+            # Overlay the changed costs, the matrix itself is not modified
+            network_data.loc_and_loc_to_cost = SparseLocationMatrix(
+                dict(prices.loc_and_loc_to_cost), fallback=network_data.loc_and_loc_to_cost.get
+            )
+
+    network_mip_data: Optional[NetworkMipData] = step_data.get(NetworkMipData)
+
+    if len(prices.loc_and_loc_to_cost) > 0 and network_mip_data is not None:
+        _add_paid_connections(step_data, prices)
+
+    # The costs of the candidates depend on the base, performance and network prices
+    if len(prices.cost_per_unit) > 0 or len(prices.loc_and_loc_to_cost) > 0:
+        _recompute_candidate_costs(step_data)
+
+    # The variables in candidate order, like the costs.
+    # The fixed CRs don't have a variable, their costs are the constant of the objective.
+    # The CRs of a group share the variables of the first CR of the group.
+    base_mip_data: BaseMipData = step_data[BaseMipData]
+    offsets = compact.cr_to_cs_offsets.tolist()
+    cs_indices = compact.cr_to_cs_indices.tolist()
+    costs = compact.total_candidate_costs().tolist()
+    fixed_cost = 0.0
+
+    for i, cr in enumerate(compact.cloud_resources):
+        for j in range(offsets[i], offsets[i + 1]):
+            cs = compact.cloud_services[cs_indices[j]]
+
+            if cr in base_mip_data.cr_to_fixed_cs:
+                fixed_cost += costs[j]
+            elif (cr, cs) in base_mip_data.var_cr_to_cs_matching:
+                objective[base_mip_data.var_cr_to_cs_matching[cr, cs]] = costs[j]
+            elif (cr, cs) in base_mip_data.var_cr_group_to_cs_count:
+                objective[base_mip_data.var_cr_group_to_cs_count[cr, cs]] = costs[j]
+
+    objective.constant = fixed_cost
+
+    # Pay for CR -> CR traffic
+    if len(prices.loc_and_loc_to_cost) > 0 and network_mip_data is not None:
+        assert network_data is not None
+        loc_cost = location_matrix(network_data.loc_and_loc_to_cost)
+        cs_to_loc = network_data.cs_to_loc
+
+        for (cr1, cs1, cr2, cs2), var in network_mip_data.var_cr_pair_cs_deployment.items():
+            objective[var] = (
+                base_data.cr_to_instance_demand[cr1]
+                * network_data.cr_and_cr_to_traffic[cr1, cr2]
+                * loc_cost[cs_to_loc[cs1], cs_to_loc[cs2]]
+            )
+
+        for (cr1, loc1, cr2, loc2), var in network_mip_data.var_cr_pair_loc_deployment.items():
+            objective[var] = (
+                base_data.cr_to_instance_demand[cr1]
+                * network_data.cr_and_cr_to_traffic[cr1, cr2]
+                * loc_cost[loc1, loc2]
+            )
+
+    # Add CSP cost to objective
+    if len(prices.csp_to_cost) > 0:
+        multi_cloud_data: MultiCloudData = step_data[MultiCloudData]
+        multi_cloud_data.csp_to_cost.update(prices.csp_to_cost)
+        var_csp_used = step_data[MultiCloudMipData].var_csp_used
+
+        for csp, cost in prices.csp_to_cost.items():
+            objective[var_csp_used[csp]] = cost
+
+    update_time = datetime.now() - start
+    logger.info(f"Updated the objective in {update_time.total_seconds():.2f}s")
+
+    return BuiltOptimizer(optimizer.workflow, timedelta(), timedelta(), update_time)
+
+
+def solve(optimizer: BuiltOptimizer, prices: PriceUpdate, solver: Optional[Any] = None) -> StepData:
+    """Update the prices and solve the MIP again, starting from the previous optimum.
+
+    The previous solution is still feasible, because only the objective has changed.
+
+    :param optimizer: The optimizer with the constructed MIP. It may have been solved already.
+    :param prices: The changed prices.
+    :param solver: The PuLP solver to use, with the warm start option enabled.
+    Defaults to CBC.
+    :raises ValidationError: If the prices refer to unknown entities or unused modules.
+    """
+    updated = update_prices(optimizer, prices)
+
+    # Start from the values of the previous solution, if there is one
+    for var in updated.problem().variables():
+        if var.varValue is not None:
+            var.setInitialValue(var.varValue, check=False)
+
+    if solver is None:
+        solver = get_pulp_solver(msg=False, warm_start=True)
+
+    return updated.solve(solver)
+
+
+def _recompute_candidate_costs(step_data: StepData) -> None:
+    """Recompute the costs added to the candidates during the pre-processing."""
+    compact: CompactBaseData = step_data[CompactBaseData]
+    performance_data: Optional[PerformanceData] = step_data.get(PerformanceData)
+    network_data: Optional[NetworkData] = step_data.get(NetworkData)
+
+    compact.candidate_costs = np.zeros(compact.candidate_count, dtype=np.float64)
+
+    if performance_data is not None and len(performance_data.cost_per_unit) > 0:
+        compact.add_candidate_costs(performance_candidate_costs(compact, performance_data))
+
+    if network_data is not None and len(network_data.cr_and_loc_to_traffic) > 0:
+        compact.add_candidate_costs(network_candidate_costs(compact, network_data))
+
+
+def validate_prices(step_data: StepData, prices: PriceUpdate) -> None:
+    """Make sure that the prices only refer to known entities of the used modules.
+
+    :raises ValidationError: If the prices refer to unknown entities or unused modules.
+    """
+    violations: list[str] = []
+    cloud_services = set(step_data[BaseData].cloud_services)
+
+    for cs in prices.cs_to_base_cost.keys():
+        if cs not in cloud_services:
+            violations.append(f"Base cost for unknown CS {cs}")
+
+    if len(prices.cost_per_unit) > 0:
+        performance_data: Optional[PerformanceData] = step_data.get(PerformanceData)
+
+        if performance_data is None:
+            violations.append("Performance costs are given, but the module is not used")
+        else:
+            criteria = set(performance_data.performance_criteria)
+
+            for cs, pc in prices.cost_per_unit.keys():
+                if cs not in cloud_services or pc not in criteria:
+                    violations.append(f"Performance cost for unknown CS {cs} or criterion {pc}")
+
+    if len(prices.loc_and_loc_to_cost) > 0:
+        network_data: Optional[NetworkData] = step_data.get(NetworkData)
+
+        if network_data is None:
+            violations.append("Network costs are given, but the module is not used")
+        else:
+            for loc1, loc2 in prices.loc_and_loc_to_cost.keys():
+                if loc1 not in network_data.locations or loc2 not in network_data.locations:
+                    violations.append(f"Network cost for unknown connection {loc1} -> {loc2}")
+
+    if len(prices.csp_to_cost) > 0:
+        multi_cloud_data: Optional[MultiCloudData] = step_data.get(MultiCloudData)
+
+        if multi_cloud_data is None:
+            violations.append("CSP costs are given, but the module is not used")
+        else:
+            csps = set(multi_cloud_data.cloud_service_providers)
+
+            for csp in prices.csp_to_cost.keys():
+                if csp not in csps:
+                    violations.append(f"CSP cost for unknown CSP {csp}")
+
+    raise_violations(violations)
+
+
+def _add_paid_connections(step_data: StepData, prices: PriceUpdate) -> None:
+    """Add the CR -> CR connections left out of the MIP that have to pay for their traffic now.
+
+    Connections with traffic are left out if all of their location pairs are free.
+    They are added to the MIP if one of these pairs gets a cost.
+    The network data must already contain the new prices.
+    """
+    base_data: BaseData = step_data[BaseData]
+    network_data: NetworkData = step_data[NetworkData]
+    network_mip_data: NetworkMipData = step_data[NetworkMipData]
+    paid_pairs = [pair for pair, cost in prices.loc_and_loc_to_cost.items() if cost != 0]
+    paid_connections: list[tuple[CloudResource, CloudResource]] = []
+
+    for cr1, cr2 in network_mip_data.skipped_cr_connections:
+        if is_idle_connection(network_data, cr1, cr2):
+            continue
+
+        locs1 = {network_data.cs_to_loc[cs] for cs in base_data.cr_to_cs_list[cr1]}
+        locs2 = {network_data.cs_to_loc[cs] for cs in base_data.cr_to_cs_list[cr2]}
+
+        if any(loc1 in locs1 and loc2 in locs2 for loc1, loc2 in paid_pairs):
+            paid_connections.append((cr1, cr2))
+
+    if len(paid_connections) == 0:
+        return
+
+    logger.info(f"Adding {len(paid_connections)} CR -> CR connection(s) with new costs to the MIP")
+    MipConstructionNetworkTask(
+        base_data, network_data, step_data[BaseMipData], step_data[LpProblem]
+    ).add_connections(network_mip_data, paid_connections)
@@ -0,0 +1,286 @@
+"""Solve many variations of a problem instance, e.g. for what-if pricing studies.
+
+The data of the base instance is validated, pre-processed and the MIP is constructed only once.
+Every scenario then changes the prices or the number of CSPs to use on a copy of the
+constructed MIP, which is solved in a process pool, starting from the solution of the base instance.
+The result of each scenario is written to a JSONL file as soon as it is available.
+"""
+import contextlib
+import json
+import logging
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Optional, TextIO
+
+from optiframe import InfeasibleError, SolutionObjValue, StepData
+from optiframe.framework import BuiltOptimizer, InitializedOptimizer
+from optiframe.workflow_engine.workflow import InitializedWorkflow, Workflow
+from pulp import LpProblem
+
+from cloud_resource_matcher.modules.base import BaseSolution
+from cloud_resource_matcher.modules.base.data import CloudResource, CloudService
+from cloud_resource_matcher.modules.multi_cloud import MultiCloudData, MultiCloudSolution
+from cloud_resource_matcher.modules.multi_cloud.data import CloudServiceProvider
+from cloud_resource_matcher.reoptimization import PriceUpdate, validate_prices
+from cloud_resource_matcher.reoptimization import solve as solve_with_prices
+from cloud_resource_matcher.validation import ValidationError, raise_violations, validate
+
+logger = logging.getLogger(__name__)
+
+# The name of the result of the base instance
+BASELINE_NAME = "baseline"
+
+
+@dataclass
+class Scenario:
+    """A variation of the base problem instance."""
+
+    # The unique name of the scenario
+    name: str
+
+    # The prices that differ from the base instance
+    prices: PriceUpdate = field(default_factory=PriceUpdate)
+
+    # The minimum and maximum number of CSPs to use, if they differ from the base instance.
+    # Requires the multi cloud module.
+    min_csp_count: Optional[int] = None
+    max_csp_count: Optional[int] = None
+
+
+@dataclass
+class ScenarioResult:
+    """The solution of a scenario."""
+
+    name: str
+
+    # Whether a solution has been found
+    feasible: bool
+
+    # The total cost of the solution
+    objective_value: Optional[float]
+
+    # The CSPs used by the solution, if the multi cloud module is used
+    selected_csps: Optional[list[CloudServiceProvider]]
+
+    # The CRs that are deployed on another CS than in the base instance,
+    # with the CS of the base instance and the CS of the scenario
+    changed_assignments: dict[CloudResource, tuple[Optional[CloudService], CloudService]]
+
+    # The time needed to solve the scenario
+    solve_time: timedelta
+
+    # The violations, if the scenario couldn't be applied to the constructed MIP
+    violations: list[str] = field(default_factory=list)
+
+    def to_json(self) -> dict[str, Any]:
+        """Convert the result to a JSON-serializable dictionary."""
+        return {
+            "name": self.name,
+            "feasible": self.feasible,
+            "objective_value": self.objective_value,
+            "selected_csps": self.selected_csps,
+            "changed_assignments": {
+                cr: {"from": old_cs, "to": new_cs}
+                for cr, (old_cs, new_cs) in self.changed_assignments.items()
+            },
+            "solve_time": self.solve_time.total_seconds(),
+            "violations": self.violations,
+        }
+
+
+def run_scenarios(
+    optimizer: InitializedOptimizer,
+    scenarios: list[Scenario],
+    output_path: Optional[str] = None,
+    solver: Optional[Any] = None,
+    max_workers: Optional[int] = None,
+) -> list[ScenarioResult]:
+    """Solve the base instance and every scenario.
+
+    :param optimizer: The optimizer, initialized with the base instance.
+    :param scenarios: The scenarios to solve.
+    :param output_path: The JSONL file to write the results to, one line per result.
+    The result of the base instance is written first, the scenarios in the order they finish.
+    :param solver: The PuLP solver to use. Must be picklable.
+    Defaults to CBC, starting from the solution of the base instance.
+    :param max_workers: The maximum number of processes to use.
+    If set to `1`, the scenarios are solved in the current process.
+    :return: The result of the base instance, followed by the results of the scenarios
+    in the order they have been given.
+    If a scenario can't be applied to the MIP of a worker, its violations are reported
+    in its result instead of aborting the other scenarios.
+    :raises ValidationError: If the data of any module or any scenario is not valid.
+    :raises InfeasibleError: If the base instance doesn't have a solution.
+    """
+    built = validate(optimizer).pre_processing().build_mip()
+
+    # All scenarios are validated before any of them is solved
+    _validate_scenarios(built.workflow.step_data, scenarios)
+    start = datetime.now()
+    baseline_data = built.solve(solver)
+    baseline_matching = baseline_data[BaseSolution].cr_to_cs_matching
+    baseline = _result(BASELINE_NAME, baseline_data, baseline_matching, datetime.now() - start)
+
+    # The scenarios are solved on copies of the constructed MIP
+    shared_data = pickle.dumps(
+        (built.workflow.workflow, built.workflow.step_data), protocol=pickle.HIGHEST_PROTOCOL
+    )
+    results: dict[str, ScenarioResult] = dict()
+
+    with contextlib.ExitStack() as stack:
+        output = None if output_path is None else stack.enter_context(open(output_path, "w"))
+        _write_result(output, baseline)
+
+        if max_workers == 1:
+            _init_worker(shared_data, baseline_matching, solver)
+
+            for scenario in scenarios:
+                results[scenario.name] = _solve_scenario(scenario)
+                _write_result(output, results[scenario.name])
+        else:
+            with ProcessPoolExecutor(
+                max_workers,
+                initializer=_init_worker,
+                initargs=(shared_data, baseline_matching, solver),
+            ) as executor:
+                futures = [executor.submit(_solve_scenario, scenario) for scenario in scenarios]
+
+                for future in as_completed(futures):
+                    result = future.result()
+                    results[result.name] = result
+                    _write_result(output, result)
+
+    return [baseline, *(results[scenario.name] for scenario in scenarios)]
+
+
+def _validate_scenarios(step_data: StepData, scenarios: list[Scenario]) -> None:
+    """Make sure that the scenarios have unique names, valid prices and valid CSP counts."""
+    violations: list[str] = []
+    names = {BASELINE_NAME}
+    multi_cloud_data: Optional[MultiCloudData] = step_data.get(MultiCloudData)
+
+    for scenario in scenarios:
+        if scenario.name in names:
+            violations.append(f"Scenario name {scenario.name} is not unique")
+
+        names.add(scenario.name)
+
+        try:
+            validate_prices(step_data, scenario.prices)
+        except ValidationError as error:
+            violations.extend(
+                f"Scenario {scenario.name}: {violation}" for violation in error.violations
+            )
+
+        if scenario.min_csp_count is None and scenario.max_csp_count is None:
+            continue
+
+        if multi_cloud_data is None:
+            violations.append(
+                f"Scenario {scenario.name} sets CSP counts, but the multi cloud module is not used"
+            )
+            continue
+
+        min_count = (
+            multi_cloud_data.min_csp_count
+            if scenario.min_csp_count is None
+            else scenario.min_csp_count
+        )
+        max_count = (
+            multi_cloud_data.max_csp_count
+            if scenario.max_csp_count is None
+            else scenario.max_csp_count
+        )
+
+        if not 0 <= min_count <= max_count:
+            violations.append(
+                f"Scenario {scenario.name} requires between {min_count} and {max_count} CSPs"
+            )
+
+    raise_violations(violations)
+
+
+def _write_result(output: Optional[TextIO], result: ScenarioResult) -> None:
+    logger.info(f"Solved scenario {result.name} in {result.solve_time.total_seconds():.2f}s")
+
+    if output is not None:
+        output.write(json.dumps(result.to_json()) + "\n")
+        output.flush()
+
+
+def _result(
+    name: str,
+    step_data: StepData,
+    baseline_matching: dict[CloudResource, CloudService],
+    solve_time: timedelta,
+) -> ScenarioResult:
+    matching: dict[CloudResource, CloudService] = step_data[BaseSolution].cr_to_cs_matching
+    multi_cloud_solution: Optional[MultiCloudSolution] = step_data.get(MultiCloudSolution)
+
+    return ScenarioResult(
+        name=name,
+        feasible=True,
+        objective_value=step_data[SolutionObjValue].objective_value,
+        selected_csps=None
+        if multi_cloud_solution is None
+        else sorted(multi_cloud_solution.selected_csps),
+        changed_assignments={
+            cr: (baseline_matching.get(cr), cs)
+            for cr, cs in matching.items()
+            if baseline_matching.get(cr) != cs
+        },
+        solve_time=solve_time,
+    )
+
+
+# The data shared by all scenarios solved in the current process
+_shared_data: bytes
+_baseline_matching: dict[CloudResource, CloudService]
+_solver: Optional[Any]
+
+
+def _init_worker(
+    shared_data: bytes, baseline_matching: dict[CloudResource, CloudService], solver: Optional[Any]
+) -> None:
+    global _shared_data, _baseline_matching, _solver
+    _shared_data = shared_data
+    _baseline_matching = baseline_matching
+    _solver = solver
+
+
+def _solve_scenario(scenario: Scenario) -> ScenarioResult:
+    start = datetime.now()
+    workflow: Workflow
+    step_data: StepData
+    workflow, step_data = pickle.loads(_shared_data)
+    built = BuiltOptimizer(
+        InitializedWorkflow(workflow, step_data), timedelta(), timedelta(), timedelta()
+    )
+    problem: LpProblem = step_data[LpProblem]
+
+    # The constraints are defined as `lpSum(var_csp_used) >= min_csp_count`,
+    # so the constant holds the negated count
+    if scenario.min_csp_count is not None:
+        step_data[MultiCloudData].min_csp_count = scenario.min_csp_count
+        problem.constraints["min_csp_count"].constant = -scenario.min_csp_count
+
+    if scenario.max_csp_count is not None:
+        step_data[MultiCloudData].max_csp_count = scenario.max_csp_count
+        problem.constraints["max_csp_count"].constant = -scenario.max_csp_count
+
+    try:
+        result_data = solve_with_prices(built, scenario.prices, _solver)
+    except (InfeasibleError, ValidationError) as error:
+        return ScenarioResult(
+            name=scenario.name,
+            feasible=False,
+            objective_value=None,
+            selected_csps=None,
+            changed_assignments=dict(),
+            solve_time=datetime.now() - start,
+            violations=error.violations if isinstance(error, ValidationError) else [],
+        )
+
+    return _result(scenario.name, result_data, _baseline_matching, datetime.now() - start)
@@ -0,0 +1,147 @@
+"""A fast path for problem instances where the cloud resources are not coupled.
+
+Without constraints or costs spanning multiple CRs, the problem splits per CR:
+Each CR is simply deployed on the applicable CS with the lowest cost.
+In that case, the MIP doesn't need to be constructed and solved at all.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+import numpy as np
+import numpy.typing as npt
+from optiframe import InfeasibleError, ModelSize, SolutionObjValue, StepData, StepTimes
+from optiframe.framework import InitializedOptimizer
+from optiframe.framework.default_tasks import CreateProblemTask, SolutionObjValueExtractionTask
+
+from cloud_resource_matcher.modules.base import BaseSolution, CompactBaseData
+from cloud_resource_matcher.modules.base.mip_construction import MipConstructionBaseTask
+from cloud_resource_matcher.modules.base.solution_extraction import (
+    CrToCsMatching,
+    ServiceInstanceCount,
+    SolutionExtractionBaseTask,
+)
+from cloud_resource_matcher.modules.network import NetworkData
+from cloud_resource_matcher.modules.network.costs import is_idle_connection
+from cloud_resource_matcher.modules.network.mip_construction import MipConstructionNetworkTask
+from cloud_resource_matcher.validation import validate
+
+# The MIP construction tasks that only add costs per CR-CS pair.
+# Every other task (e.g. of the multi cloud or service limits module) couples the CRs.
+SEPARABLE_MIP_CONSTRUCTION_TASKS = {
+    CreateProblemTask,
+    MipConstructionBaseTask,
+    MipConstructionNetworkTask,
+}
+
+# The solution extraction tasks that can be served by the fast path.
+SEPARABLE_SOLUTION_EXTRACTION_TASKS = {SolutionObjValueExtractionTask, SolutionExtractionBaseTask}
+
+
+def is_separable(optimizer: InitializedOptimizer) -> bool:
+    """Determine if the problem instance can be solved without a MIP.
+
+    This is the case if only the base, performance and network modules are used
+    and the CR -> CR connections are idle, i.e. they have neither traffic nor a maximum latency.
+    """
+    for step in optimizer.workflow.workflow.steps:
+        if step.name == "mip_construction":
+            allowed_tasks: set[Any] = SEPARABLE_MIP_CONSTRUCTION_TASKS
+        elif step.name == "solution_extraction":
+            allowed_tasks = SEPARABLE_SOLUTION_EXTRACTION_TASKS
+        else:
+            continue
+
+        if any(task not in allowed_tasks for task in step.tasks):
+            return False
+
+    network_data: Optional[NetworkData] = optimizer.workflow.step_data.get(NetworkData)
+
+    # Idle connections are left out of the MIP, so they don't couple the CRs
+    if network_data is not None and not all(
+        is_idle_connection(network_data, cr1, cr2) for cr1, cr2 in network_data.cr_and_cr_to_traffic
+    ):
+        return False
+
+    return True
+
+
+def solve(optimizer: InitializedOptimizer, solver: Optional[Any] = None) -> StepData:
+    """Solve the problem, skipping the MIP if the problem is separable.
+
+    If the problem is not separable, the MIP is constructed and solved as usual.
+    The returned data contains the same solution data in both cases.
+
+    :param optimizer: The optimizer, initialized with the problem instance.
+    :param solver: The PuLP solver to use if the MIP has to be solved.
+    :raises ValidationError: If the data of any module is not valid.
+    :raises InfeasibleError: If a CR does not have any applicable CS.
+    """
+    separable = is_separable(optimizer)
+    pre_processed = validate(optimizer).pre_processing()
+
+    if not separable:
+        return pre_processed.build_mip().solve(solver)
+
+    start = datetime.now()
+    step_data = pre_processed.workflow.step_data
+    compact: CompactBaseData = step_data[CompactBaseData]
+    compact.apply_candidate_mask()
+
+    base_solution, objective_value = solve_separable(compact, compact.total_candidate_costs())
+
+    step_data[BaseSolution] = base_solution
+    step_data[SolutionObjValue] = SolutionObjValue(objective_value)
+    step_data[StepTimes] = StepTimes(
+        validate=pre_processed.validate_time,
+        pre_processing=pre_processed.pre_processing_time,
+        build_mip=timedelta(),
+        solve=datetime.now() - start,
+        extract_solution=timedelta(),
+    )
+    # No MIP has been constructed
+    step_data[ModelSize] = ModelSize(variable_count=0, constraint_count=0)
+
+    return step_data
+
+
+def solve_separable(
+    compact_base_data: CompactBaseData, costs: npt.NDArray[np.float64]
+) -> tuple[BaseSolution, float]:
+    """Deploy every CR on its cheapest applicable CS.
+
+    :param compact_base_data: The pre-processed base data.
+    :param costs: The total cost of every candidate.
+    :return: The solution and its total cost.
+    :raises InfeasibleError: If a CR does not have any applicable CS.
+    """
+    compact = compact_base_data
+    candidate_counts = np.diff(compact.cr_to_cs_offsets)
+
+    if np.any(candidate_counts == 0):
+        raise InfeasibleError()
+
+    # Sort the candidates by CR first and by cost second.
+    # The sort is stable, so ties are broken by the order of the candidates.
+    # The first candidate of each CR is then the cheapest one.
+    order = np.lexsort((costs, compact.candidate_crs()))
+    chosen = order[compact.cr_to_cs_offsets[:-1]]
+    chosen_cs = compact.cr_to_cs_indices[chosen]
+
+    cr_to_cs_matching: CrToCsMatching = {
+        cr: compact.cloud_services[cs]
+        for cr, cs in zip(compact.cloud_resources, chosen_cs.tolist())
+    }
+
+    instance_count = np.bincount(
+        chosen_cs, weights=compact.cr_to_instance_demand, minlength=len(compact.cloud_services)
+    )
+    cs_instance_count: ServiceInstanceCount = {
+        compact.cloud_services[cs]: int(count)
+        for cs, count in enumerate(instance_count.tolist())
+        if count >= 1
+    }
+
+    return (
+        BaseSolution(cr_to_cs_matching=cr_to_cs_matching, cs_instance_count=cs_instance_count),
+        float(costs[chosen].sum()),
+    )
@@ -0,0 +1,236 @@
+"""A cache of the solutions of repeated identical optimization requests.
+
+The cache sits in front of the whole pipeline: If the same problem instance has already
+been solved with the same modules and solver parameters, the stored solution is returned
+without validating the data, constructing the MIP or calling the solver.
+
+The entries are kept in memory and optionally on disk, where they can be shared by
+multiple processes. Both tiers evict expired entries and the least recently used ones.
+Only proven optimal solutions are stored, solutions of runs that have been stopped
+early (e.g. by the time limit) are never served from the cache.
+"""
+import copy
+import logging
+import os
+import pickle
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from optiframe import SolutionObjValue, StepData
+from optiframe.framework import InitializedOptimizer
+from pulp import LpProblem, LpSolutionOptimal
+
+from cloud_resource_matcher.model_cache import (
+    entry_paths,
+    evict_entries,
+    fingerprint,
+    write_entry,
+)
+from cloud_resource_matcher.modules.base import BaseSolution
+from cloud_resource_matcher.modules.multi_cloud import MultiCloudSolution
+from cloud_resource_matcher.validation import validate
+
+logger = logging.getLogger(__name__)
+
+# The data of the solution that is stored in the cache
+CACHED_SOLUTION_TYPES = (BaseSolution, MultiCloudSolution, SolutionObjValue)
+
+# The file extension of the entries on disk
+_ENTRY_EXTENSION = ".solution"
+
+# The options of the solvers that don't change the solution
+_IGNORED_SOLVER_OPTIONS = {"logPath", "keepFiles"}
+
+
+@dataclass
+class SolutionCacheStats:
+    """The usage of the solution cache for an optimization request."""
+
+    # The tier the solution has been served from ("memory" or "disk"), `None` on a miss
+    tier: Optional[str]
+    # Whether the solution has been stored in the cache
+    stored: bool
+    # The time needed to look up the solution
+    lookup_time: timedelta
+
+
+@dataclass
+class _Entry:
+    """A cached solution."""
+
+    # The time the entry has been created, in seconds since the epoch
+    created_at: float
+    # The solution data by its type
+    solution: StepData
+
+
+def solver_parameters(solver: Optional[Any]) -> Any:
+    """Determine the parameters of a PuLP solver that can change the solution.
+
+    These are the solver itself, the time limit and the options like the cost gaps
+    that have been set with `get_pulp_solver`.
+
+    :param solver: The PuLP solver. `None` stands for the default solver.
+    :return: A value that can be included in a fingerprint.
+    """
+    if solver is None:
+        return None
+
+    options = {
+        name: value
+        for name, value in getattr(solver, "optionsDict", dict()).items()
+        if name not in _IGNORED_SOLVER_OPTIONS
+    }
+
+    return (
+        f"{type(solver).__module__}.{type(solver).__qualname__}",
+        getattr(solver, "mip", True),
+        getattr(solver, "timeLimit", None),
+        options,
+        list(getattr(solver, "options", [])),
+    )
+
+
+class SolutionCache:
+    """A cache of the solutions of optimization requests, in memory and optionally on disk."""
+
+    max_entries: int
+    ttl: Optional[timedelta]
+    directory: Optional[str]
+    max_size: int
+    hits: int
+    misses: int
+    _memory: OrderedDict[str, _Entry]
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl: Optional[timedelta] = None,
+        directory: Optional[str] = None,
+        max_size: int = 100 * 1024**2,
+    ):
+        """Create a new solution cache.
+
+        :param max_entries: The maximum number of entries kept in memory.
+        :param ttl: The time after which entries expire. If `None`, they never expire.
+        :param directory: The directory to store the entries on disk.
+        If `None`, the entries are only kept in memory.
+        :param max_size: The maximum total size of the entries on disk in bytes.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def solve(self, optimizer: InitializedOptimizer, solver: Optional[Any] = None) -> StepData:
+        """Solve the problem instance or return the cached solution.
+
+        On a cache hit, the returned data only contains the `BaseSolution`,
+        the `MultiCloudSolution` (if the multi cloud module is used), the `SolutionObjValue`
+        and the `SolutionCacheStats`.
+        On a miss, the problem is solved as usual and the solution is stored if it is optimal.
+
+        :param optimizer: The optimizer, initialized with the problem instance.
+        :param solver: The PuLP solver to use.
+        :raises ValidationError: If the data of any module is not valid.
+        """
+        start = datetime.now()
+        key = fingerprint(optimizer, solver_parameters(solver))
+        tier, entry = self._lookup(key)
+        lookup_time = datetime.now() - start
+
+        if entry is not None:
+            self.hits += 1
+            logger.info(f"Found the solution in the {tier} cache")
+
+            result = copy.deepcopy(entry.solution)
+            result[SolutionCacheStats] = SolutionCacheStats(tier, False, lookup_time)
+            return result
+
+        self.misses += 1
+        result = validate(optimizer).pre_processing().build_mip().solve(solver)
+
+        # The solver might have stopped early, e.g. because of the time limit
+        stored = result[LpProblem].sol_status == LpSolutionOptimal
+
+        if stored:
+            solution = {
+                data_type: copy.deepcopy(result[data_type])
+                for data_type in CACHED_SOLUTION_TYPES
+                if data_type in result
+            }
+            self._store(key, _Entry(time.time(), solution))
+        else:
+            logger.info("Not caching the solution, because it is not proven to be optimal")
+
+        result[SolutionCacheStats] = SolutionCacheStats(None, stored, lookup_time)
+        return result
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers."""
+        self._memory.clear()
+
+        if self.directory is not None:
+            for path in entry_paths(self.directory, _ENTRY_EXTENSION):
+                os.remove(path)
+
+    def _is_expired(self, entry: _Entry) -> bool:
+        return self.ttl is not None and time.time() - entry.created_at >= self.ttl.total_seconds()
+
+    def _lookup(self, key: str) -> tuple[Optional[str], Optional[_Entry]]:
+        entry = self._memory.get(key)
+
+        if entry is not None:
+            if not self._is_expired(entry):
+                self._memory.move_to_end(key)
+                return "memory", entry
+
+            del self._memory[key]
+
+        if self.directory is None:
+            return None, None
+
+        path = os.path.join(self.directory, key + _ENTRY_EXTENSION)
+
+        try:
+            with open(path, "rb") as file:
+                entry = pickle.load(file)
+        except FileNotFoundError:
+            return None, None
+
+        if self._is_expired(entry):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+            return None, None
+
+        # Mark the entry as recently used
+        os.utime(path)
+        self._store_in_memory(key, entry)
+
+        return "disk", entry
+
+    def _store(self, key: str, entry: _Entry) -> None:
+        self._store_in_memory(key, entry)
+
+        if self.directory is not None:
+            write_entry(os.path.join(self.directory, key + _ENTRY_EXTENSION), entry)
+            evict_entries(self.directory, _ENTRY_EXTENSION, self.max_size)
+
+    def _store_in_memory(self, key: str, entry: _Entry) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
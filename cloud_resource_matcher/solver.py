@@ -7,6 +7,12 @@ from typing import Any, Optional
 import pulp
 
 from cloud_resource_matcher.modules.base.data import Cost
+from cloud_resource_matcher.mps import DirectMpsCbcSolver
+from cloud_resource_matcher.progress import (
+    ProgressCallback,
+    ProgressCbcSolver,
+    ProgressDirectMpsCbcSolver,
+)
 
 
 class Solver(Enum):
@@ -30,28 +36,64 @@ class Solver(Enum):
     FSCIP = 3
 
 
+# The SCIP settings to find good solutions quickly
+SCIP_AGGRESSIVE_OPTIONS = [
+    "set presolving emphasis aggressive",
+    "set heuristics emphasis aggressive",
+]
+
+
 def get_pulp_solver(
     solver: Solver = Solver.CBC,
     time_limit: Optional[timedelta] = None,
     cost_gap_abs: Optional[Cost] = None,
     cost_gap_rel: Optional[float] = None,
     msg: bool = True,
+    warm_start: bool = False,
+    track_progress: bool = False,
+    on_progress: Optional[ProgressCallback] = None,
+    direct_mps: bool = False,
 ) -> Any:
-    """Get the corresponding pulp solver for the solver type."""
+    """Get the corresponding pulp solver for the solver type.
+
+    :param warm_start: Start from the initial values of the variables.
+    Only supported by CBC and Gurobi.
+    :param track_progress: Parse the log of the solver while it is running.
+    The progress is available in the `progress` attribute of the solver
+    and can be added to the step data with the `progress_module`.
+    Only supported by CBC.
+    :param on_progress: A function to call for every new progress entry.
+    Implies `track_progress`.
+    :param direct_mps: Export the model with the fast MPS writer of `DirectMpsCbcSolver`
+    instead of the export of PuLP.
+    Only supported by CBC.
+    """
     time_limit_sec = None if time_limit is None else time_limit.total_seconds()
 
     base_params = dict(timeLimit=time_limit_sec, gapAbs=cost_gap_abs, gapRel=cost_gap_rel, msg=msg)
 
+    if warm_start and solver not in (Solver.CBC, Solver.GUROBI):
+        raise RuntimeError(f"Solver '{solver}' doesn't support warm starts")
+
+    if (track_progress or on_progress is not None) and solver != Solver.CBC:
+        raise RuntimeError(f"Solver '{solver}' doesn't support tracking the progress")
+
+    if direct_mps and solver != Solver.CBC:
+        raise RuntimeError(f"Solver '{solver}' doesn't support the direct MPS export")
+
     if solver == Solver.CBC:
-        return pulp.PULP_CBC_CMD(**base_params)
+        if track_progress or on_progress is not None:
+            progress_solver = ProgressDirectMpsCbcSolver if direct_mps else ProgressCbcSolver
+            return progress_solver(**base_params, warmStart=warm_start, callback=on_progress)
+
+        if direct_mps:
+            return DirectMpsCbcSolver(**base_params, warmStart=warm_start)
+
+        return pulp.PULP_CBC_CMD(**base_params, warmStart=warm_start)
     elif solver == Solver.GUROBI:
-        return pulp.GUROBI_CMD(**base_params)
+        return pulp.GUROBI_CMD(**base_params, warmStart=warm_start)
     elif solver == Solver.SCIP:
-        scip_options = [
-            "set presolving emphasis aggressive",
-            "set heuristics emphasis aggressive",
-        ]
-        return pulp.SCIP_CMD(**base_params, options=scip_options)
+        return pulp.SCIP_CMD(**base_params, options=SCIP_AGGRESSIVE_OPTIONS)
     elif solver == Solver.FSCIP:
         return pulp.FSCIP_CMD(**base_params)
     else:
@@ -0,0 +1,90 @@
+"""A validation layer that reports all violations of all modules at once.
+
+The validation tasks of the modules collect every violation they find in one pass
+and raise a single `ValidationError` listing all of them.
+`validate` additionally runs every validation task even if another one fails
+and records the time needed for each of them.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from optiframe.framework import InitializedOptimizer, ValidatedOptimizer
+from optiframe.workflow_engine import Step
+
+logger = logging.getLogger(__name__)
+
+# The maximum number of violations to include in the error message.
+# All violations are still available in `ValidationError.violations`.
+MAX_REPORTED_VIOLATIONS = 20
+
+
+class ValidationError(AssertionError):
+    """The data of the problem instance is not valid.
+
+    Contains all violations that have been found, not only the first one.
+    """
+
+    violations: list[str]
+
+    def __init__(self, violations: list[str]):
+        self.violations = violations
+
+        reported = "\n".join(f"- {violation}" for violation in violations[:MAX_REPORTED_VIOLATIONS])
+        remaining = len(violations) - MAX_REPORTED_VIOLATIONS
+        more = f"\n- ... and {remaining} more" if remaining > 0 else ""
+
+        super().__init__(f"Found {len(violations)} violation(s):\n{reported}{more}")
+
+
+def raise_violations(violations: list[str]) -> None:
+    """Raise a `ValidationError` if any violations have been found.
+
+    :raises ValidationError: If the list of violations is not empty.
+    """
+    if len(violations) > 0:
+        raise ValidationError(violations)
+
+
+@dataclass
+class ValidationTimes:
+    """The time needed to validate the data of each module."""
+
+    # A map from the name of each validation task to the time it needed.
+    task_times: dict[str, timedelta]
+
+
+def validate(optimizer: InitializedOptimizer) -> ValidatedOptimizer:
+    """Validate the data of all modules.
+
+    In contrast to `InitializedOptimizer.validate`, all validation tasks are executed,
+    even if one of them fails, so that all violations are reported at once.
+    The time needed by each task is added to the step data as `ValidationTimes`.
+
+    :raises ValidationError: If the data of any module is not valid.
+    """
+    workflow = optimizer.workflow
+    validation_step = next(step for step in workflow.workflow.steps if step.name == "validation")
+
+    violations: list[str] = []
+    task_times: dict[str, timedelta] = dict()
+    start = datetime.now()
+
+    for task in validation_step.tasks:
+        task_start = datetime.now()
+
+        try:
+            Step(validation_step.name).add_tasks(task).initialize(workflow.step_data).execute()
+        except ValidationError as error:
+            violations.extend(error.violations)
+        except AssertionError as error:
+            violations.append(str(error))
+
+        task_times[task.__name__] = datetime.now() - task_start
+        logger.info(f"Executed {task.__name__} in {task_times[task.__name__].total_seconds():.2f}s")
+
+    validate_time = datetime.now() - start
+    workflow.add_data(ValidationTimes(task_times))
+    raise_violations(violations)
+
+    return ValidatedOptimizer(workflow, validate_time)
@@ -0,0 +1,141 @@
+"""Re-optimize a problem instance starting from a previous solution.
+
+The previous solution is used as the initial values of the MIP variables,
+so that the solver starts with a good incumbent instead of from scratch.
+Assignments that are no longer possible, e.g. because the CS has been pruned
+in the pre-processing, are repaired by choosing the cheapest applicable CS instead.
+"""
+import logging
+from typing import Any, Optional
+
+import numpy as np
+from optiframe import StepData
+from optiframe.framework import BuiltOptimizer, InitializedOptimizer
+
+from cloud_resource_matcher.modules.base import BaseMipData, BaseSolution, CompactBaseData
+from cloud_resource_matcher.modules.base.data import CloudResource, CloudService
+from cloud_resource_matcher.modules.multi_cloud import (
+    MultiCloudData,
+    MultiCloudMipData,
+    MultiCloudSolution,
+)
+from cloud_resource_matcher.modules.network import NetworkData, NetworkMipData
+from cloud_resource_matcher.solver import get_pulp_solver
+from cloud_resource_matcher.validation import validate
+
+logger = logging.getLogger(__name__)
+
+
+def set_initial_values(
+    optimizer: BuiltOptimizer,
+    base_solution: BaseSolution,
+    multi_cloud_solution: Optional[MultiCloudSolution] = None,
+) -> int:
+    """Set the initial values of the MIP variables from a previous solution.
+
+    If the previous CS of a CR isn't applicable anymore, the cheapest applicable CS is used.
+    If the selected CSPs are given, CSs of these CSPs are preferred for the repair.
+
+    :param optimizer: The optimizer with the constructed MIP.
+    :param base_solution: The previous solution.
+    :param multi_cloud_solution: The CSPs selected in the previous solution.
+    :return: The number of CRs with repaired assignments.
+    """
+    step_data = optimizer.workflow.step_data
+    compact: CompactBaseData = step_data[CompactBaseData]
+    base_mip_data: BaseMipData = step_data[BaseMipData]
+    multi_cloud_data: Optional[MultiCloudData] = step_data.get(MultiCloudData)
+
+    preferred_css: Optional[set[CloudService]] = None
+
+    if multi_cloud_solution is not None and multi_cloud_data is not None:
+        preferred_css = {
+            cs
+            for csp in multi_cloud_solution.selected_csps
+            for cs in multi_cloud_data.csp_to_cs_list[csp]
+        }
+
+    costs = compact.total_candidate_costs()
+    offsets = compact.cr_to_cs_offsets.tolist()
+    matching: dict[CloudResource, CloudService] = dict()
+    repaired_count = 0
+
+    for i, cr in enumerate(compact.cloud_resources):
+        candidates = [compact.cloud_services[cs] for cs in compact.candidates(i).tolist()]
+        previous_cs = base_solution.cr_to_cs_matching.get(cr)
+
+        if previous_cs is not None and previous_cs in candidates:
+            matching[cr] = previous_cs
+            continue
+
+        if len(candidates) == 0:
+            continue
+
+        order = np.argsort(costs[offsets[i] : offsets[i + 1]], kind="stable").tolist()
+        repaired = [candidates[j] for j in order]
+
+        if preferred_css is not None:
+            repaired = [cs for cs in repaired if cs in preferred_css] or repaired
+
+        matching[cr] = repaired[0]
+        repaired_count += 1
+
+    for (cr, cs), var in base_mip_data.var_cr_to_cs_matching.items():
+        var.setInitialValue(1 if matching.get(cr) == cs else 0)
+
+    for (first_cr, cs), var in base_mip_data.var_cr_group_to_cs_count.items():
+        group = base_mip_data.cr_groups[first_cr]
+        var.setInitialValue(sum(1 for cr in group if matching.get(cr) == cs))
+
+    network_mip_data: Optional[NetworkMipData] = step_data.get(NetworkMipData)
+
+    if network_mip_data is not None:
+        network_data: NetworkData = step_data[NetworkData]
+        cr_to_loc = {cr: network_data.cs_to_loc[cs] for cr, cs in matching.items()}
+
+        for (cr1, cs1, cr2, cs2), var in network_mip_data.var_cr_pair_cs_deployment.items():
+            var.setInitialValue(1 if matching.get(cr1) == cs1 and matching.get(cr2) == cs2 else 0)
+
+        for (cr1, loc1, cr2, loc2), var in network_mip_data.var_cr_pair_loc_deployment.items():
+            var.setInitialValue(
+                1 if cr_to_loc.get(cr1) == loc1 and cr_to_loc.get(cr2) == loc2 else 0
+            )
+
+    multi_cloud_mip_data: Optional[MultiCloudMipData] = step_data.get(MultiCloudMipData)
+
+    if multi_cloud_mip_data is not None and multi_cloud_data is not None:
+        # The CSP usage must be consistent with the assignments, even if they have been repaired
+        used_css = set(matching.values())
+
+        for csp, var in multi_cloud_mip_data.var_csp_used.items():
+            used = any(cs in used_css for cs in multi_cloud_data.csp_to_cs_list[csp])
+            var.setInitialValue(1 if used else 0)
+
+    if repaired_count > 0:
+        logger.info(f"Repaired the initial assignment of {repaired_count} CR(s)")
+
+    return repaired_count
+
+
+def solve(
+    optimizer: InitializedOptimizer,
+    base_solution: BaseSolution,
+    multi_cloud_solution: Optional[MultiCloudSolution] = None,
+    solver: Optional[Any] = None,
+) -> StepData:
+    """Solve the problem, starting from a previous solution.
+
+    :param optimizer: The optimizer, initialized with the problem instance.
+    :param base_solution: The previous solution.
+    :param multi_cloud_solution: The CSPs selected in the previous solution.
+    :param solver: The PuLP solver to use, with the warm start option enabled.
+    Defaults to CBC.
+    :raises ValidationError: If the data of any module is not valid.
+    """
+    built = validate(optimizer).pre_processing().build_mip()
+    set_initial_values(built, base_solution, multi_cloud_solution)
+
+    if solver is None:
+        solver = get_pulp_solver(msg=False, warm_start=True)
+
+    return built.solve(solver)
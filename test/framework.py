@@ -29,7 +29,9 @@ class SolveSolution:
 class Expect:
     """Create a test for the given optimizer instance."""
 
-    _optimizer: BuiltOptimizer
+    _optimizer: Optional[BuiltOptimizer]
+    # The infeasibility detected before solving, e.g. during the pre-processing
+    _infeasible_error: Optional[InfeasibleError]
 
     _variables: set[str]
     _variables_exclusive: bool = False
@@ -37,12 +39,25 @@ class Expect:
     _fixed_variable_values: dict[str, float]
 
     def __init__(self, optimizer: InitializedOptimizer):
-        self._optimizer = optimizer.validate().pre_processing().build_mip()
+        try:
+            self._optimizer = optimizer.validate().pre_processing().build_mip()
+            self._infeasible_error = None
+        except InfeasibleError as error:
+            self._optimizer = None
+            self._infeasible_error = error
+
         self._variables = set()
         self._fixed_variable_values = dict()
 
+    def _built(self) -> BuiltOptimizer:
+        if self._optimizer is None:
+            assert self._infeasible_error is not None
+            raise self._infeasible_error
+
+        return self._optimizer
+
     def _problem(self) -> LpProblem:
-        return self._optimizer.problem()
+        return self._built().problem()
 
     def _with_variables(self, variables: Iterable[str], *, exclusive: bool = False) -> Self:
         """Enforce that the model contains the given variables.
@@ -111,7 +126,7 @@ class _ExpectResult:
         return self._expect._problem()
 
     def _solve(self) -> SolveSolution:
-        data = self._expect._optimizer.print_mip_and_solve()
+        data = self._expect._built().print_mip_and_solve()
         return SolveSolution(cost=data[SolutionObjValue].objective_value, base=data[BaseSolution])
 
     def _fix_variable_values(self) -> None:
@@ -146,6 +161,10 @@ class _ExpectInfeasible(_ExpectResult):
         super(_ExpectInfeasible, self).__init__(expect)
 
     def test(self) -> None:
+        # The infeasibility has already been detected before solving
+        if self._expect._infeasible_error is not None:
+            return
+
         super(_ExpectInfeasible, self).test()
 
         try:
@@ -270,4 +289,4 @@ class _ExpectFeasible(_ExpectResult):
 
     def _print_model(self, line_limit: int = 100) -> None:
         """Print out the LP model to debug infeasible problems."""
-        print(self._expect._optimizer.get_lp_string(line_limit=line_limit))
+        print(self._expect._built().get_lp_string(line_limit=line_limit))
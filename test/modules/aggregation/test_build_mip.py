@@ -0,0 +1,192 @@
+"""Tests for the build MIP step of the aggregation module."""
+from test.framework import Expect
+
+import pytest
+from optiframe import OptimizationModule, Optimizer, SolutionObjValue
+from pulp import LpMinimize
+
+from cloud_resource_matcher.modules.aggregation import aggregation_module
+from cloud_resource_matcher.modules.base import BaseData, BaseSolution, base_module
+from cloud_resource_matcher.modules.multi_cloud import MultiCloudData, multi_cloud_module
+from cloud_resource_matcher.modules.network import NetworkData, network_module
+from cloud_resource_matcher.modules.performance import PerformanceData, performance_module
+from cloud_resource_matcher.modules.service_limits import ServiceLimitsData, service_limits_module
+
+CLOUD_RESOURCES = ["cr_0", "cr_1", "cr_2", "cr_3"]
+
+
+def _base_data() -> BaseData:
+    return BaseData(
+        cloud_resources=CLOUD_RESOURCES,
+        cloud_services=["cs_0", "cs_1", "cs_2"],
+        cr_to_cs_list={cr: ["cs_0", "cs_1", "cs_2"] for cr in CLOUD_RESOURCES},
+        cs_to_base_cost={"cs_0": 1, "cs_1": 2, "cs_2": 3},
+        cr_to_instance_demand={cr: 2 for cr in CLOUD_RESOURCES},
+    )
+
+
+def _performance_data() -> PerformanceData:
+    # cr_3 needs more vCPUs than cs_0 supplies
+    return PerformanceData(
+        performance_criteria=["vCPUs"],
+        performance_demand={**{(cr, "vCPUs"): 1 for cr in CLOUD_RESOURCES}, ("cr_3", "vCPUs"): 2},
+        performance_supply={("cs_0", "vCPUs"): 1, ("cs_1", "vCPUs"): 2, ("cs_2", "vCPUs"): 2},
+        cost_per_unit={},
+    )
+
+
+def test_should_aggregate_equivalent_crs() -> None:
+    """Equivalent CRs share integer variables, the others keep their binary variables."""
+    optimizer = (
+        Optimizer("test_aggregation", sense=LpMinimize)
+        .add_modules(base_module, performance_module, aggregation_module)
+        .initialize(_base_data(), _performance_data())
+    )
+
+    Expect(optimizer).to_be_feasible().with_cost(3 * 2 * 1 + 2 * 2).with_variables(
+        [
+            "cr_group_to_cs_count(cr_0,cs_0)",
+            "cr_group_to_cs_count(cr_0,cs_1)",
+            "cr_group_to_cs_count(cr_0,cs_2)",
+            "cr_to_cs_matching(cr_3,cs_1)",
+            "cr_to_cs_matching(cr_3,cs_2)",
+        ],
+        exclusive=True,
+    ).with_cr_to_cs_matching(
+        {"cr_0": "cs_0", "cr_1": "cs_0", "cr_2": "cs_0", "cr_3": "cs_1"}
+    ).with_cs_instance_count(
+        {"cs_0": 6, "cs_1": 2}
+    ).test()
+
+
+def test_should_respect_service_limits_of_groups() -> None:
+    """The CRs of a group are split across CSs if a limit is reached."""
+    optimizer = (
+        Optimizer("test_aggregation", sense=LpMinimize)
+        .add_modules(base_module, service_limits_module, aggregation_module)
+        .initialize(
+            _base_data(),
+            ServiceLimitsData(
+                cs_to_instance_limit={"cs_0": 2},
+                cr_to_max_instance_demand={cr: 1 for cr in CLOUD_RESOURCES},
+            ),
+        )
+    )
+
+    Expect(optimizer).to_be_feasible().with_cost(2 * 2 * 1 + 2 * 2 * 2).with_variables(
+        [
+            "cr_group_to_cs_count(cr_0,cs_0)",
+            "cr_group_to_cs_count(cr_0,cs_1)",
+            "cr_group_to_cs_count(cr_0,cs_2)",
+        ],
+        exclusive=True,
+    ).with_cr_to_cs_matching(
+        {"cr_0": "cs_0", "cr_1": "cs_0", "cr_2": "cs_1", "cr_3": "cs_1"}
+    ).with_cs_instance_count(
+        {"cs_0": 4, "cs_1": 4}
+    ).test()
+
+
+def test_should_not_aggregate_distinguished_crs() -> None:
+    """CRs with different maximum instance demands or CR -> CR connections are not aggregated."""
+    locations = {"loc_0"}
+    optimizer = (
+        Optimizer("test_aggregation", sense=LpMinimize)
+        .add_modules(base_module, network_module, service_limits_module, aggregation_module)
+        .initialize(
+            _base_data(),
+            NetworkData(
+                locations=locations,
+                loc_and_loc_to_latency={("loc_0", "loc_0"): 0},
+                cs_to_loc={"cs_0": "loc_0", "cs_1": "loc_0", "cs_2": "loc_0"},
+                cr_and_loc_to_traffic={},
+                cr_and_loc_to_max_latency={},
+                cr_and_cr_to_traffic={("cr_0", "cr_1"): 1},
+                cr_and_cr_to_max_latency={},
+                loc_and_loc_to_cost={("loc_0", "loc_0"): 0},
+            ),
+            ServiceLimitsData(
+                cs_to_instance_limit={},
+                cr_to_max_instance_demand={"cr_0": 1, "cr_1": 1, "cr_2": 1, "cr_3": 2},
+            ),
+        )
+    )
+
+    Expect(optimizer).to_be_feasible().with_cost(4 * 2 * 1).with_variables(
+        [f"cr_to_cs_matching({cr},cs_0)" for cr in CLOUD_RESOURCES]
+    ).test()
+
+
+def test_should_not_aggregate_crs_with_different_location_traffic() -> None:
+    """The traffic of cr_0 is free for now, but its costs change with the network prices."""
+    optimizer = (
+        Optimizer("test_aggregation", sense=LpMinimize)
+        .add_modules(base_module, network_module, aggregation_module)
+        .initialize(
+            _base_data(),
+            NetworkData(
+                locations={"loc_0"},
+                loc_and_loc_to_latency={("loc_0", "loc_0"): 0},
+                cs_to_loc={"cs_0": "loc_0", "cs_1": "loc_0", "cs_2": "loc_0"},
+                cr_and_loc_to_traffic={("cr_0", "loc_0"): 5, ("cr_1", "loc_0"): 0},
+                cr_and_loc_to_max_latency={},
+                cr_and_cr_to_traffic={},
+                cr_and_cr_to_max_latency={},
+                loc_and_loc_to_cost={("loc_0", "loc_0"): 0},
+            ),
+        )
+    )
+
+    Expect(optimizer).to_be_feasible().with_cost(4 * 2 * 1).with_variables(
+        [
+            "cr_group_to_cs_count(cr_1,cs_0)",
+            "cr_group_to_cs_count(cr_1,cs_1)",
+            "cr_group_to_cs_count(cr_1,cs_2)",
+            "cr_to_cs_matching(cr_0,cs_0)",
+            "cr_to_cs_matching(cr_0,cs_1)",
+            "cr_to_cs_matching(cr_0,cs_2)",
+        ],
+        exclusive=True,
+    ).test()
+
+
+def test_should_have_same_cost_with_aggregated_crs() -> None:
+    """Aggregating the CRs doesn't change the optimal cost of the multi cloud module."""
+
+    def solve(*modules: OptimizationModule) -> tuple[float, BaseSolution]:
+        optimizer = (
+            Optimizer("test_aggregation", sense=LpMinimize)
+            .add_modules(base_module, performance_module, multi_cloud_module, *modules)
+            .initialize(
+                _base_data(),
+                _performance_data(),
+                MultiCloudData(
+                    cloud_service_providers=["csp_0", "csp_1"],
+                    csp_to_cs_list={"csp_0": ["cs_0"], "csp_1": ["cs_1", "cs_2"]},
+                    min_csp_count=1,
+                    max_csp_count=1,
+                    csp_to_cost={"csp_0": 0, "csp_1": 1},
+                ),
+            )
+        )
+        result = optimizer.solve()
+        return result[SolutionObjValue].objective_value, result[BaseSolution]
+
+    expected_cost, expected_solution = solve()
+    cost, solution = solve(aggregation_module)
+
+    # Only one CSP can be used and cr_3 can't use csp_0
+    assert cost == pytest.approx(expected_cost) == pytest.approx(4 * 2 * 2 + 1)
+    assert solution == expected_solution
+
+
+def test_should_reject_modules_added_after_aggregation() -> None:
+    """The aggregation module must be the last module, otherwise the groups would be outdated."""
+    optimizer = (
+        Optimizer("test_aggregation", sense=LpMinimize)
+        .add_modules(base_module, aggregation_module, performance_module)
+        .initialize(_base_data(), _performance_data())
+    )
+
+    with pytest.raises(RuntimeError, match="must be added after all other modules"):
+        optimizer.validate().pre_processing()
@@ -1,10 +1,13 @@
 """Tests for the build MIP step of the base module."""
 from test.framework import Expect
 
+import pytest
 from optiframe import Optimizer
 from pulp import LpMinimize
 
-from cloud_resource_matcher.modules.base import BaseData, base_module
+from cloud_resource_matcher.modules.base import BaseData, BaseMipData, base_module
+from cloud_resource_matcher.modules.network import NetworkData, network_module
+from cloud_resource_matcher.modules.performance import PerformanceData, performance_module
 
 OPTIMIZER = Optimizer("test_base", sense=LpMinimize).add_modules(base_module)
 
@@ -56,3 +59,66 @@ def test_no_valid_cs_for_cr() -> None:
     )
 
     Expect(optimizer).to_be_infeasible().test()
+
+
+def test_should_add_one_objective_term_per_matching_variable() -> None:
+    """The costs of all modules are summed up into a single coefficient per matching variable."""
+    cloud_resources = ["cr_0", "cr_1"]
+    cloud_services = ["cs_0", "cs_1", "cs_2"]
+    locations = ["loc_0", "loc_1"]
+    base_data = BaseData(
+        cloud_resources=cloud_resources,
+        cloud_services=cloud_services,
+        cr_to_cs_list={cr: cloud_services for cr in cloud_resources},
+        cs_to_base_cost={"cs_0": 5, "cs_1": 3, "cs_2": 4},
+        cr_to_instance_demand={"cr_0": 1, "cr_1": 3},
+    )
+    performance_data = PerformanceData(
+        performance_criteria=["vCPUs", "RAM"],
+        performance_demand={("cr_0", "vCPUs"): 2, ("cr_1", "RAM"): 4},
+        performance_supply={(cs, pc): 8 for cs in cloud_services for pc in ["vCPUs", "RAM"]},
+        cost_per_unit={("cs_0", "vCPUs"): 1, ("cs_1", "RAM"): 2, ("cs_2", "vCPUs"): 3},
+    )
+    network_data = NetworkData(
+        locations=set(locations),
+        loc_and_loc_to_latency={(loc1, loc2): 0 for loc1 in locations for loc2 in locations},
+        cs_to_loc={"cs_0": "loc_0", "cs_1": "loc_1", "cs_2": "loc_0"},
+        cr_and_loc_to_traffic={("cr_0", "loc_1"): 2, ("cr_1", "loc_0"): 1},
+        cr_and_loc_to_max_latency={},
+        cr_and_cr_to_traffic={("cr_0", "cr_1"): 1},
+        cr_and_cr_to_max_latency={},
+        loc_and_loc_to_cost={
+            (loc1, loc2): 0 if loc1 == loc2 else 7 for loc1 in locations for loc2 in locations
+        },
+    )
+    built = (
+        Optimizer("test_base", sense=LpMinimize)
+        .add_modules(base_module, performance_module, network_module)
+        .initialize(base_data, performance_data, network_data)
+        .validate()
+        .pre_processing()
+        .build_mip()
+    )
+    objective = built.problem().objective
+    base_mip_data: BaseMipData = built.workflow.step_data[BaseMipData]
+    objective_names = [var.name for var in objective.keys()]
+
+    assert len(base_mip_data.var_cr_to_cs_matching) == 6
+
+    for (cr, cs), var in base_mip_data.var_cr_to_cs_matching.items():
+        demand = base_data.cr_to_instance_demand[cr]
+        performance_cost = sum(
+            performance_data.performance_demand.get((cr, pc), 0)
+            * performance_data.cost_per_unit.get((cs, pc), 0)
+            for pc in performance_data.performance_criteria
+        )
+        network_cost = sum(
+            traffic * network_data.loc_and_loc_to_cost[network_data.cs_to_loc[cs], loc]
+            for (traffic_cr, loc), traffic in network_data.cr_and_loc_to_traffic.items()
+            if traffic_cr == cr
+        )
+
+        assert objective_names.count(var.name) == 1
+        assert objective[var] == pytest.approx(
+            demand * (base_data.cs_to_base_cost[cs] + performance_cost + network_cost)
+        )
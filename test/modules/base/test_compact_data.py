@@ -0,0 +1,93 @@
+"""Tests for the compact representation of the base data."""
+import numpy as np
+
+from cloud_resource_matcher.modules.base import BaseData, CompactBaseData
+
+
+def _base_data() -> BaseData:
+    return BaseData(
+        cloud_resources=["cr_0", "cr_1", "cr_2"],
+        cloud_services=["cs_0", "cs_1", "cs_2"],
+        cr_to_cs_list={"cr_0": ["cs_0", "cs_2"], "cr_1": [], "cr_2": ["cs_2", "cs_1", "cs_0"]},
+        cs_to_base_cost={"cs_0": 5, "cs_1": 2.5, "cs_2": 0},
+        cr_to_instance_demand={"cr_0": 1, "cr_1": 4, "cr_2": 2},
+    )
+
+
+def test_should_intern_identifiers() -> None:
+    """The CRs and CSs are interned in the order they are defined in."""
+    compact = CompactBaseData.from_base_data(_base_data())
+
+    assert compact.cr_index == {"cr_0": 0, "cr_1": 1, "cr_2": 2}
+    assert compact.cs_index == {"cs_0": 0, "cs_1": 1, "cs_2": 2}
+    assert compact.cs_to_base_cost.tolist() == [5, 2.5, 0]
+    assert compact.cr_to_instance_demand.tolist() == [1, 4, 2]
+
+
+def test_should_store_candidates_in_csr_format() -> None:
+    """The candidates keep their order and are grouped by CR."""
+    compact = CompactBaseData.from_base_data(_base_data())
+
+    assert compact.cr_to_cs_offsets.tolist() == [0, 2, 2, 5]
+    assert compact.cr_to_cs_indices.tolist() == [0, 2, 2, 1, 0]
+    assert compact.candidate_count == 5
+    assert compact.candidates(2).tolist() == [2, 1, 0]
+    assert compact.candidate_crs().tolist() == [0, 0, 2, 2, 2]
+
+
+def test_should_filter_candidates() -> None:
+    """Filtering removes the candidates and updates the offsets."""
+    compact = CompactBaseData.from_base_data(_base_data())
+
+    compact.filter_candidates(np.array([True, False, False, True, True]))
+
+    assert compact.cr_to_cs_offsets.tolist() == [0, 1, 1, 3]
+    assert compact.cr_to_cs_list() == {"cr_0": ["cs_0"], "cr_1": [], "cr_2": ["cs_1", "cs_0"]}
+
+
+def test_should_convert_back_to_cr_to_cs_list() -> None:
+    """Converting back without filtering results in the original map."""
+    base_data = _base_data()
+    compact = CompactBaseData.from_base_data(base_data)
+
+    assert compact.cr_to_cs_list() == base_data.cr_to_cs_list
+
+
+def test_should_apply_restricted_candidates_once() -> None:
+    """Restricting the candidates only takes effect once the mask is applied."""
+    compact = CompactBaseData.from_base_data(_base_data())
+
+    compact.restrict_candidates(np.array([True, False, True, True, True]))
+    compact.restrict_candidates(np.array([True, True, True, False, True]))
+
+    assert compact.candidate_count == 5
+    assert compact.apply_candidate_mask()
+    assert compact.cr_to_cs_list() == {"cr_0": ["cs_0"], "cr_1": [], "cr_2": ["cs_2", "cs_0"]}
+    assert compact.candidate_mask.tolist() == [True, True, True]
+    assert not compact.apply_candidate_mask()
+
+
+def test_should_record_filter_that_emptied_candidates() -> None:
+    """The filter that excludes the last candidate of a CR is recorded."""
+    compact = CompactBaseData.from_base_data(_base_data())
+
+    compact.restrict_candidates(np.array([False, True, True, True, True]), "filter_0")
+    compact.restrict_candidates(np.array([True, False, True, True, True]), "filter_1")
+    compact.restrict_candidates(np.array([True, True, False, False, False]), "filter_2")
+
+    assert compact.remaining_candidate_counts().tolist() == [0, 0, 0]
+    # CRs without any candidates in the base data are not reported
+    assert compact.cr_to_emptied_by == {"cr_0": "filter_1", "cr_2": "filter_2"}
+
+
+def test_should_distinguish_crs() -> None:
+    """CRs are only in the same class if all their values are the same."""
+    compact = CompactBaseData.from_base_data(_base_data())
+
+    compact.distinguish_crs(np.array([1, 1, 1]))
+    assert len(set(compact.cr_classes.tolist())) == 1
+
+    compact.distinguish_crs(np.array([1, 2, 1]))
+    compact.distinguish_crs(np.array([0.5, 0.5, 0.5]))
+    classes = compact.cr_classes.tolist()
+    assert classes[0] == classes[2] != classes[1]
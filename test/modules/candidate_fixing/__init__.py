@@ -0,0 +1 @@
+"""Tests for the candidate fixing module."""
@@ -0,0 +1,200 @@
+"""Tests for the build MIP step of the candidate fixing module."""
+from test.framework import Expect
+
+import pytest
+from optiframe import InfeasibleError, OptimizationModule, Optimizer, SolutionObjValue
+from optiframe.framework import InitializedOptimizer
+from pulp import LpMinimize
+
+from cloud_resource_matcher.modules.base import BaseData, BaseSolution, base_module
+from cloud_resource_matcher.modules.candidate_fixing import (
+    NoCandidatesError,
+    candidate_fixing_module,
+)
+from cloud_resource_matcher.modules.multi_cloud import MultiCloudData, multi_cloud_module
+from cloud_resource_matcher.modules.network import (
+    NetworkData,
+    NetworkFormulation,
+    network_module,
+)
+from cloud_resource_matcher.modules.performance import PerformanceData, performance_module
+from cloud_resource_matcher.modules.service_limits import ServiceLimitsData, service_limits_module
+
+
+def _base_data() -> BaseData:
+    return BaseData(
+        cloud_resources=["cr_0", "cr_1", "cr_2"],
+        cloud_services=["cs_0", "cs_1", "cs_2"],
+        cr_to_cs_list={
+            "cr_0": ["cs_0"],
+            "cr_1": ["cs_0", "cs_1"],
+            "cr_2": ["cs_1", "cs_2"],
+        },
+        cs_to_base_cost={"cs_0": 1, "cs_1": 3, "cs_2": 2},
+        cr_to_instance_demand={"cr_0": 2, "cr_1": 1, "cr_2": 1},
+    )
+
+
+def _performance_data() -> PerformanceData:
+    return PerformanceData(
+        performance_criteria=["vCPUs"],
+        performance_demand={("cr_1", "vCPUs"): 2, ("cr_2", "vCPUs"): 4},
+        performance_supply={("cs_0", "vCPUs"): 1, ("cs_1", "vCPUs"): 2, ("cs_2", "vCPUs"): 2},
+        cost_per_unit={("cs_1", "vCPUs"): 0.5},
+    )
+
+
+def test_should_fix_crs_with_single_candidate() -> None:
+    """CRs with a single applicable CS don't get a variable, but their costs are paid."""
+    optimizer = (
+        Optimizer("test_candidate_fixing", sense=LpMinimize)
+        .add_modules(base_module, candidate_fixing_module)
+        .initialize(_base_data())
+    )
+
+    Expect(optimizer).to_be_feasible().with_cost(2 * 1 + 1 + 2).with_variables(
+        [
+            "cr_to_cs_matching(cr_1,cs_0)",
+            "cr_to_cs_matching(cr_1,cs_1)",
+            "cr_to_cs_matching(cr_2,cs_1)",
+            "cr_to_cs_matching(cr_2,cs_2)",
+        ],
+        exclusive=True,
+    ).with_cr_to_cs_matching(
+        {"cr_0": "cs_0", "cr_1": "cs_0", "cr_2": "cs_2"}
+    ).with_cs_instance_count(
+        {"cs_0": 3, "cs_2": 1}
+    ).test()
+
+
+def test_should_fix_crs_after_filtering() -> None:
+    """The candidates are fixed after the other modules have restricted them."""
+    optimizer = (
+        Optimizer("test_candidate_fixing", sense=LpMinimize)
+        .add_modules(base_module, performance_module, candidate_fixing_module)
+        .initialize(
+            _base_data(),
+            PerformanceData(
+                performance_criteria=["vCPUs"],
+                performance_demand={("cr_1", "vCPUs"): 2},
+                performance_supply={
+                    ("cs_0", "vCPUs"): 1,
+                    ("cs_1", "vCPUs"): 2,
+                    ("cs_2", "vCPUs"): 2,
+                },
+                cost_per_unit={("cs_1", "vCPUs"): 0.5},
+            ),
+        )
+    )
+
+    # cr_1 can only use cs_1 and pays for its vCPUs
+    Expect(optimizer).to_be_feasible().with_cost(2 * 1 + (3 + 2 * 0.5) + 2).with_variables(
+        ["cr_to_cs_matching(cr_2,cs_1)", "cr_to_cs_matching(cr_2,cs_2)"], exclusive=True
+    ).with_cr_to_cs_matching({"cr_0": "cs_0", "cr_1": "cs_1", "cr_2": "cs_2"}).test()
+
+
+def test_should_report_crs_without_candidates() -> None:
+    """The error names the CRs without applicable CS and the filter that excluded them."""
+    base_data = _base_data()
+    base_data.cloud_resources.append("cr_3")
+    base_data.cr_to_cs_list["cr_3"] = []
+    base_data.cr_to_instance_demand["cr_3"] = 1
+
+    optimizer = (
+        Optimizer("test_candidate_fixing", sense=LpMinimize)
+        .add_modules(base_module, performance_module, candidate_fixing_module)
+        .initialize(base_data, _performance_data())
+    )
+
+    with pytest.raises(NoCandidatesError) as error:
+        optimizer.validate().pre_processing()
+
+    assert error.value.cr_to_emptied_by == {
+        "cr_2": "the performance requirements",
+        "cr_3": "the base data",
+    }
+    assert "CR cr_2 has no applicable CS left after the performance requirements" in str(
+        error.value
+    )
+    assert isinstance(error.value, InfeasibleError)
+
+
+def _service_limits_optimizer(cs_0_limit: int) -> InitializedOptimizer:
+    return (
+        Optimizer("test_candidate_fixing", sense=LpMinimize)
+        .add_modules(base_module, service_limits_module, candidate_fixing_module)
+        .initialize(
+            _base_data(),
+            ServiceLimitsData(
+                cs_to_instance_limit={"cs_0": cs_0_limit},
+                cr_to_max_instance_demand={"cr_0": 2, "cr_1": 1, "cr_2": 1},
+            ),
+        )
+    )
+
+
+def test_should_reduce_service_limits_by_fixed_crs() -> None:
+    """The instances used by the fixed CRs are not available for the other CRs."""
+    optimizer = _service_limits_optimizer(cs_0_limit=2)
+
+    Expect(optimizer).to_be_feasible().with_cost(2 * 1 + 3 + 2).with_cr_to_cs_matching(
+        {"cr_0": "cs_0", "cr_1": "cs_1", "cr_2": "cs_2"}
+    ).test()
+
+
+def test_should_be_infeasible_if_fixed_crs_exceed_service_limits() -> None:
+    """The fixed CRs alone need more instances than available."""
+    optimizer = _service_limits_optimizer(cs_0_limit=1)
+
+    with pytest.raises(InfeasibleError):
+        optimizer.validate().pre_processing().build_mip()
+
+
+@pytest.mark.parametrize("formulation", list(NetworkFormulation))
+def test_should_have_same_cost_with_fixed_crs(formulation: NetworkFormulation) -> None:
+    """Fixing the CRs doesn't change the optimal cost of the other modules."""
+
+    def solve(*modules: OptimizationModule) -> tuple[float, BaseSolution]:
+        optimizer = (
+            Optimizer("test_candidate_fixing", sense=LpMinimize)
+            .add_modules(base_module, network_module, multi_cloud_module, *modules)
+            .initialize(
+                _base_data(),
+                NetworkData(
+                    locations={"loc_0", "loc_1"},
+                    loc_and_loc_to_latency={
+                        ("loc_0", "loc_0"): 0,
+                        ("loc_0", "loc_1"): 5,
+                        ("loc_1", "loc_0"): 5,
+                        ("loc_1", "loc_1"): 0,
+                    },
+                    cs_to_loc={"cs_0": "loc_0", "cs_1": "loc_0", "cs_2": "loc_1"},
+                    cr_and_loc_to_max_latency={},
+                    cr_and_cr_to_max_latency={("cr_1", "cr_2"): 10},
+                    cr_and_cr_to_traffic={("cr_0", "cr_2"): 2, ("cr_1", "cr_2"): 1},
+                    cr_and_loc_to_traffic={},
+                    loc_and_loc_to_cost={
+                        ("loc_0", "loc_0"): 0,
+                        ("loc_0", "loc_1"): 1,
+                        ("loc_1", "loc_0"): 1,
+                        ("loc_1", "loc_1"): 0,
+                    },
+                    formulation=formulation,
+                ),
+                MultiCloudData(
+                    cloud_service_providers=["csp_0", "csp_1"],
+                    csp_to_cs_list={"csp_0": ["cs_0", "cs_1"], "csp_1": ["cs_2"]},
+                    min_csp_count=1,
+                    max_csp_count=2,
+                    csp_to_cost={"csp_0": 1, "csp_1": 2},
+                ),
+            )
+        )
+        result = optimizer.solve()
+        return result[SolutionObjValue].objective_value, result[BaseSolution]
+
+    expected_cost, expected_solution = solve()
+    cost, solution = solve(candidate_fixing_module)
+
+    assert cost == pytest.approx(expected_cost)
+    assert solution.cr_to_cs_matching == expected_solution.cr_to_cs_matching
@@ -141,3 +141,38 @@ def test_csp_objective() -> None:
     )
 
     Expect(optimizer).to_be_feasible().with_cost(11).with_cr_to_cs_matching({"cr_0": "cs_0"}).test()
+
+
+def test_should_enforce_csp_usage_once_per_cr() -> None:
+    """The CSP usage is enforced with one constraint per CR, not one per CS of the CR."""
+    optimizer = OPTIMIZER.initialize(
+        BaseData(
+            cloud_resources=["cr_0", "cr_1"],
+            cloud_services=["cs_0", "cs_1", "cs_2"],
+            cr_to_cs_list={"cr_0": ["cs_0", "cs_1"], "cr_1": ["cs_0", "cs_1", "cs_2"]},
+            cs_to_base_cost={"cs_0": 1, "cs_1": 2, "cs_2": 3},
+            cr_to_instance_demand={"cr_0": 1, "cr_1": 1},
+        ),
+        MultiCloudData(
+            cloud_service_providers=["csp_0", "csp_1"],
+            csp_to_cs_list={
+                "csp_0": ["cs_0", "cs_1"],
+                "csp_1": ["cs_2"],
+            },
+            min_csp_count=0,
+            max_csp_count=2,
+            csp_to_cost={"csp_0": 5, "csp_1": 0},
+        ),
+    )
+
+    constraint_names = optimizer.validate().pre_processing().build_mip().problem().constraints
+    enforce_names = {name for name in constraint_names if name.startswith("csp_used_enforce_1")}
+
+    assert enforce_names == {
+        "csp_used_enforce_1(csp_0,cr_0)",
+        "csp_used_enforce_1(csp_0,cr_1)",
+        "csp_used_enforce_1(csp_1,cr_1)",
+    }
+    Expect(optimizer).to_be_feasible().with_cost(1 + 1 + 5).with_variable_values(
+        {"csp_used(csp_0)": 1, "csp_used(csp_1)": 0}
+    ).test()
@@ -1,11 +1,22 @@
 """Tests for the build MIP step of the network module."""
 from test.framework import Expect
 
-from optiframe import Optimizer
+import numpy as np
+import pytest
+from optiframe import Optimizer, SolutionObjValue
 from pulp import LpMinimize
 
 from cloud_resource_matcher.modules.base import BaseData, base_module
-from cloud_resource_matcher.modules.network import NetworkData, network_module
+from cloud_resource_matcher.modules.network import (
+    DenseLocationMatrix,
+    NetworkData,
+    NetworkFormulation,
+    NetworkMipData,
+    SparseLocationMatrix,
+    SymmetricLocationMatrix,
+    network_module,
+)
+from cloud_resource_matcher.modules.network.data import LocationCosts, LocationLatencies
 
 OPTIMIZER = Optimizer("test_network", sense=LpMinimize).add_modules(base_module, network_module)
 
@@ -175,3 +186,254 @@ def test_should_consider_latency_for_cr_to_cr_connections() -> None:
     )
 
     Expect(optimizer).to_be_infeasible().test()
+
+
+def test_should_calculate_location_deployments_for_cr_pairs() -> None:
+    """The location pairs formulation deploys the CR pairs to pairs of locations."""
+    locations = {"loc_0", "loc_1"}
+
+    optimizer = OPTIMIZER.initialize(
+        BaseData(
+            cloud_resources=["cr_0", "cr_1"],
+            cloud_services=["cs_0", "cs_1", "cs_2"],
+            cr_to_cs_list={"cr_0": ["cs_0"], "cr_1": ["cs_1", "cs_2"]},
+            cs_to_base_cost={"cs_0": 5, "cs_1": 5, "cs_2": 6},
+            cr_to_instance_demand={"cr_0": 1, "cr_1": 3},
+        ),
+        NetworkData(
+            locations=locations,
+            loc_and_loc_to_latency={
+                (loc1, loc2): 0 if loc1 == loc2 else 5 for loc1 in locations for loc2 in locations
+            },
+            cs_to_loc={"cs_0": "loc_0", "cs_1": "loc_1", "cs_2": "loc_1"},
+            cr_and_loc_to_max_latency={},
+            cr_and_cr_to_max_latency={},
+            cr_and_cr_to_traffic={
+                ("cr_0", "cr_1"): 2,
+                ("cr_1", "cr_0"): 1,
+            },
+            cr_and_loc_to_traffic={},
+            loc_and_loc_to_cost={
+                (loc1, loc2): 0 if loc1 == loc2 else 10 for loc1 in locations for loc2 in locations
+            },
+            formulation=NetworkFormulation.LOCATION_PAIRS,
+        ),
+    )
+
+    # Base costs + cr_0 -> cr_1 traffic costs + cr_1 -> cr_0 traffic costs
+    Expect(optimizer).to_be_feasible().with_cost(
+        1 * 5 + 3 * 5 + 1 * 2 * 10 + 3 * 1 * 10
+    ).with_variable_values(
+        {
+            "cr_pair_loc_deployment(cr_0,loc_0,cr_1,loc_1)": 1,
+            "cr_pair_loc_deployment(cr_1,loc_1,cr_0,loc_0)": 1,
+        }
+    ).test()
+
+
+def test_should_consider_latency_for_location_pairs() -> None:
+    """The cheapest CS for one of the CRs violates the maximum latency of the connection."""
+    locations = {"loc_0", "loc_1"}
+
+    optimizer = OPTIMIZER.initialize(
+        BaseData(
+            cloud_resources=["cr_0", "cr_1"],
+            cloud_services=["cs_0", "cs_1", "cs_2"],
+            cr_to_cs_list={"cr_0": ["cs_0"], "cr_1": ["cs_1", "cs_2"]},
+            cs_to_base_cost={"cs_0": 5, "cs_1": 1, "cs_2": 5},
+            cr_to_instance_demand={"cr_0": 1, "cr_1": 1},
+        ),
+        NetworkData(
+            locations=locations,
+            loc_and_loc_to_latency={
+                (loc1, loc2): 0 if loc1 == loc2 else 10 for loc1 in locations for loc2 in locations
+            },
+            cs_to_loc={"cs_0": "loc_0", "cs_1": "loc_1", "cs_2": "loc_0"},
+            cr_and_loc_to_max_latency={},
+            cr_and_cr_to_max_latency={("cr_0", "cr_1"): 5},
+            cr_and_cr_to_traffic={
+                ("cr_0", "cr_1"): 1,
+            },
+            cr_and_loc_to_traffic={},
+            loc_and_loc_to_cost={
+                (loc1, loc2): 0 if loc1 == loc2 else 10 for loc1 in locations for loc2 in locations
+            },
+            formulation=NetworkFormulation.LOCATION_PAIRS,
+        ),
+    )
+
+    Expect(optimizer).to_be_feasible().with_cr_to_cs_matching(
+        {"cr_0": "cs_0", "cr_1": "cs_2"}
+    ).with_cost(10).test()
+
+
+def test_should_have_same_cost_for_both_formulations() -> None:
+    """The location pairs formulation has the same optimal cost as the CS pairs formulation."""
+    cr_count = 6
+    cs_count = 8
+    locations = [f"loc_{loc}" for loc in range(3)]
+
+    def _solve(formulation: NetworkFormulation) -> float:
+        optimizer = OPTIMIZER.initialize(
+            BaseData(
+                cloud_resources=[f"cr_{cr}" for cr in range(cr_count)],
+                cloud_services=[f"cs_{cs}" for cs in range(cs_count)],
+                cr_to_cs_list={
+                    f"cr_{cr}": [f"cs_{cs}" for cs in range(cs_count) if (cr + cs) % 4 != 0]
+                    for cr in range(cr_count)
+                },
+                cs_to_base_cost={f"cs_{cs}": (cs * 5) % 7 + 1 for cs in range(cs_count)},
+                cr_to_instance_demand={f"cr_{cr}": cr % 2 + 1 for cr in range(cr_count)},
+            ),
+            NetworkData(
+                locations=set(locations),
+                loc_and_loc_to_latency={
+                    (loc1, loc2): abs(i - j) * 10
+                    for i, loc1 in enumerate(locations)
+                    for j, loc2 in enumerate(locations)
+                },
+                cs_to_loc={f"cs_{cs}": locations[cs % len(locations)] for cs in range(cs_count)},
+                cr_and_loc_to_max_latency={},
+                cr_and_cr_to_max_latency={("cr_0", "cr_1"): 10, ("cr_2", "cr_3"): 0},
+                cr_and_cr_to_traffic={
+                    (f"cr_{cr}", f"cr_{(cr + 1) % cr_count}"): cr + 1 for cr in range(cr_count)
+                },
+                cr_and_loc_to_traffic={(f"cr_{cr}", "loc_0"): cr % 3 for cr in range(cr_count)},
+                loc_and_loc_to_cost={
+                    (loc1, loc2): 0 if i == j else i + j + 1
+                    for i, loc1 in enumerate(locations)
+                    for j, loc2 in enumerate(locations)
+                },
+                formulation=formulation,
+            ),
+        )
+
+        objective_value: float = optimizer.solve()[SolutionObjValue].objective_value
+        return objective_value
+
+    assert _solve(NetworkFormulation.LOCATION_PAIRS) == pytest.approx(
+        _solve(NetworkFormulation.CS_PAIRS)
+    )
+
+
+def test_should_have_same_cost_for_all_location_matrices() -> None:
+    """The backends of the location matrices don't change the optimal cost."""
+    cr_count = 6
+    cs_count = 8
+    locations = [f"loc_{loc}" for loc in range(3)]
+    latency = np.array([[abs(i - j) * 10 for j in range(3)] for i in range(3)])
+    cost = np.array([[0 if i == j else i + j + 1 for j in range(3)] for i in range(3)])
+
+    def _solve(
+        loc_and_loc_to_latency: LocationLatencies, loc_and_loc_to_cost: LocationCosts
+    ) -> float:
+        optimizer = OPTIMIZER.initialize(
+            BaseData(
+                cloud_resources=[f"cr_{cr}" for cr in range(cr_count)],
+                cloud_services=[f"cs_{cs}" for cs in range(cs_count)],
+                cr_to_cs_list={
+                    f"cr_{cr}": [f"cs_{cs}" for cs in range(cs_count) if (cr + cs) % 4 != 0]
+                    for cr in range(cr_count)
+                },
+                cs_to_base_cost={f"cs_{cs}": (cs * 5) % 7 + 1 for cs in range(cs_count)},
+                cr_to_instance_demand={f"cr_{cr}": cr % 2 + 1 for cr in range(cr_count)},
+            ),
+            NetworkData(
+                locations=set(locations),
+                loc_and_loc_to_latency=loc_and_loc_to_latency,
+                cs_to_loc={f"cs_{cs}": locations[cs % len(locations)] for cs in range(cs_count)},
+                cr_and_loc_to_max_latency={("cr_4", "loc_2"): 10},
+                cr_and_cr_to_max_latency={("cr_0", "cr_1"): 10, ("cr_2", "cr_3"): 0},
+                cr_and_cr_to_traffic={
+                    (f"cr_{cr}", f"cr_{(cr + 1) % cr_count}"): cr + 1 for cr in range(cr_count)
+                },
+                cr_and_loc_to_traffic={(f"cr_{cr}", "loc_0"): cr % 3 for cr in range(cr_count)},
+                loc_and_loc_to_cost=loc_and_loc_to_cost,
+            ),
+        )
+
+        objective_value: float = optimizer.solve()[SolutionObjValue].objective_value
+        return objective_value
+
+    expected = _solve(
+        {
+            (loc1, loc2): int(latency[i, j])
+            for i, loc1 in enumerate(locations)
+            for j, loc2 in enumerate(locations)
+        },
+        {
+            (loc1, loc2): float(cost[i, j])
+            for i, loc1 in enumerate(locations)
+            for j, loc2 in enumerate(locations)
+        },
+    )
+
+    assert _solve(
+        DenseLocationMatrix(locations, latency), DenseLocationMatrix(locations, cost)
+    ) == pytest.approx(expected)
+    assert _solve(
+        SymmetricLocationMatrix.from_dense(locations, latency),
+        SymmetricLocationMatrix.from_dense(locations, cost),
+    ) == pytest.approx(expected)
+    assert _solve(
+        SparseLocationMatrix(
+            dict(), fallback=lambda loc1, loc2: abs(int(loc1[-1]) - int(loc2[-1])) * 10
+        ),
+        SparseLocationMatrix(
+            {
+                (loc1, loc2): int(loc1[-1]) + int(loc2[-1]) + 1
+                for loc1 in locations
+                for loc2 in locations
+                if loc1 != loc2
+            },
+            default=0,
+        ),
+    ) == pytest.approx(expected)
+
+
+def test_should_skip_connections_without_effect() -> None:
+    """Connections without traffic or with only free location pairs are left out of the MIP."""
+    locations = {"loc_0", "loc_1"}
+
+    optimizer = OPTIMIZER.initialize(
+        BaseData(
+            cloud_resources=["cr_0", "cr_1", "cr_2"],
+            cloud_services=["cs_0", "cs_1"],
+            cr_to_cs_list={"cr_0": ["cs_0"], "cr_1": ["cs_0", "cs_1"], "cr_2": ["cs_1"]},
+            cs_to_base_cost={"cs_0": 4, "cs_1": 5},
+            cr_to_instance_demand={"cr_0": 1, "cr_1": 1, "cr_2": 1},
+        ),
+        NetworkData(
+            locations=locations,
+            loc_and_loc_to_latency={
+                (loc1, loc2): 0 if loc1 == loc2 else 10 for loc1 in locations for loc2 in locations
+            },
+            cs_to_loc={"cs_0": "loc_0", "cs_1": "loc_1"},
+            cr_and_loc_to_max_latency={},
+            cr_and_cr_to_max_latency={("cr_2", "cr_1"): 5},
+            cr_and_cr_to_traffic={
+                # No traffic
+                ("cr_0", "cr_1"): 0,
+                # Only the free loc_0 -> loc_0 and loc_0 -> loc_1 connections
+                ("cr_0", "cr_2"): 3,
+                # No traffic, but a maximum latency
+                ("cr_2", "cr_1"): 0,
+            },
+            cr_and_loc_to_traffic={("cr_0", "loc_0"): 0, ("cr_1", "loc_1"): 1},
+            loc_and_loc_to_cost={
+                ("loc_0", "loc_0"): 0,
+                ("loc_0", "loc_1"): 0,
+                ("loc_1", "loc_0"): 10,
+                ("loc_1", "loc_1"): 0,
+            },
+        ),
+    )
+
+    solution = optimizer.solve()
+    network_mip_data: NetworkMipData = solution[NetworkMipData]
+
+    assert network_mip_data.skipped_cr_connections == [("cr_0", "cr_1"), ("cr_0", "cr_2")]
+    assert network_mip_data.skipped_loc_connection_count == 1
+    assert {key[0] for key in network_mip_data.var_cr_pair_cs_deployment.keys()} == {"cr_2"}
+    # The maximum latency forces cr_1 to the more expensive CS in loc_1
+    assert solution[SolutionObjValue].objective_value == pytest.approx(4 + 5 + 5)
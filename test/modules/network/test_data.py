@@ -0,0 +1,106 @@
+"""Tests for the data of the network module."""
+import math
+
+import numpy as np
+import pytest
+
+from cloud_resource_matcher.modules.network import (
+    CoordinateLatencyMatrix,
+    DenseLocationMatrix,
+    SparseLocationMatrix,
+    SymmetricLocationMatrix,
+)
+from cloud_resource_matcher.modules.network.data import EARTH_RADIUS_KM
+
+LOCATIONS = ["loc_0", "loc_1", "loc_2"]
+
+# A symmetric matrix with different values for every connection
+VALUES = np.array([[0, 1, 2], [1, 3, 4], [2, 4, 5]], dtype=np.float64)
+
+
+def test_should_look_up_dense_values() -> None:
+    """The values of a dense matrix are indexed by the order of the locations."""
+    matrix = DenseLocationMatrix(LOCATIONS, VALUES)
+
+    assert matrix["loc_1", "loc_2"] == 4
+    assert matrix.submatrix(["loc_2", "loc_0"], ["loc_1"]).tolist() == [[4], [1]]
+
+
+def test_should_store_upper_triangle_of_symmetric_matrix() -> None:
+    """A symmetric matrix only stores one value per pair and agrees with the dense matrix."""
+    matrix = SymmetricLocationMatrix.from_dense(LOCATIONS, VALUES)
+
+    assert matrix.values.tolist() == [0, 1, 2, 3, 4, 5]
+    assert [[matrix[loc1, loc2] for loc2 in LOCATIONS] for loc1 in LOCATIONS] == VALUES.tolist()
+    assert matrix.submatrix(["loc_2", "loc_0"], LOCATIONS).tolist() == [[2, 4, 5], [0, 1, 2]]
+
+
+def test_should_fall_back_for_missing_sparse_values() -> None:
+    """The explicit entries take precedence over the fallback and the default value."""
+    with_default = SparseLocationMatrix({("loc_0", "loc_1"): 3}, default=7, symmetric=True)
+    with_fallback = SparseLocationMatrix(
+        {("loc_0", "loc_1"): 3}, default=7, fallback=lambda loc1, loc2: 0 if loc1 == loc2 else 9
+    )
+
+    assert with_default["loc_1", "loc_0"] == 3
+    assert with_default["loc_1", "loc_2"] == 7
+    assert with_fallback["loc_0", "loc_1"] == 3
+    assert with_fallback["loc_1", "loc_0"] == 9
+    assert with_fallback["loc_2", "loc_2"] == 0
+
+
+def test_should_raise_error_for_missing_sparse_value_without_default() -> None:
+    """Without default value or fallback, a sparse matrix behaves like a dictionary."""
+    matrix = SparseLocationMatrix({("loc_0", "loc_1"): 3})
+
+    with pytest.raises(KeyError):
+        matrix["loc_1", "loc_0"]
+
+    assert sorted(matrix.validate({"loc_0", "loc_1"}, "matrix", non_negative=True)) == [
+        "No value in matrix for (loc_0, loc_0)",
+        "No value in matrix for (loc_1, loc_0)",
+        "No value in matrix for (loc_1, loc_1)",
+    ]
+
+
+def test_should_compute_latency_from_coordinates() -> None:
+    """The latency grows with the great-circle distance and includes the offsets."""
+    matrix = CoordinateLatencyMatrix(
+        {"loc_0": (0, 0), "loc_1": (0, 90), "loc_2": (90, 0)},
+        latency_per_km=0.01,
+        loc_to_offset={"loc_2": 5},
+    )
+    # A quarter of the circumference of the earth
+    quarter = math.pi / 2 * EARTH_RADIUS_KM * 0.01
+
+    assert matrix["loc_0", "loc_0"] == pytest.approx(0)
+    assert matrix["loc_0", "loc_1"] == pytest.approx(quarter)
+    assert matrix["loc_1", "loc_2"] == pytest.approx(quarter + 5)
+    assert matrix["loc_2", "loc_2"] == pytest.approx(10)
+    assert matrix.submatrix(LOCATIONS, LOCATIONS) == pytest.approx(
+        np.array([[matrix[loc1, loc2] for loc2 in LOCATIONS] for loc1 in LOCATIONS])
+    )
+
+
+def test_should_bound_cache_of_coordinate_latencies() -> None:
+    """Only the most recently used latencies are kept."""
+    matrix = CoordinateLatencyMatrix(
+        {loc: (i, i) for i, loc in enumerate(LOCATIONS)}, latency_per_km=1, max_cached_latencies=2
+    )
+
+    for loc in LOCATIONS:
+        matrix.get("loc_0", loc)
+
+    matrix.get("loc_0", "loc_1")
+
+    assert list(matrix._cache.keys()) == [("loc_0", "loc_2"), ("loc_0", "loc_1")]
+
+
+def test_should_report_missing_coordinates() -> None:
+    """Every location needs coordinates within the valid range."""
+    matrix = CoordinateLatencyMatrix({"loc_0": (0, 0), "loc_1": (100, 0)}, latency_per_km=1)
+
+    assert matrix.validate({"loc_0", "loc_1", "loc_2"}, "matrix", non_negative=True) == [
+        "The coordinates of loc_1 in matrix are not valid",
+        "No coordinates in matrix for location loc_2",
+    ]
@@ -0,0 +1,100 @@
+"""Tests for the pre-processing step of the network module."""
+from typing import Optional
+
+import pytest
+from optiframe import Optimizer
+from optiframe.framework import InitializedOptimizer
+from pulp import LpMinimize
+
+from cloud_resource_matcher.modules.base import BaseData, NoCandidatesError, base_module
+from cloud_resource_matcher.modules.network import NetworkData, network_module
+
+LOCATIONS = ["loc_0", "loc_1", "loc_2"]
+
+
+def _optimizer(
+    cr_1_services: list[str],
+    cr_and_loc_to_max_latency: Optional[dict[tuple[str, str], int]] = None,
+) -> InitializedOptimizer:
+    """Create a chain cr_0 -> cr_1 -> cr_2, where cr_2 can only use the CS in loc_2.
+
+    The latency is the distance between the location numbers.
+    """
+    return (
+        Optimizer("test_network", sense=LpMinimize)
+        .add_modules(base_module, network_module)
+        .initialize(
+            BaseData(
+                cloud_resources=["cr_0", "cr_1", "cr_2"],
+                cloud_services=["cs_0", "cs_1", "cs_2"],
+                cr_to_cs_list={
+                    "cr_0": ["cs_0", "cs_1", "cs_2"],
+                    "cr_1": cr_1_services,
+                    "cr_2": ["cs_2"],
+                },
+                cs_to_base_cost={"cs_0": 1, "cs_1": 1, "cs_2": 1},
+                cr_to_instance_demand={"cr_0": 1, "cr_1": 1, "cr_2": 1},
+            ),
+            NetworkData(
+                locations=set(LOCATIONS),
+                loc_and_loc_to_latency={
+                    (loc1, loc2): abs(i - j)
+                    for i, loc1 in enumerate(LOCATIONS)
+                    for j, loc2 in enumerate(LOCATIONS)
+                },
+                cs_to_loc={"cs_0": "loc_0", "cs_1": "loc_1", "cs_2": "loc_2"},
+                cr_and_loc_to_max_latency=cr_and_loc_to_max_latency or {},
+                cr_and_cr_to_max_latency={("cr_0", "cr_1"): 1, ("cr_1", "cr_2"): 0},
+                cr_and_cr_to_traffic={("cr_0", "cr_1"): 1, ("cr_1", "cr_2"): 1},
+                cr_and_loc_to_traffic={},
+                loc_and_loc_to_cost={(loc1, loc2): 0 for loc1 in LOCATIONS for loc2 in LOCATIONS},
+            ),
+        )
+    )
+
+
+def test_should_propagate_cr_pair_latencies() -> None:
+    """The CSs without a partner within the maximum latency are excluded along the chain."""
+    built = (
+        _optimizer(cr_1_services=["cs_0", "cs_1", "cs_2"]).validate().pre_processing().build_mip()
+    )
+
+    assert built.workflow.step_data[BaseData].cr_to_cs_list == {
+        "cr_0": ["cs_1", "cs_2"],
+        "cr_1": ["cs_2"],
+        "cr_2": ["cs_2"],
+    }
+    # The matching variables and the variables for the CS pairs within the maximum latency
+    assert built.problem().numVariables() == 4 + 2 + 1
+
+
+def test_should_intersect_cr_location_latencies() -> None:
+    """A CS is only kept if its location is within every maximum latency of the CR."""
+    built = (
+        _optimizer(
+            cr_1_services=["cs_1", "cs_2"],
+            cr_and_loc_to_max_latency={
+                ("cr_0", "loc_0"): 1,
+                ("cr_0", "loc_2"): 1,
+                # Allows every location
+                ("cr_1", "loc_0"): 2,
+            },
+        )
+        .validate()
+        .pre_processing()
+        .build_mip()
+    )
+
+    assert built.workflow.step_data[BaseData].cr_to_cs_list == {
+        "cr_0": ["cs_1"],
+        "cr_1": ["cs_2"],
+        "cr_2": ["cs_2"],
+    }
+
+
+def test_should_report_crs_emptied_by_cr_pair_latencies() -> None:
+    """A CR without any CS within the maximum latency makes the problem infeasible."""
+    with pytest.raises(NoCandidatesError) as error:
+        _optimizer(cr_1_services=["cs_0", "cs_1"]).validate().pre_processing()
+
+    assert error.value.cr_to_emptied_by == {"cr_1": "the CR -> CR latency requirements"}
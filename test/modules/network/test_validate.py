@@ -1,8 +1,15 @@
 """Tests for the validation step of the network module."""
+import numpy as np
 import pytest
 
 from cloud_resource_matcher.modules.base import BaseData
-from cloud_resource_matcher.modules.network import NetworkData
+from cloud_resource_matcher.modules.network import (
+    DenseLocationMatrix,
+    LocationMatrix,
+    NetworkData,
+    SparseLocationMatrix,
+    SymmetricLocationMatrix,
+)
 from cloud_resource_matcher.modules.network.validation import ValidateNetworkTask
 
 
@@ -442,3 +449,74 @@ class TestLocAndLocToCost:
 
         with pytest.raises(AssertionError):
             ValidateNetworkTask(base_data, network_data).execute()
+
+
+class TestLocationMatrix:
+    """Tests for the location matrices as loc_and_loc_to_latency and loc_and_loc_to_cost."""
+
+    @staticmethod
+    def _network_data(latency: LocationMatrix, cost: LocationMatrix) -> NetworkData:
+        return NetworkData(
+            locations={"loc_0", "loc_1"},
+            loc_and_loc_to_latency=latency,
+            cs_to_loc={"cs_0": "loc_0"},
+            cr_and_loc_to_max_latency={},
+            cr_and_cr_to_max_latency={},
+            cr_and_cr_to_traffic={},
+            cr_and_loc_to_traffic={("cr_0", "loc_1"): 10},
+            loc_and_loc_to_cost=cost,
+        )
+
+    @staticmethod
+    def _base_data() -> BaseData:
+        return BaseData(
+            cloud_resources=["cr_0"],
+            cloud_services=["cs_0"],
+            cr_to_cs_list={"cr_0": ["cs_0"]},
+            cs_to_base_cost={"cs_0": 5},
+            cr_to_instance_demand={"cr_0": 1},
+        )
+
+    def test_should_not_raise_error_for_valid_matrices(self) -> None:
+        """Dense, symmetric and sparse matrices with a default value are valid."""
+        network_data = self._network_data(
+            SymmetricLocationMatrix(["loc_1", "loc_0"], np.array([0, 5, 0])),
+            DenseLocationMatrix(["loc_0", "loc_1"], np.array([[0, 1], [2, 0]])),
+        )
+        ValidateNetworkTask(self._base_data(), network_data).execute()
+
+        network_data = self._network_data(
+            SparseLocationMatrix({("loc_0", "loc_1"): 5}, default=0),
+            SparseLocationMatrix(dict(), fallback=lambda loc1, loc2: 0 if loc1 == loc2 else 1),
+        )
+        ValidateNetworkTask(self._base_data(), network_data).execute()
+
+    def test_should_raise_error_for_missing_location(self) -> None:
+        """The dense matrix doesn't contain all locations."""
+        network_data = self._network_data(
+            DenseLocationMatrix(["loc_0"], np.array([[0]])),
+            SparseLocationMatrix(dict(), default=0),
+        )
+
+        with pytest.raises(AssertionError):
+            ValidateNetworkTask(self._base_data(), network_data).execute()
+
+    def test_should_raise_error_for_wrong_number_of_values(self) -> None:
+        """The symmetric matrix stores the full matrix instead of the upper triangle."""
+        network_data = self._network_data(
+            SymmetricLocationMatrix(["loc_0", "loc_1"], np.array([0, 5, 5, 0])),
+            SparseLocationMatrix(dict(), default=0),
+        )
+
+        with pytest.raises(AssertionError):
+            ValidateNetworkTask(self._base_data(), network_data).execute()
+
+    def test_should_raise_error_for_negative_latency(self) -> None:
+        """The default latency of the sparse matrix is negative."""
+        network_data = self._network_data(
+            SparseLocationMatrix(dict(), default=-1),
+            SparseLocationMatrix(dict(), default=0),
+        )
+
+        with pytest.raises(AssertionError):
+            ValidateNetworkTask(self._base_data(), network_data).execute()
@@ -0,0 +1,34 @@
+"""Tests for the data of the performance module."""
+from cloud_resource_matcher.modules.performance import PerformanceData
+
+
+def _performance_data() -> PerformanceData:
+    return PerformanceData(
+        performance_criteria=["vCPUs", "RAM"],
+        performance_demand={("cr_0", "vCPUs"): 2, ("cr_1", "RAM"): 4},
+        performance_supply={
+            ("cs_0", "vCPUs"): 1,
+            ("cs_0", "RAM"): 8,
+            ("cs_1", "vCPUs"): 4,
+            ("cs_1", "RAM"): 2,
+        },
+        cost_per_unit={("cs_1", "vCPUs"): 0.5},
+    )
+
+
+def test_should_convert_to_dense_matrices() -> None:
+    """The rows follow the given indexes and the columns follow the performance criteria."""
+    performance_data = _performance_data()
+    cr_index = {"cr_0": 0, "cr_1": 1}
+    cs_index = {"cs_0": 1, "cs_1": 0}
+
+    assert performance_data.demand_matrix(cr_index).tolist() == [[2, 0], [0, 4]]
+    assert performance_data.supply_matrix(cs_index).tolist() == [[4, 2], [1, 8]]
+    assert performance_data.cost_per_unit_matrix(cs_index).tolist() == [[0.5, 0], [0, 0]]
+
+
+def test_should_fill_missing_demand_with_default() -> None:
+    """Criteria without a demand get the default value."""
+    demand = _performance_data().demand_matrix({"cr_0": 0, "cr_1": 1}, default=-1)
+
+    assert demand.tolist() == [[2, -1], [-1, 4]]
@@ -0,0 +1,112 @@
+"""Tests for the decomposition of problem instances into independent components."""
+import pytest
+from optiframe import ModelSize, Optimizer, SolutionObjValue
+from optiframe.framework import InitializedOptimizer
+from pulp import LpMinimize
+
+from cloud_resource_matcher.decomposition import find_components, is_decomposable, solve
+from cloud_resource_matcher.modules.base import BaseData, BaseSolution, base_module
+from cloud_resource_matcher.modules.multi_cloud import MultiCloudData, multi_cloud_module
+from cloud_resource_matcher.modules.network import NetworkData, network_module
+from cloud_resource_matcher.modules.service_limits import ServiceLimitsData, service_limits_module
+from cloud_resource_matcher.validation import validate
+
+CR_COUNT = 8
+CS_COUNT = 6
+LOCATIONS = {"loc_0", "loc_1"}
+
+
+def _base_data() -> BaseData:
+    # The even CRs can use the even CSs and the odd CRs can use the odd CSs
+    return BaseData(
+        cloud_resources=[f"cr_{cr}" for cr in range(CR_COUNT)],
+        cloud_services=[f"cs_{cs}" for cs in range(CS_COUNT)],
+        cr_to_cs_list={
+            f"cr_{cr}": [f"cs_{cs}" for cs in range(CS_COUNT) if cs % 2 == cr % 2]
+            for cr in range(CR_COUNT)
+        },
+        cs_to_base_cost={f"cs_{cs}": cs + 1 for cs in range(CS_COUNT)},
+        cr_to_instance_demand={f"cr_{cr}": 1 for cr in range(CR_COUNT)},
+    )
+
+
+def _network_data() -> NetworkData:
+    return NetworkData(
+        locations=LOCATIONS,
+        loc_and_loc_to_latency={
+            (loc1, loc2): 0 if loc1 == loc2 else 10 for loc1 in LOCATIONS for loc2 in LOCATIONS
+        },
+        cs_to_loc={f"cs_{cs}": f"loc_{cs // 3}" for cs in range(CS_COUNT)},
+        cr_and_loc_to_traffic={},
+        cr_and_loc_to_max_latency={},
+        cr_and_cr_to_traffic={("cr_0", "cr_3"): 5, ("cr_4", "cr_5"): 1},
+        cr_and_cr_to_max_latency={("cr_0", "cr_3"): 5},
+        loc_and_loc_to_cost={
+            (loc1, loc2): 0 if loc1 == loc2 else 2 for loc1 in LOCATIONS for loc2 in LOCATIONS
+        },
+    )
+
+
+def _service_limits_data() -> ServiceLimitsData:
+    return ServiceLimitsData(
+        # The limit of cs_0 can be exceeded, the limit of cs_1 can't
+        cs_to_instance_limit={"cs_0": 2, "cs_1": 4},
+        cr_to_max_instance_demand={f"cr_{cr}": 1 for cr in range(CR_COUNT)},
+    )
+
+
+def _optimizer() -> InitializedOptimizer:
+    return (
+        Optimizer("test_decomposition", sense=LpMinimize)
+        .add_modules(base_module, network_module, service_limits_module)
+        .initialize(_base_data(), _network_data(), _service_limits_data())
+    )
+
+
+def test_should_find_coupled_crs() -> None:
+    """CRs are coupled by traffic and by CSs with limits that can be exceeded."""
+    step_data = validate(_optimizer()).pre_processing().workflow.step_data
+
+    assert find_components(step_data) == [
+        ["cr_0", "cr_2", "cr_3", "cr_4", "cr_5", "cr_6"],
+        ["cr_1"],
+        ["cr_7"],
+    ]
+
+
+def test_should_not_be_decomposable_with_multi_cloud_module() -> None:
+    """The CSP counts couple all CRs."""
+    optimizer = (
+        Optimizer("test_decomposition", sense=LpMinimize)
+        .add_modules(base_module, multi_cloud_module)
+        .initialize(
+            _base_data(),
+            MultiCloudData(
+                cloud_service_providers=["csp_0"],
+                csp_to_cs_list={"csp_0": [f"cs_{cs}" for cs in range(CS_COUNT)]},
+                min_csp_count=1,
+                max_csp_count=1,
+                csp_to_cost={"csp_0": 0},
+            ),
+        )
+    )
+
+    assert is_decomposable(_optimizer())
+    assert not is_decomposable(optimizer)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_should_match_mip_solution(max_workers: int) -> None:
+    """Solving the components separately obtains the same solution as solving the whole MIP."""
+    expected = _optimizer().solve()
+    actual = solve(_optimizer(), max_workers=max_workers)
+
+    assert actual[SolutionObjValue].objective_value == pytest.approx(
+        expected[SolutionObjValue].objective_value
+    )
+    assert actual[ModelSize].variable_count == expected[ModelSize].variable_count
+
+    expected_base: BaseSolution = expected[BaseSolution]
+    actual_base: BaseSolution = actual[BaseSolution]
+    assert actual_base.cr_to_cs_matching.keys() == expected_base.cr_to_cs_matching.keys()
+    assert actual_base.cs_instance_count["cs_0"] <= 2
@@ -0,0 +1,122 @@
+"""Tests for the on-disk cache of constructed MIPs."""
+import os
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from optiframe import Optimizer, SolutionObjValue, StepTimes
+from optiframe.framework import InitializedOptimizer
+from pulp import LpMinimize
+
+from cloud_resource_matcher import reoptimization
+from cloud_resource_matcher.model_cache import ModelCache, ModelCacheStats, fingerprint
+from cloud_resource_matcher.modules.base import BaseData, BaseSolution, base_module
+from cloud_resource_matcher.modules.performance import PerformanceData, performance_module
+from cloud_resource_matcher.reoptimization import PriceUpdate
+
+
+def _base_data(cs_0_cost: float = 5) -> BaseData:
+    return BaseData(
+        cloud_resources=["cr_0", "cr_1"],
+        cloud_services=["cs_0", "cs_1"],
+        cr_to_cs_list={"cr_0": ["cs_0", "cs_1"], "cr_1": ["cs_0", "cs_1"]},
+        cs_to_base_cost={"cs_0": cs_0_cost, "cs_1": 3},
+        cr_to_instance_demand={"cr_0": 1, "cr_1": 2},
+    )
+
+
+def _optimizer(base_data: BaseData, with_performance: bool = False) -> InitializedOptimizer:
+    if not with_performance:
+        return (
+            Optimizer("test_model_cache", sense=LpMinimize)
+            .add_modules(base_module)
+            .initialize(base_data)
+        )
+
+    return (
+        Optimizer("test_model_cache", sense=LpMinimize)
+        .add_modules(base_module, performance_module)
+        .initialize(
+            base_data,
+            PerformanceData(
+                performance_criteria=[],
+                performance_demand={},
+                performance_supply={},
+                cost_per_unit={},
+            ),
+        )
+    )
+
+
+def test_fingerprint_should_not_depend_on_order() -> None:
+    """Dictionaries with a different insertion order have the same fingerprint."""
+    base_data = _base_data()
+    reordered = _base_data()
+    reordered.cs_to_base_cost = {"cs_1": 3, "cs_0": 5}
+
+    assert fingerprint(_optimizer(base_data)) == fingerprint(_optimizer(reordered))
+
+
+def test_fingerprint_should_depend_on_data_and_modules() -> None:
+    """Different data or modules result in different fingerprints."""
+    key = fingerprint(_optimizer(_base_data()))
+
+    assert fingerprint(_optimizer(_base_data(cs_0_cost=1))) != key
+    assert fingerprint(_optimizer(_base_data(), with_performance=True)) != key
+
+
+def test_should_load_mip_from_cache(tmp_path: Path) -> None:
+    """The second run with the same data loads the MIP from the cache."""
+    cache = ModelCache(str(tmp_path))
+
+    first = cache.solve(_optimizer(_base_data()))
+    second = cache.solve(_optimizer(_base_data()))
+
+    assert first[ModelCacheStats].hit is False
+    assert second[ModelCacheStats].hit is True
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second[StepTimes].validate == timedelta()
+
+    assert second[BaseSolution] == BaseSolution(
+        cr_to_cs_matching={"cr_0": "cs_1", "cr_1": "cs_1"}, cs_instance_count={"cs_1": 3}
+    )
+    assert second[SolutionObjValue].objective_value == pytest.approx(
+        first[SolutionObjValue].objective_value
+    )
+
+
+def test_should_update_prices_of_cached_mip(tmp_path: Path) -> None:
+    """A MIP loaded from the cache can be solved with new prices without changing the entry."""
+    cache = ModelCache(str(tmp_path))
+    cache.solve(_optimizer(_base_data()))
+
+    updated = reoptimization.solve(
+        cache.build_mip(_optimizer(_base_data())), PriceUpdate(cs_to_base_cost={"cs_1": 10})
+    )
+    unchanged = cache.solve(_optimizer(_base_data()))
+
+    assert updated[ModelCacheStats].hit is True
+    assert updated[SolutionObjValue].objective_value == pytest.approx(5 * 1 + 5 * 2)
+    assert unchanged[SolutionObjValue].objective_value == pytest.approx(3 * 1 + 3 * 2)
+
+
+def test_should_evict_least_recently_used_entries(tmp_path: Path) -> None:
+    """If the cache is too large, the least recently used entries are removed."""
+    cache = ModelCache(str(tmp_path))
+    optimizers = [_optimizer(_base_data(cs_0_cost=cost)) for cost in [1, 2, 3]]
+    paths = [tmp_path / f"{fingerprint(optimizer)}.pickle" for optimizer in optimizers]
+
+    cache.build_mip(optimizers[0])
+    cache.build_mip(optimizers[1])
+    # Make sure that the entries have different access times
+    os.utime(paths[0], (0, 0))
+    os.utime(paths[1], (1, 1))
+
+    # Loading the first entry marks it as recently used
+    cache.build_mip(_optimizer(_base_data(cs_0_cost=1)))
+
+    cache.max_size = os.path.getsize(paths[0]) + os.path.getsize(paths[1])
+    cache.build_mip(optimizers[2])
+
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert set(tmp_path.iterdir()) == {paths[0], paths[2]}
@@ -0,0 +1,156 @@
+"""Tests for the fast MPS export."""
+import os
+import subprocess
+
+import pytest
+from optiframe import Optimizer, SolutionObjValue
+from pulp import (
+    PULP_CBC_CMD,
+    LpBinary,
+    LpMaximize,
+    LpMinimize,
+    LpProblem,
+    LpVariable,
+    PulpSolverError,
+)
+
+from cloud_resource_matcher.modules.base import BaseData, BaseSolution, base_module
+from cloud_resource_matcher.modules.multi_cloud import MultiCloudData, multi_cloud_module
+from cloud_resource_matcher.modules.service_limits import ServiceLimitsData, service_limits_module
+from cloud_resource_matcher.mps import DirectMpsCbcSolver, write_mps
+from cloud_resource_matcher.progress import ProgressCbcSolver
+from cloud_resource_matcher.solver import Solver, get_pulp_solver
+
+
+def _problem() -> tuple[LpProblem, LpVariable, LpVariable]:
+    problem = LpProblem("test_mps", LpMaximize)
+    x = LpVariable("x", lowBound=0, upBound=4, cat="Integer")
+    y = LpVariable("y", cat=LpBinary)
+
+    problem += 3 * x + 2 * y
+    problem += (x + y <= 4.5, "capacity")
+    problem += (x - y >= 1, "difference")
+
+    return problem, x, y
+
+
+def test_should_write_compact_names(tmp_path: pytest.TempPathFactory) -> None:
+    """The columns and rows are named by their index."""
+    problem, x, y = _problem()
+    path = f"{tmp_path}/model.mps"
+
+    names = write_mps(problem, path)
+
+    assert names.variables == [x, y]
+    assert names.constraint_names == ["capacity", "difference"]
+
+    with open(path) as file:
+        content = file.read()
+
+    lines = [line.split() for line in content.splitlines()]
+
+    assert ["L", "r0"] in lines
+    assert ["G", "r1"] in lines
+    assert ["x0", "obj", "3"] in lines
+    assert ["x1", "r1", "-1"] in lines
+    assert ["RHS", "r0", "4.5"] in lines
+    assert ["BV", "BND", "x1"] in lines
+    assert "cr_to_cs_matching" not in content
+
+
+def test_should_solve_small_problem() -> None:
+    """The solution is translated back to the variables of the problem."""
+    problem, x, y = _problem()
+
+    problem.solve(DirectMpsCbcSolver(msg=False))
+
+    assert x.value() == 4
+    assert y.value() == 0
+
+
+@pytest.mark.parametrize("track_progress", [False, True])
+def test_should_use_fast_export_from_get_pulp_solver(track_progress: bool) -> None:
+    """The fast export can be enabled with `get_pulp_solver`, also when tracking the progress."""
+    problem, x, y = _problem()
+    solver = get_pulp_solver(msg=False, track_progress=track_progress, direct_mps=True)
+
+    assert isinstance(solver, DirectMpsCbcSolver)
+    assert isinstance(solver, ProgressCbcSolver) == track_progress
+
+    problem.solve(solver)
+
+    assert x.value() == 4
+    assert y.value() == 0
+
+    if track_progress:
+        assert len(solver.progress.entries) > 0
+
+
+def test_should_reject_fast_export_for_other_solvers() -> None:
+    """The fast export is only available for CBC."""
+    with pytest.raises(RuntimeError):
+        get_pulp_solver(solver=Solver.SCIP, direct_mps=True)
+
+
+def test_should_delete_temporary_files_if_solver_fails(
+    tmp_path: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The temporary files are deleted even if the solver fails."""
+    problem, _, _ = _problem()
+    solver = DirectMpsCbcSolver(msg=False)
+    solver.tmpDir = str(tmp_path)
+
+    monkeypatch.setattr(subprocess, "call", lambda *args, **kwargs: 1)
+
+    with pytest.raises(PulpSolverError):
+        problem.solve(solver)
+
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_should_obtain_same_solution_as_default_export() -> None:
+    """Solving with the fast export results in the same solution."""
+    cr_count = 12
+    cs_count = 6
+
+    def _solve(solver: PULP_CBC_CMD) -> tuple[float, BaseSolution]:
+        data = (
+            Optimizer("test_mps", sense=LpMinimize)
+            .add_modules(base_module, service_limits_module, multi_cloud_module)
+            .initialize(
+                BaseData(
+                    cloud_resources=[f"cr_{cr}" for cr in range(cr_count)],
+                    cloud_services=[f"cs_{cs}" for cs in range(cs_count)],
+                    cr_to_cs_list={
+                        f"cr_{cr}": [f"cs_{cs}" for cs in range(cs_count) if (cr + cs) % 3 != 0]
+                        for cr in range(cr_count)
+                    },
+                    cs_to_base_cost={f"cs_{cs}": cs + 1 for cs in range(cs_count)},
+                    cr_to_instance_demand={f"cr_{cr}": cr % 3 + 1 for cr in range(cr_count)},
+                ),
+                ServiceLimitsData(
+                    cs_to_instance_limit={f"cs_{cs}": 10 for cs in range(cs_count)},
+                    cr_to_max_instance_demand={f"cr_{cr}": cr % 3 + 1 for cr in range(cr_count)},
+                ),
+                MultiCloudData(
+                    cloud_service_providers=["csp_0", "csp_1"],
+                    csp_to_cs_list={
+                        "csp_0": ["cs_0", "cs_2", "cs_4"],
+                        "csp_1": ["cs_1", "cs_3", "cs_5"],
+                    },
+                    min_csp_count=1,
+                    max_csp_count=1,
+                    csp_to_cost={"csp_0": 10, "csp_1": 5},
+                ),
+            )
+            .solve(solver)
+        )
+        return data[SolutionObjValue].objective_value, data[BaseSolution]
+
+    expected_cost, expected_solution = _solve(PULP_CBC_CMD(msg=False))
+    actual_cost, actual_solution = _solve(DirectMpsCbcSolver(msg=False))
+
+    assert actual_cost == pytest.approx(expected_cost)
+    assert sum(actual_solution.cs_instance_count.values()) == sum(
+        expected_solution.cs_instance_count.values()
+    )
@@ -0,0 +1,113 @@
+"""Tests for racing solver configurations against each other."""
+import time
+from pathlib import Path
+from typing import Optional
+
+import pulp
+from optiframe import Optimizer, SolutionObjValue
+from pulp import LpMinimize
+
+from cloud_resource_matcher.modules.base import BaseData, base_module
+from cloud_resource_matcher.portfolio import (
+    PortfolioSolver,
+    SolverConfiguration,
+    default_portfolio,
+)
+from cloud_resource_matcher.solver import Solver
+
+
+def _problem() -> pulp.LpProblem:
+    problem = pulp.LpProblem("test_portfolio", LpMinimize)
+    x = pulp.LpVariable("x", 0, 10, cat=pulp.LpInteger)
+    y = pulp.LpVariable("y", 0, 10, cat=pulp.LpInteger)
+
+    problem += 3 * x + 2 * y
+    problem += x + y >= 3.5
+    problem += x - y <= 1
+
+    return problem
+
+
+class _SleepingConfiguration(SolverConfiguration):
+    """A configuration that never finishes on its own."""
+
+    script: str
+
+    def __init__(self, script: str):
+        super().__init__(Solver.CBC, name="sleeping")
+        self.script = script
+
+    def path(self) -> Optional[str]:
+        return self.script
+
+
+def test_default_portfolio_should_only_contain_installed_solvers() -> None:
+    """CBC is always installed, the other solvers are only used if they are available."""
+    portfolio = default_portfolio(seed_count=2)
+
+    assert [configuration.name for configuration in portfolio][:3] == [
+        "cbc",
+        "cbc_seed_1",
+        "cbc_seed_2",
+    ]
+    assert all(configuration.path() is not None for configuration in portfolio)
+
+
+def test_should_solve_optimization_problem() -> None:
+    """The portfolio can be used like any other solver."""
+    solver = PortfolioSolver(default_portfolio(seed_count=1))
+    result = (
+        Optimizer("test_portfolio", sense=LpMinimize)
+        .add_modules(base_module)
+        .initialize(
+            BaseData(
+                cloud_resources=["cr_0"],
+                cloud_services=["cs_0", "cs_1"],
+                cr_to_cs_list={"cr_0": ["cs_0", "cs_1"]},
+                cs_to_base_cost={"cs_0": 5, "cs_1": 3},
+                cr_to_instance_demand={"cr_0": 2},
+            )
+        )
+        .solve(solver)
+    )
+
+    assert result[SolutionObjValue].objective_value == 6
+    assert solver.winner in {"cbc", "cbc_seed_1"}
+
+
+def test_should_stop_other_configurations(tmp_path: Path) -> None:
+    """The remaining configurations are stopped once a configuration proved optimality."""
+    script = tmp_path / "sleep.sh"
+    script.write_text("#!/bin/sh\nsleep 30\n")
+    script.chmod(0o755)
+
+    problem = _problem()
+    solver = PortfolioSolver(
+        [_SleepingConfiguration(str(script)), SolverConfiguration(Solver.CBC, name="cbc")]
+    )
+
+    start = time.monotonic()
+    problem.solve(solver)
+
+    assert time.monotonic() - start < 10
+    assert solver.winner == "cbc"
+    assert problem.sol_status == pulp.LpSolutionOptimal
+    assert pulp.value(problem.objective) == 8
+
+
+def test_should_use_best_solution_if_not_proven_optimal() -> None:
+    """Without a proof of optimality, the best solution of any configuration is used."""
+    problem = _problem()
+    solver = PortfolioSolver(
+        [
+            SolverConfiguration(Solver.CBC, options=["maxSolutions", "1"], name="first"),
+            SolverConfiguration(
+                Solver.CBC, options=["maxSolutions", "1", "randomCbcSeed", "1"], name="second"
+            ),
+        ]
+    )
+
+    problem.solve(solver)
+
+    assert solver.winner in {"first", "second"}
+    assert problem.sol_status == pulp.LpSolutionIntegerFeasible
@@ -0,0 +1,134 @@
+"""Tests for tracking the progress of the solver."""
+import pytest
+from optiframe import Optimizer, SolutionObjValue
+from optiframe.framework import InitializedOptimizer
+from pulp import LpMinimize
+
+from cloud_resource_matcher.modules.base import BaseData, base_module
+from cloud_resource_matcher.modules.multi_cloud import MultiCloudData, multi_cloud_module
+from cloud_resource_matcher.progress import (
+    CbcLogParser,
+    ProgressCbcSolver,
+    SolverProgress,
+    SolverProgressLog,
+    progress_module,
+)
+from cloud_resource_matcher.solver import Solver, get_pulp_solver
+
+
+def _optimizer() -> InitializedOptimizer:
+    return (
+        Optimizer("test_progress", sense=LpMinimize)
+        .add_modules(base_module, multi_cloud_module, progress_module)
+        .initialize(
+            BaseData(
+                cloud_resources=["cr_0", "cr_1", "cr_2"],
+                cloud_services=["cs_0", "cs_1", "cs_2", "cs_3"],
+                cr_to_cs_list={
+                    "cr_0": ["cs_0", "cs_2"],
+                    "cr_1": ["cs_1", "cs_3"],
+                    "cr_2": ["cs_0", "cs_3"],
+                },
+                cs_to_base_cost={"cs_0": 3, "cs_1": 1, "cs_2": 2, "cs_3": 4},
+                cr_to_instance_demand={"cr_0": 1, "cr_1": 2, "cr_2": 1},
+            ),
+            MultiCloudData(
+                cloud_service_providers=["csp_0", "csp_1"],
+                csp_to_cs_list={"csp_0": ["cs_0", "cs_1"], "csp_1": ["cs_2", "cs_3"]},
+                min_csp_count=1,
+                max_csp_count=1,
+                csp_to_cost={"csp_0": 5, "csp_1": 2},
+            ),
+        )
+    )
+
+
+def test_should_parse_cbc_log() -> None:
+    """The incumbent, the bound and the nodes are parsed from the log lines of CBC."""
+    parser = CbcLogParser()
+
+    assert parser.parse_line("Welcome to the CBC MILP Solver") is None
+
+    progress = parser.parse_line("Continuous objective value is 10 - 0.00 seconds")
+    assert progress is not None
+    assert (progress.incumbent, progress.best_bound, progress.gap) == (None, 10, None)
+
+    progress = parser.parse_line(
+        "Cbc0012I Integer solution of 20 found by DiveCoefficient after 0 iterations and 0 nodes"
+        " (0.00 seconds)"
+    )
+    assert progress is not None
+    assert (progress.incumbent, progress.best_bound, progress.gap) == (20, 10, 0.5)
+
+    progress = parser.parse_line(
+        "Cbc0010I After 100 nodes, 12 on tree, 15 best solution, best possible 12 (0.50 seconds)"
+    )
+    assert progress is not None
+    assert (progress.incumbent, progress.best_bound, progress.node_count) == (15, 12, 100)
+
+    progress = parser.parse_line(
+        "Cbc0001I Search completed - best objective 15, took 20 iterations and 120 nodes"
+        " (0.60 seconds)"
+    )
+    assert progress is not None
+    assert (progress.incumbent, progress.best_bound, progress.node_count) == (15, 15, 120)
+    assert progress.gap == 0
+
+    # The statistics after the end of the search don't change the progress
+    assert parser.parse_line("Cuts at root node changed objective from 10 to 11") is None
+
+
+def test_should_parse_cbc_summary() -> None:
+    """Problems solved by the pre-processing only report the result in the summary."""
+    parser = CbcLogParser()
+
+    parser.parse_line("Continuous objective value is 13 - 0.00 seconds")
+    assert parser.parse_line("Cuts at root node changed objective from 13 to -1.79769e+308") is None
+    assert parser.parse_line("Result - Optimal solution found") is None
+
+    progress = parser.parse_line("Objective value:                13.00000000")
+    assert progress is not None
+    assert (progress.incumbent, progress.best_bound, progress.gap) == (13, 13, 0)
+
+
+def test_should_ignore_missing_incumbent() -> None:
+    """CBC reports a huge objective value if no solution has been found yet."""
+    parser = CbcLogParser()
+
+    progress = parser.parse_line(
+        "Cbc0010I After 100 nodes, 12 on tree, 1e+50 best solution, best possible 12"
+        " (0.50 seconds)"
+    )
+    assert progress is not None
+    assert progress.incumbent is None
+    assert progress.gap is None
+
+
+def test_should_record_progress() -> None:
+    """The progress is passed to the callback and recorded in the step data."""
+    received: list[SolverProgress] = []
+    solver = get_pulp_solver(msg=False, track_progress=True, on_progress=received.append)
+    assert isinstance(solver, ProgressCbcSolver)
+
+    result = _optimizer().validate().pre_processing().build_mip().solve(solver)
+    progress_log: SolverProgressLog = result[SolverProgressLog]
+
+    assert len(progress_log.entries) > 0
+    assert progress_log.entries == received
+    assert progress_log.entries[-1].incumbent == pytest.approx(
+        result[SolutionObjValue].objective_value
+    )
+    assert progress_log.gap_over_time()[-1][1] == 0
+
+
+def test_should_record_empty_progress_without_tracking() -> None:
+    """The progress log is empty if the solver doesn't track its progress."""
+    result = _optimizer().validate().pre_processing().build_mip().solve(get_pulp_solver(msg=False))
+
+    assert result[SolverProgressLog].entries == []
+
+
+def test_should_reject_unsupported_solver() -> None:
+    """Only the log of CBC can be followed."""
+    with pytest.raises(RuntimeError):
+        get_pulp_solver(solver=Solver.SCIP, track_progress=True)
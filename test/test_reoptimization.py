@@ -0,0 +1,217 @@
+"""Tests for the re-optimization after price changes."""
+import copy
+from typing import Any
+
+import numpy as np
+import pytest
+from optiframe import Optimizer, SolutionObjValue
+from optiframe.framework import InitializedOptimizer
+from pulp import LpMinimize
+
+from cloud_resource_matcher.modules.aggregation import aggregation_module
+from cloud_resource_matcher.modules.base import BaseData, BaseSolution, base_module
+from cloud_resource_matcher.modules.candidate_fixing import candidate_fixing_module
+from cloud_resource_matcher.modules.multi_cloud import MultiCloudData, multi_cloud_module
+from cloud_resource_matcher.modules.network import (
+    NetworkData,
+    NetworkFormulation,
+    NetworkMipData,
+    SymmetricLocationMatrix,
+    network_module,
+)
+from cloud_resource_matcher.modules.performance import PerformanceData, performance_module
+from cloud_resource_matcher.reoptimization import PriceUpdate, solve, update_prices
+from cloud_resource_matcher.validation import ValidationError, validate
+
+
+def _data(formulation: NetworkFormulation) -> list[Any]:
+    locations = {"loc_0", "loc_1"}
+
+    return [
+        BaseData(
+            cloud_resources=["cr_0", "cr_1"],
+            cloud_services=["cs_0", "cs_1", "cs_2"],
+            cr_to_cs_list={"cr_0": ["cs_0", "cs_1", "cs_2"], "cr_1": ["cs_0", "cs_1", "cs_2"]},
+            cs_to_base_cost={"cs_0": 5, "cs_1": 3, "cs_2": 4},
+            cr_to_instance_demand={"cr_0": 1, "cr_1": 2},
+        ),
+        PerformanceData(
+            performance_criteria=["vCPUs"],
+            performance_demand={("cr_0", "vCPUs"): 2, ("cr_1", "vCPUs"): 1},
+            performance_supply={("cs_0", "vCPUs"): 2, ("cs_1", "vCPUs"): 2, ("cs_2", "vCPUs"): 2},
+            cost_per_unit={("cs_0", "vCPUs"): 1, ("cs_1", "vCPUs"): 1, ("cs_2", "vCPUs"): 1},
+        ),
+        NetworkData(
+            locations=locations,
+            loc_and_loc_to_latency={(loc1, loc2): 0 for loc1 in locations for loc2 in locations},
+            cs_to_loc={"cs_0": "loc_0", "cs_1": "loc_1", "cs_2": "loc_0"},
+            cr_and_loc_to_traffic={("cr_0", "loc_0"): 1},
+            cr_and_loc_to_max_latency={},
+            cr_and_cr_to_traffic={("cr_0", "cr_1"): 2},
+            cr_and_cr_to_max_latency={},
+            loc_and_loc_to_cost={
+                ("loc_0", "loc_0"): 0,
+                ("loc_0", "loc_1"): 1,
+                ("loc_1", "loc_0"): 1,
+                ("loc_1", "loc_1"): 0,
+            },
+            formulation=formulation,
+        ),
+        MultiCloudData(
+            cloud_service_providers=["csp_0", "csp_1"],
+            csp_to_cs_list={"csp_0": ["cs_0", "cs_1"], "csp_1": ["cs_2"]},
+            min_csp_count=1,
+            max_csp_count=2,
+            csp_to_cost={"csp_0": 1, "csp_1": 1},
+        ),
+    ]
+
+
+def _optimizer(data: list[Any]) -> InitializedOptimizer:
+    return (
+        Optimizer("test_reoptimization", sense=LpMinimize)
+        .add_modules(base_module, performance_module, network_module, multi_cloud_module)
+        .initialize(*copy.deepcopy(data))
+    )
+
+
+@pytest.mark.parametrize("formulation", list(NetworkFormulation))
+def test_should_obtain_same_solution_as_rebuilt_model(formulation: NetworkFormulation) -> None:
+    """The updated model has the same optimum as a model built with the new prices."""
+    data = _data(formulation)
+    built = validate(_optimizer(data)).pre_processing().build_mip()
+    built.solve()
+
+    prices = PriceUpdate(
+        cs_to_base_cost={"cs_1": 10},
+        cost_per_unit={("cs_2", "vCPUs"): 0},
+        loc_and_loc_to_cost={("loc_0", "loc_1"): 5, ("loc_1", "loc_0"): 5},
+        csp_to_cost={"csp_1": 0},
+    )
+    actual = solve(built, prices)
+
+    base_data, performance_data, network_data, multi_cloud_data = data
+    base_data.cs_to_base_cost.update(prices.cs_to_base_cost)
+    performance_data.cost_per_unit.update(prices.cost_per_unit)
+    network_data.loc_and_loc_to_cost.update(prices.loc_and_loc_to_cost)
+    multi_cloud_data.csp_to_cost.update(prices.csp_to_cost)
+    expected = _optimizer(data).solve()
+
+    assert actual[BaseSolution] == expected[BaseSolution]
+    assert actual[SolutionObjValue].objective_value == pytest.approx(
+        expected[SolutionObjValue].objective_value
+    )
+
+
+def test_should_overlay_changed_costs_on_location_matrix() -> None:
+    """The changed network costs take precedence over the location matrix."""
+    data = _data(NetworkFormulation.CS_PAIRS)
+    data[2].loc_and_loc_to_cost = SymmetricLocationMatrix(["loc_0", "loc_1"], np.array([0, 1, 0]))
+    built = validate(_optimizer(data)).pre_processing().build_mip()
+    built.solve()
+
+    prices = PriceUpdate(loc_and_loc_to_cost={("loc_0", "loc_1"): 5, ("loc_1", "loc_0"): 5})
+    actual = solve(built, prices)
+
+    data[2].loc_and_loc_to_cost = {
+        ("loc_0", "loc_0"): 0,
+        ("loc_0", "loc_1"): 5,
+        ("loc_1", "loc_0"): 5,
+        ("loc_1", "loc_1"): 0,
+    }
+    expected = _optimizer(data).solve()
+
+    assert actual[SolutionObjValue].objective_value == pytest.approx(
+        expected[SolutionObjValue].objective_value
+    )
+
+
+def test_should_update_costs_of_fixed_crs() -> None:
+    """The costs of the CRs without a variable are part of the objective's constant."""
+    built = (
+        Optimizer("test_reoptimization", sense=LpMinimize)
+        .add_modules(base_module, candidate_fixing_module)
+        .initialize(
+            BaseData(
+                cloud_resources=["cr_0", "cr_1"],
+                cloud_services=["cs_0", "cs_1"],
+                cr_to_cs_list={"cr_0": ["cs_0"], "cr_1": ["cs_0", "cs_1"]},
+                cs_to_base_cost={"cs_0": 1, "cs_1": 2},
+                cr_to_instance_demand={"cr_0": 2, "cr_1": 1},
+            )
+        )
+        .validate()
+        .pre_processing()
+        .build_mip()
+    )
+
+    result = solve(built, PriceUpdate(cs_to_base_cost={"cs_0": 3}))
+
+    assert result[BaseSolution].cr_to_cs_matching == {"cr_0": "cs_0", "cr_1": "cs_1"}
+    assert result[SolutionObjValue].objective_value == pytest.approx(2 * 3 + 2)
+
+
+def test_should_update_costs_of_crs_with_different_demands() -> None:
+    """CRs that only cost the same because of a zero price are not aggregated."""
+    data = [
+        BaseData(
+            cloud_resources=["cr_0", "cr_1"],
+            cloud_services=["cs_0", "cs_1"],
+            cr_to_cs_list={"cr_0": ["cs_0", "cs_1"], "cr_1": ["cs_0", "cs_1"]},
+            cs_to_base_cost={"cs_0": 1, "cs_1": 2},
+            cr_to_instance_demand={"cr_0": 1, "cr_1": 1},
+        ),
+        PerformanceData(
+            performance_criteria=["vCPUs"],
+            performance_demand={("cr_0", "vCPUs"): 1, ("cr_1", "vCPUs"): 4},
+            performance_supply={("cs_0", "vCPUs"): 4, ("cs_1", "vCPUs"): 4},
+            cost_per_unit={("cs_0", "vCPUs"): 0, ("cs_1", "vCPUs"): 0},
+        ),
+    ]
+    optimizer = (
+        Optimizer("test_reoptimization", sense=LpMinimize)
+        .add_modules(base_module, performance_module, aggregation_module)
+        .initialize(*data)
+    )
+    built = validate(optimizer).pre_processing().build_mip()
+    built.solve()
+
+    result = solve(built, PriceUpdate(cost_per_unit={("cs_0", "vCPUs"): 1}))
+
+    # cr_0 stays on cs_0, the higher demand of cr_1 makes cs_1 cheaper
+    assert result[BaseSolution].cr_to_cs_matching == {"cr_0": "cs_0", "cr_1": "cs_1"}
+    assert result[SolutionObjValue].objective_value == pytest.approx(1 + 1 + 2)
+
+
+def test_should_reject_unknown_entities() -> None:
+    """Prices for unknown entities are reported as violations."""
+    built = validate(_optimizer(_data(NetworkFormulation.CS_PAIRS))).pre_processing().build_mip()
+
+    with pytest.raises(ValidationError) as error:
+        update_prices(built, PriceUpdate(cs_to_base_cost={"cs_3": 1}, csp_to_cost={"csp_2": 1}))
+
+    assert len(error.value.violations) == 2
+
+
+@pytest.mark.parametrize("formulation", list(NetworkFormulation))
+def test_should_add_skipped_connections_with_new_costs(formulation: NetworkFormulation) -> None:
+    """A CR -> CR connection with only free location pairs is added once a pair gets a cost."""
+    data = _data(formulation)
+    data[2].loc_and_loc_to_cost = {key: 0 for key in data[2].loc_and_loc_to_cost}
+    built = validate(_optimizer(data)).pre_processing().build_mip()
+    before = dict(built.solve()[BaseSolution].cr_to_cs_matching)
+
+    assert built.workflow.step_data[NetworkMipData].skipped_cr_connections == [("cr_0", "cr_1")]
+
+    prices = PriceUpdate(loc_and_loc_to_cost={("loc_1", "loc_1"): 5})
+    actual = solve(built, prices)
+
+    data[2].loc_and_loc_to_cost.update(prices.loc_and_loc_to_cost)
+    expected = _optimizer(data).solve()
+
+    assert built.workflow.step_data[NetworkMipData].skipped_cr_connections == []
+    assert actual[BaseSolution] == expected[BaseSolution]
+    assert actual[SolutionObjValue].objective_value == pytest.approx(
+        expected[SolutionObjValue].objective_value
+    )
+    assert actual[BaseSolution].cr_to_cs_matching != before
@@ -0,0 +1,175 @@
+"""Tests for the parallel scenario sweeps."""
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+from optiframe import Optimizer
+from optiframe.framework import InitializedOptimizer
+from pulp import LpMinimize
+
+from cloud_resource_matcher.modules.base import BaseData, base_module
+from cloud_resource_matcher.modules.multi_cloud import MultiCloudData, multi_cloud_module
+from cloud_resource_matcher.modules.network import NetworkData, network_module
+from cloud_resource_matcher.reoptimization import PriceUpdate
+from cloud_resource_matcher.scenarios import (
+    Scenario,
+    _init_worker,
+    _solve_scenario,
+    run_scenarios,
+)
+from cloud_resource_matcher.solver import get_pulp_solver
+from cloud_resource_matcher.validation import ValidationError, validate
+
+
+def _optimizer() -> InitializedOptimizer:
+    return (
+        Optimizer("test_scenarios", sense=LpMinimize)
+        .add_modules(base_module, multi_cloud_module)
+        .initialize(
+            BaseData(
+                cloud_resources=["cr_0", "cr_1"],
+                cloud_services=["cs_0", "cs_1", "cs_2"],
+                cr_to_cs_list={"cr_0": ["cs_0", "cs_1"], "cr_1": ["cs_0", "cs_2"]},
+                cs_to_base_cost={"cs_0": 2, "cs_1": 3, "cs_2": 3},
+                cr_to_instance_demand={"cr_0": 1, "cr_1": 1},
+            ),
+            MultiCloudData(
+                cloud_service_providers=["csp_0", "csp_1"],
+                csp_to_cs_list={"csp_0": ["cs_0"], "csp_1": ["cs_1", "cs_2"]},
+                min_csp_count=1,
+                max_csp_count=2,
+                csp_to_cost={"csp_0": 0, "csp_1": 0},
+            ),
+        )
+    )
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_should_solve_all_scenarios(tmp_path: Path, max_workers: int) -> None:
+    """Every scenario is solved on its own copy of the MIP."""
+    output_path = tmp_path / "results.jsonl"
+    scenarios = [
+        Scenario("expensive_csp_0", prices=PriceUpdate(cs_to_base_cost={"cs_0": 4})),
+        Scenario("two_csps", min_csp_count=2),
+        Scenario("unchanged"),
+        Scenario("too_many_csps", min_csp_count=3, max_csp_count=3),
+    ]
+
+    baseline, *results = run_scenarios(
+        _optimizer(),
+        scenarios,
+        output_path=str(output_path),
+        solver=get_pulp_solver(msg=False),
+        max_workers=max_workers,
+    )
+
+    assert baseline.objective_value == pytest.approx(4)
+    assert baseline.selected_csps == ["csp_0"]
+    assert [result.name for result in results] == [scenario.name for scenario in scenarios]
+
+    expensive, two_csps, unchanged, too_many = results
+    assert expensive.objective_value == pytest.approx(6)
+    assert expensive.changed_assignments == {"cr_0": ("cs_0", "cs_1"), "cr_1": ("cs_0", "cs_2")}
+    assert two_csps.objective_value == pytest.approx(5)
+    assert two_csps.selected_csps == ["csp_0", "csp_1"]
+    assert len(two_csps.changed_assignments) == 1
+    assert unchanged.objective_value == pytest.approx(4)
+    assert unchanged.changed_assignments == dict()
+    assert too_many.feasible is False
+
+    lines = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert lines[0]["name"] == "baseline"
+    assert {line["name"] for line in lines[1:]} == {scenario.name for scenario in scenarios}
+    assert next(line for line in lines if line["name"] == "expensive_csp_0")[
+        "changed_assignments"
+    ] == {"cr_0": {"from": "cs_0", "to": "cs_1"}, "cr_1": {"from": "cs_0", "to": "cs_2"}}
+
+
+def test_should_reject_invalid_scenarios() -> None:
+    """Duplicate names and invalid prices or CSP counts are reported as violations."""
+    scenarios = [
+        Scenario("scenario", prices=PriceUpdate(cs_to_base_cost={"cs_3": 1})),
+        Scenario("scenario", min_csp_count=2, max_csp_count=1),
+    ]
+
+    with pytest.raises(ValidationError) as error:
+        run_scenarios(_optimizer(), scenarios, max_workers=1)
+
+    assert len(error.value.violations) == 3
+
+
+def _network_optimizer() -> InitializedOptimizer:
+    locations = {"loc_0", "loc_1"}
+
+    # All location pairs are free, so the CR -> CR connection is left out of the MIP.
+    # Both CRs are deployed to cs_0 as long as loc_0 -> loc_0 is free.
+    return (
+        Optimizer("test_scenarios", sense=LpMinimize)
+        .add_modules(base_module, network_module)
+        .initialize(
+            BaseData(
+                cloud_resources=["cr_0", "cr_1"],
+                cloud_services=["cs_0", "cs_1"],
+                cr_to_cs_list={"cr_0": ["cs_0", "cs_1"], "cr_1": ["cs_0", "cs_1"]},
+                cs_to_base_cost={"cs_0": 2, "cs_1": 3},
+                cr_to_instance_demand={"cr_0": 1, "cr_1": 1},
+            ),
+            NetworkData(
+                locations=locations,
+                loc_and_loc_to_latency={
+                    (loc1, loc2): 0 for loc1 in locations for loc2 in locations
+                },
+                cs_to_loc={"cs_0": "loc_0", "cs_1": "loc_1"},
+                cr_and_loc_to_traffic={},
+                cr_and_loc_to_max_latency={},
+                cr_and_cr_to_traffic={("cr_0", "cr_1"): 1},
+                cr_and_cr_to_max_latency={},
+                loc_and_loc_to_cost={(loc1, loc2): 0 for loc1 in locations for loc2 in locations},
+            ),
+        )
+    )
+
+
+def test_should_add_skipped_connections_with_new_costs() -> None:
+    """A scenario that puts a cost on a free location pair is solved like a rebuilt model."""
+    scenarios = [
+        Scenario("paid_network", prices=PriceUpdate(loc_and_loc_to_cost={("loc_0", "loc_0"): 5})),
+    ]
+
+    baseline, paid_network = run_scenarios(_network_optimizer(), scenarios, max_workers=1)
+
+    assert baseline.objective_value == 4
+    assert paid_network.feasible is True
+    assert paid_network.objective_value == 5
+    assert len(paid_network.changed_assignments) == 1
+
+
+def test_should_reject_invalid_prices_before_solving(tmp_path: Path) -> None:
+    """The scenarios are validated before any is solved."""
+    output_path = tmp_path / "results.jsonl"
+    scenarios = [
+        Scenario("unchanged"),
+        Scenario("unknown_cs", prices=PriceUpdate(cs_to_base_cost={"cs_9": 1})),
+    ]
+
+    with pytest.raises(ValidationError) as error:
+        run_scenarios(_optimizer(), scenarios, output_path=str(output_path))
+
+    assert error.value.violations == ["Scenario unknown_cs: Base cost for unknown CS cs_9"]
+    assert not output_path.exists()
+
+
+def test_should_report_violations_of_single_scenario() -> None:
+    """A scenario that can't be applied in the worker doesn't abort the others."""
+    built = validate(_optimizer()).pre_processing().build_mip()
+    shared_data = pickle.dumps((built.workflow.workflow, built.workflow.step_data))
+    _init_worker(shared_data, dict(), get_pulp_solver(msg=False))
+
+    result = _solve_scenario(
+        Scenario("unknown_cs", prices=PriceUpdate(cs_to_base_cost={"cs_9": 1}))
+    )
+
+    assert result.feasible is False
+    assert result.violations == ["Base cost for unknown CS cs_9"]
+    assert result.to_json()["violations"] == result.violations
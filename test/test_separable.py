@@ -0,0 +1,153 @@
+"""Tests for the fast path for separable problem instances."""
+import pytest
+from optiframe import InfeasibleError, ModelSize, Optimizer, SolutionObjValue
+from optiframe.framework import InitializedOptimizer
+from pulp import LpMinimize
+
+from cloud_resource_matcher.modules.base import BaseData, BaseSolution, base_module
+from cloud_resource_matcher.modules.multi_cloud import MultiCloudData, multi_cloud_module
+from cloud_resource_matcher.modules.network import NetworkData, network_module
+from cloud_resource_matcher.modules.performance import PerformanceData, performance_module
+from cloud_resource_matcher.separable import is_separable, solve
+
+CR_COUNT = 20
+CS_COUNT = 10
+LOC_COUNT = 3
+
+
+def _base_data() -> BaseData:
+    return BaseData(
+        cloud_resources=[f"cr_{cr}" for cr in range(CR_COUNT)],
+        cloud_services=[f"cs_{cs}" for cs in range(CS_COUNT)],
+        cr_to_cs_list={
+            f"cr_{cr}": [f"cs_{cs}" for cs in range(CS_COUNT) if (cr + cs) % 3 != 0]
+            for cr in range(CR_COUNT)
+        },
+        cs_to_base_cost={f"cs_{cs}": (cs * 7) % 11 + 1 for cs in range(CS_COUNT)},
+        cr_to_instance_demand={f"cr_{cr}": cr % 4 + 1 for cr in range(CR_COUNT)},
+    )
+
+
+def _performance_data() -> PerformanceData:
+    return PerformanceData(
+        performance_criteria=["vCPUs", "RAM"],
+        performance_demand={
+            **{(f"cr_{cr}", "vCPUs"): cr % 4 for cr in range(CR_COUNT)},
+            **{(f"cr_{cr}", "RAM"): cr % 3 + 1 for cr in range(CR_COUNT)},
+        },
+        performance_supply={
+            **{(f"cs_{cs}", "vCPUs"): cs % 5 + 1 for cs in range(CS_COUNT)},
+            **{(f"cs_{cs}", "RAM"): 4 for cs in range(CS_COUNT)},
+        },
+        cost_per_unit={(f"cs_{cs}", "RAM"): cs % 3 for cs in range(CS_COUNT)},
+    )
+
+
+def _network_data(cr_and_cr_to_traffic: dict[tuple[str, str], int]) -> NetworkData:
+    locations = [f"loc_{loc}" for loc in range(LOC_COUNT)]
+
+    return NetworkData(
+        locations=set(locations),
+        loc_and_loc_to_latency={
+            (f"loc_{loc1}", f"loc_{loc2}"): abs(loc1 - loc2) * 10
+            for loc1 in range(LOC_COUNT)
+            for loc2 in range(LOC_COUNT)
+        },
+        cs_to_loc={f"cs_{cs}": f"loc_{cs % LOC_COUNT}" for cs in range(CS_COUNT)},
+        cr_and_loc_to_traffic={(f"cr_{cr}", f"loc_{cr % LOC_COUNT}"): cr for cr in range(CR_COUNT)},
+        cr_and_loc_to_max_latency={(f"cr_{cr}", "loc_0"): 10 for cr in range(0, CR_COUNT, 5)},
+        cr_and_cr_to_traffic=cr_and_cr_to_traffic,
+        cr_and_cr_to_max_latency={},
+        loc_and_loc_to_cost={
+            (f"loc_{loc1}", f"loc_{loc2}"): 0 if loc1 == loc2 else loc1 + loc2 + 1
+            for loc1 in range(LOC_COUNT)
+            for loc2 in range(LOC_COUNT)
+        },
+    )
+
+
+def _optimizer() -> InitializedOptimizer:
+    return (
+        Optimizer("test_separable", sense=LpMinimize)
+        .add_modules(base_module, performance_module, network_module)
+        .initialize(_base_data(), _performance_data(), _network_data({}))
+    )
+
+
+def test_should_detect_separable_problem() -> None:
+    """Without coupling between the CRs, the problem is separable."""
+    assert is_separable(_optimizer())
+
+
+def test_should_not_be_separable_with_cr_to_cr_traffic() -> None:
+    """Traffic between CRs couples their deployments."""
+    optimizer = (
+        Optimizer("test_separable", sense=LpMinimize)
+        .add_modules(base_module, performance_module, network_module)
+        .initialize(_base_data(), _performance_data(), _network_data({("cr_0", "cr_1"): 5}))
+    )
+
+    assert not is_separable(optimizer)
+
+
+def test_should_be_separable_with_idle_cr_to_cr_connection() -> None:
+    """A connection without traffic and maximum latency is left out of the MIP."""
+    optimizer = (
+        Optimizer("test_separable", sense=LpMinimize)
+        .add_modules(base_module, performance_module, network_module)
+        .initialize(_base_data(), _performance_data(), _network_data({("cr_0", "cr_1"): 0}))
+    )
+
+    assert is_separable(optimizer)
+    assert solve(optimizer)[ModelSize] == ModelSize(variable_count=0, constraint_count=0)
+
+
+def test_should_not_be_separable_with_multi_cloud_module() -> None:
+    """The CSP count constraints couple the CRs."""
+    optimizer = (
+        Optimizer("test_separable", sense=LpMinimize)
+        .add_modules(base_module, multi_cloud_module)
+        .initialize(
+            _base_data(),
+            MultiCloudData(
+                cloud_service_providers=["csp_0"],
+                csp_to_cs_list={"csp_0": [f"cs_{cs}" for cs in range(CS_COUNT)]},
+                min_csp_count=1,
+                max_csp_count=1,
+                csp_to_cost={"csp_0": 0},
+            ),
+        )
+    )
+
+    assert not is_separable(optimizer)
+
+
+def test_should_match_mip_solution() -> None:
+    """The fast path obtains the same solution as solving the MIP."""
+    expected = _optimizer().solve()
+    actual = solve(_optimizer())
+
+    assert actual[ModelSize] == ModelSize(variable_count=0, constraint_count=0)
+    assert actual[SolutionObjValue].objective_value == pytest.approx(
+        expected[SolutionObjValue].objective_value
+    )
+
+    expected_base: BaseSolution = expected[BaseSolution]
+    actual_base: BaseSolution = actual[BaseSolution]
+    assert actual_base.cr_to_cs_matching.keys() == expected_base.cr_to_cs_matching.keys()
+    assert sum(actual_base.cs_instance_count.values()) == sum(
+        expected_base.cs_instance_count.values()
+    )
+
+
+def test_should_be_infeasible_without_applicable_cs() -> None:
+    """A CR without any applicable CS makes the problem infeasible."""
+    base_data = _base_data()
+    base_data.cr_to_cs_list["cr_0"] = []
+
+    optimizer = (
+        Optimizer("test_separable", sense=LpMinimize).add_modules(base_module).initialize(base_data)
+    )
+
+    with pytest.raises(InfeasibleError):
+        solve(optimizer)
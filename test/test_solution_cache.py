@@ -0,0 +1,114 @@
+"""Tests for the cache of solutions of repeated optimization requests."""
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import pulp
+from optiframe import Optimizer, SolutionObjValue
+from optiframe.framework import InitializedOptimizer
+from pulp import LpMinimize
+
+from cloud_resource_matcher.modules.base import BaseData, BaseSolution, base_module
+from cloud_resource_matcher.modules.multi_cloud import (
+    MultiCloudData,
+    MultiCloudSolution,
+    multi_cloud_module,
+)
+from cloud_resource_matcher.solution_cache import SolutionCache, SolutionCacheStats
+from cloud_resource_matcher.solver import get_pulp_solver
+
+
+def _optimizer(cs_0_cost: float = 5) -> InitializedOptimizer:
+    return (
+        Optimizer("test_solution_cache", sense=LpMinimize)
+        .add_modules(base_module, multi_cloud_module)
+        .initialize(
+            BaseData(
+                cloud_resources=["cr_0", "cr_1"],
+                cloud_services=["cs_0", "cs_1"],
+                cr_to_cs_list={"cr_0": ["cs_0", "cs_1"], "cr_1": ["cs_0", "cs_1"]},
+                cs_to_base_cost={"cs_0": cs_0_cost, "cs_1": 3},
+                cr_to_instance_demand={"cr_0": 1, "cr_1": 2},
+            ),
+            MultiCloudData(
+                cloud_service_providers=["csp_0", "csp_1"],
+                csp_to_cs_list={"csp_0": ["cs_0"], "csp_1": ["cs_1"]},
+                min_csp_count=1,
+                max_csp_count=1,
+                csp_to_cost={"csp_0": 0, "csp_1": 0},
+            ),
+        )
+    )
+
+
+class _StoppedCbcSolver(pulp.PULP_CBC_CMD):  # type: ignore[misc]
+    """Simulates a solver that has been stopped by the time limit."""
+
+    def actualSolve(self, lp: pulp.LpProblem, **kwargs: Any) -> Any:
+        status = super().actualSolve(lp, **kwargs)
+        lp.sol_status = pulp.LpSolutionIntegerFeasible
+        return status
+
+
+def test_should_serve_solution_from_memory() -> None:
+    """The second identical request is served from memory."""
+    cache = SolutionCache()
+
+    first = cache.solve(_optimizer())
+    second = cache.solve(_optimizer())
+
+    assert first[SolutionCacheStats].tier is None
+    assert first[SolutionCacheStats].stored is True
+    assert second[SolutionCacheStats].tier == "memory"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    assert second[BaseSolution] == first[BaseSolution]
+    assert second[MultiCloudSolution] == MultiCloudSolution(selected_csps={"csp_1"})
+    assert second[SolutionObjValue] == first[SolutionObjValue]
+
+
+def test_should_key_on_data_and_solver_parameters() -> None:
+    """Different data or solver parameters are different requests."""
+    cache = SolutionCache()
+
+    cache.solve(_optimizer())
+    cache.solve(_optimizer(cs_0_cost=1))
+    cache.solve(_optimizer(), get_pulp_solver(msg=False, cost_gap_rel=0.1))
+    cache.solve(_optimizer(), get_pulp_solver(msg=True, cost_gap_rel=0.1))
+
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_should_serve_solution_from_disk(tmp_path: Path) -> None:
+    """The entries on disk are shared between cache instances."""
+    SolutionCache(directory=str(tmp_path)).solve(_optimizer())
+    result = SolutionCache(directory=str(tmp_path)).solve(_optimizer())
+
+    assert result[SolutionCacheStats].tier == "disk"
+
+
+def test_should_evict_entries() -> None:
+    """Expired and least recently used entries are evicted."""
+    cache = SolutionCache(max_entries=1)
+    cache.solve(_optimizer(cs_0_cost=1))
+    cache.solve(_optimizer(cs_0_cost=2))
+    cache.solve(_optimizer(cs_0_cost=1))
+
+    expiring_cache = SolutionCache(ttl=timedelta())
+    expiring_cache.solve(_optimizer())
+    expiring_cache.solve(_optimizer())
+
+    assert cache.misses == 3
+    assert expiring_cache.misses == 2
+
+
+def test_should_not_store_solutions_stopped_early() -> None:
+    """Solutions that might not be optimal are never served from the cache."""
+    cache = SolutionCache()
+    solver = _StoppedCbcSolver(msg=False)
+
+    first = cache.solve(_optimizer(), solver)
+    cache.solve(_optimizer(), solver)
+
+    assert first[SolutionCacheStats].stored is False
+    assert cache.misses == 2
@@ -0,0 +1,91 @@
+"""Tests for the validation layer shared by all modules."""
+import pytest
+from optiframe import Optimizer
+from pulp import LpMinimize
+
+from cloud_resource_matcher.modules.base import BaseData, base_module
+from cloud_resource_matcher.modules.base.validation import ValidationBaseTask
+from cloud_resource_matcher.modules.service_limits import ServiceLimitsData, service_limits_module
+from cloud_resource_matcher.validation import ValidationError, ValidationTimes, validate
+
+
+def _base_data() -> BaseData:
+    return BaseData(
+        cloud_resources=["cr_0", "cr_1"],
+        cloud_services=["cs_0"],
+        cr_to_cs_list={"cr_0": ["cs_0"], "cr_1": ["cs_0"]},
+        cs_to_base_cost={"cs_0": 5},
+        cr_to_instance_demand={"cr_0": 1, "cr_1": 1},
+    )
+
+
+def test_should_report_all_violations_of_a_module() -> None:
+    """The validation does not stop at the first violation."""
+    base_data = _base_data()
+    base_data.cr_to_cs_list = {"cr_0": ["cs_0", "cs_1"]}
+    base_data.cr_to_instance_demand = {"cr_0": -1, "cr_1": 1}
+
+    with pytest.raises(ValidationError) as error:
+        ValidationBaseTask(base_data).execute()
+
+    assert error.value.violations == [
+        "Valid CSs for CR cr_1 not defined",
+        "cs_1 in cr_to_cs_list is not a valid CS",
+        "Demand -1 for CR cr_0 is negative",
+    ]
+
+
+def test_should_report_violations_of_all_modules() -> None:
+    """All validation tasks are executed, even if one of them fails."""
+    base_data = _base_data()
+    base_data.cs_to_base_cost = {}
+
+    optimizer = (
+        Optimizer("test_validation", sense=LpMinimize)
+        .add_modules(base_module, service_limits_module)
+        .initialize(
+            base_data,
+            ServiceLimitsData(cs_to_instance_limit={"cs_0": -1}, cr_to_max_instance_demand={}),
+        )
+    )
+
+    with pytest.raises(ValidationError) as error:
+        validate(optimizer)
+
+    assert error.value.violations == [
+        "Base cost for CS cs_0 not defined",
+        "Negative max instance count -1 for CS cs_0",
+        "CR cr_0 does not have a maximum instance demand specified",
+        "CR cr_1 does not have a maximum instance demand specified",
+    ]
+
+
+def test_should_record_validation_time_of_each_module() -> None:
+    """The time needed by each validation task is added to the step data."""
+    optimizer = (
+        Optimizer("test_validation", sense=LpMinimize)
+        .add_modules(base_module, service_limits_module)
+        .initialize(
+            _base_data(),
+            ServiceLimitsData(
+                cs_to_instance_limit={"cs_0": 2}, cr_to_max_instance_demand={"cr_0": 1, "cr_1": 1}
+            ),
+        )
+    )
+
+    step_data = validate(optimizer).pre_processing().build_mip().solve()
+    validation_times: ValidationTimes = step_data[ValidationTimes]
+
+    assert validation_times.task_times.keys() == {
+        "ValidationBaseTask",
+        "ValidationServiceLimitsTask",
+    }
+
+
+def test_should_truncate_error_message() -> None:
+    """The error message only contains the first violations."""
+    error = ValidationError([f"violation {i}" for i in range(30)])
+
+    assert "violation 19" in str(error)
+    assert "violation 20" not in str(error)
+    assert "and 10 more" in str(error)
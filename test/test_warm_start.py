@@ -0,0 +1,114 @@
+"""Tests for the re-optimization from a previous solution."""
+import pytest
+from optiframe import Optimizer, SolutionObjValue
+from optiframe.framework import InitializedOptimizer
+from pulp import LpMinimize
+
+from cloud_resource_matcher.modules.base import BaseData, BaseSolution, base_module
+from cloud_resource_matcher.modules.multi_cloud import (
+    MultiCloudData,
+    MultiCloudSolution,
+    multi_cloud_module,
+)
+from cloud_resource_matcher.modules.performance import PerformanceData, performance_module
+from cloud_resource_matcher.solver import Solver, get_pulp_solver
+from cloud_resource_matcher.validation import validate
+from cloud_resource_matcher.warm_start import set_initial_values, solve
+
+
+def _optimizer() -> InitializedOptimizer:
+    return (
+        Optimizer("test_warm_start", sense=LpMinimize)
+        .add_modules(base_module, performance_module, multi_cloud_module)
+        .initialize(
+            BaseData(
+                cloud_resources=["cr_0", "cr_1"],
+                cloud_services=["cs_0", "cs_1", "cs_2", "cs_3"],
+                cr_to_cs_list={
+                    "cr_0": ["cs_0", "cs_1", "cs_2", "cs_3"],
+                    "cr_1": ["cs_0", "cs_1", "cs_2", "cs_3"],
+                },
+                cs_to_base_cost={"cs_0": 1, "cs_1": 2, "cs_2": 3, "cs_3": 4},
+                cr_to_instance_demand={"cr_0": 1, "cr_1": 1},
+            ),
+            PerformanceData(
+                performance_criteria=["vCPUs"],
+                performance_demand={("cr_0", "vCPUs"): 2},
+                performance_supply={
+                    ("cs_0", "vCPUs"): 1,
+                    ("cs_1", "vCPUs"): 2,
+                    ("cs_2", "vCPUs"): 2,
+                    ("cs_3", "vCPUs"): 2,
+                },
+                cost_per_unit={},
+            ),
+            MultiCloudData(
+                cloud_service_providers=["csp_0", "csp_1"],
+                csp_to_cs_list={"csp_0": ["cs_0", "cs_1"], "csp_1": ["cs_2", "cs_3"]},
+                min_csp_count=1,
+                max_csp_count=1,
+                csp_to_cost={"csp_0": 0, "csp_1": 0},
+            ),
+        )
+    )
+
+
+def test_should_set_initial_values() -> None:
+    """The previous assignments are used as initial values."""
+    built = validate(_optimizer()).pre_processing().build_mip()
+
+    repaired_count = set_initial_values(
+        built,
+        BaseSolution(
+            cr_to_cs_matching={"cr_0": "cs_2", "cr_1": "cs_3"},
+            cs_instance_count={"cs_2": 1, "cs_3": 1},
+        ),
+    )
+    values = {var.name: var.value() for var in built.problem().variables()}
+
+    assert repaired_count == 0
+    assert values["cr_to_cs_matching(cr_0,cs_2)"] == 1
+    assert values["cr_to_cs_matching(cr_0,cs_3)"] == 0
+    assert values["cr_to_cs_matching(cr_1,cs_3)"] == 1
+    assert values["csp_used(csp_0)"] == 0
+    assert values["csp_used(csp_1)"] == 1
+
+
+def test_should_repair_pruned_assignments() -> None:
+    """Assignments to pruned CSs are replaced by the cheapest CS of the selected CSPs."""
+    built = validate(_optimizer()).pre_processing().build_mip()
+
+    # cs_0 doesn't have enough vCPUs for cr_0 and cr_1 was not deployed before
+    repaired_count = set_initial_values(
+        built,
+        BaseSolution(cr_to_cs_matching={"cr_0": "cs_0"}, cs_instance_count={"cs_0": 1}),
+        MultiCloudSolution(selected_csps={"csp_1"}),
+    )
+    values = {var.name: var.value() for var in built.problem().variables()}
+
+    assert repaired_count == 2
+    assert values["cr_to_cs_matching(cr_0,cs_2)"] == 1
+    assert values["cr_to_cs_matching(cr_1,cs_2)"] == 1
+    assert values["csp_used(csp_1)"] == 1
+
+
+def test_should_obtain_optimal_solution() -> None:
+    """Starting from a worse solution still results in the optimal solution."""
+    expected = _optimizer().solve()
+    actual = solve(
+        _optimizer(),
+        BaseSolution(
+            cr_to_cs_matching={"cr_0": "cs_2", "cr_1": "cs_3"},
+            cs_instance_count={"cs_2": 1, "cs_3": 1},
+        ),
+    )
+
+    assert actual[SolutionObjValue].objective_value == pytest.approx(
+        expected[SolutionObjValue].objective_value
+    )
+
+
+def test_should_not_warm_start_unsupported_solver() -> None:
+    """Only some solvers support warm starts."""
+    with pytest.raises(RuntimeError):
+        get_pulp_solver(Solver.SCIP, warm_start=True)